@@ -0,0 +1,106 @@
+"""
+Measure the database work every authenticated request does, a user lookup by
+email followed by that user's settings, with a fresh connection per query and
+with the pooled connections of `db_service`. Run with
+`python -m benchmarks.bench_db_connections [requests]` (default 20000).
+
+The sequential run shows the per-request overhead. The concurrent run adds
+a writer committing setting updates while READERS threads serve requests,
+which the default rollback journal serialises and WAL does not.
+"""
+import importlib
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from unittest.mock import patch
+from src.services.database import db_service
+from src.services.database.user_settings import get_user_setting, update_user_setting
+from src.services.database.users import get_user_by_email
+
+READERS = 4
+CONCURRENT_SECONDS = 2.0
+USERS = 50
+
+def fresh_connection(db_path: str) -> sqlite3.Connection:
+    # get_connection before pooling
+    conn = sqlite3.Connection(db_path)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+def build_database(db_path: str) -> None:
+    with sqlite3.connect(db_path) as conn:
+        with patch.dict(os.environ, {"FIRST_USER_EMAIL": "user0@example.com"}):
+            importlib.import_module("src.database.migrations.001_initial_schema").up(conn)
+        conn.executemany("INSERT INTO users (email, name) VALUES (?, ?)", [(f"user{index}@example.com", f"User {index}") for index in range(1, USERS)])
+        conn.execute("INSERT INTO user_settings (user_id, hard_drive_path_selection) SELECT id, '/drive/' || id FROM users")
+        conn.commit()
+
+def handle_request(index: int) -> None:
+    user = get_user_by_email(f"user{index % USERS}@example.com")
+    get_user_setting(user.id)
+
+def run_sequential(count: int) -> float:
+    handle_request(0)
+    started = time.perf_counter()
+    for index in range(count):
+        handle_request(index)
+    return (time.perf_counter() - started) / count
+
+def run_concurrent() -> int:
+    stopped = threading.Event()
+    served = [0] * READERS
+
+    def reader(slot: int) -> None:
+        while not stopped.is_set():
+            handle_request(served[slot])
+            served[slot] += 1
+        db_service.close_connections()
+
+    def writer() -> None:
+        index = 0
+        while not stopped.is_set():
+            update_user_setting({"user_id": index % USERS + 1, "hard_drive_path_selection": f"/drive/{index}"})
+            index += 1
+        db_service.close_connections()
+
+    threads = [threading.Thread(target=reader, args=(slot,)) for slot in range(READERS)] + [threading.Thread(target=writer)]
+    for thread in threads:
+        thread.start()
+    time.sleep(CONCURRENT_SECONDS)
+    stopped.set()
+    for thread in threads:
+        thread.join()
+    return sum(served)
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    workdir = tempfile.mkdtemp()
+
+    try:
+        for label, pooled in [("fresh connection per query", False), ("pooled WAL connections", True)]:
+            db_path = os.path.join(workdir, f"{'pooled' if pooled else 'fresh'}.db")
+            build_database(db_path)
+            if pooled:
+                get_connection = lambda path=None: db_service.get_connection(db_path)
+            else:
+                get_connection = lambda path=None: fresh_connection(db_path)
+
+            with patch("src.services.database.users.get_connection", side_effect=get_connection), \
+                    patch("src.services.database.user_settings.get_connection", side_effect=get_connection):
+                per_request = run_sequential(count)
+                served = run_concurrent()
+            db_service.close_connections()
+
+            print(
+                f"{label:<27} {per_request * 1_000_000:7.1f} us/request sequential,"
+                f" {served / CONCURRENT_SECONDS:8.0f} requests/s with {READERS} readers and a writer"
+            )
+    finally:
+        shutil.rmtree(workdir)
+
+if __name__ == "__main__":
+    main()
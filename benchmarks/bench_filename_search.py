@@ -0,0 +1,87 @@
+"""
+Time filename searches over a synthetic drive index. Run with
+`python -m benchmarks.bench_filename_search [entries]` (default 1000000).
+
+The index is built in a temporary database through the real migrations, so
+the full-text tables are filled by the same triggers the indexer relies on.
+Each query is run once to warm the page cache, then timed over several runs.
+Broad queries stop at SEARCH_CANDIDATES matches per index, which is what
+keeps them in the same range as narrow ones.
+"""
+import importlib
+import os
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from unittest.mock import patch
+from src.services.api.file.search_helper import SEARCH_CANDIDATES, match_queries
+from src.services.database.files import search_files
+
+MIGRATIONS = ["004_files", "005_file_index_checkpoints", "006_files_search"]
+WORDS = [
+    "holiday", "summer", "beach", "family", "birthday", "invoice", "tax", "return", "scan", "report",
+    "wedding", "trip", "paris", "london", "draft", "final", "backup", "export", "screenshot", "meeting",
+]
+EXTENSIONS = ["jpg", "png", "mp4", "mov", "pdf", "docx", "zip", "mp3"]
+QUERIES = [("holiday", "auto"), ("hol", "prefix"), ("ummer", "substring"), ("tax return 2019", "auto"), ("zzzz", "auto")]
+RUNS = 5
+
+def synthetic_names(count: int):
+    generator = random.Random(42)
+    for index in range(count):
+        words = generator.sample(WORDS, 2)
+        yield f"{words[0].title()}_{words[1]}-{2000 + index % 25}-{index}.{generator.choice(EXTENSIONS)}"
+
+def build_index(db_path: str, count: int) -> None:
+    with sqlite3.connect(db_path) as conn:
+        for migration in MIGRATIONS:
+            importlib.import_module(f"src.database.migrations.{migration}").up(conn)
+        conn.executemany(
+            """
+            INSERT INTO files (path, parent, name, is_dir, size, mtime_ns, mime_type, category, inode, owner, indexed_ns)
+            VALUES (?, ?, ?, 0, 1, 0, NULL, NULL, ?, 0, 0)
+            """,
+            (
+                (f"/drive/folder{index // 1000}/{name}", f"/drive/folder{index // 1000}", name, index)
+                for index, name in enumerate(synthetic_names(count))
+            ),
+        )
+        conn.commit()
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    workdir = tempfile.mkdtemp()
+    db_path = os.path.join(workdir, "index.db")
+
+    try:
+        started = time.perf_counter()
+        build_index(db_path, count)
+        print(f"Indexed {count} names in {time.perf_counter() - started:.1f}s")
+
+        def get_connection():
+            conn = sqlite3.connect(db_path)
+            conn.row_factory = sqlite3.Row
+            return conn
+
+        with patch("src.services.database.files.get_connection", side_effect=get_connection):
+            for query, mode in QUERIES:
+                words_query, substring_query = match_queries(query, mode)
+                search_files("/drive", words_query, substring_query, limit=51, candidates=SEARCH_CANDIDATES)
+
+                timings = []
+                for _ in range(RUNS):
+                    started = time.perf_counter()
+                    results, truncated = search_files("/drive", words_query, substring_query, limit=51, candidates=SEARCH_CANDIDATES)
+                    timings.append(time.perf_counter() - started)
+                print(
+                    f"{mode:>9} {query!r:<18} {len(results):>3} results{' (truncated)' if truncated else '':<12}"
+                    f" median {sorted(timings)[RUNS // 2] * 1000:.1f} ms"
+                )
+    finally:
+        shutil.rmtree(workdir)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Compare building `files` index rows into the old setattr-per-column objects
+and into the slotted IndexedFile dataclass through its compiled row mapper.
+Run with `python -m benchmarks.bench_row_models [rows]` (default 1000000).
+
+Rows are fetched once from an in-memory table shaped like `files`, so only
+object construction is timed. Memory is what tracemalloc sees retained per
+built object, excluding the fetched rows.
+"""
+import gc
+import sqlite3
+import sys
+import time
+import tracemalloc
+from src.services.database.files import IndexedFile
+from src.services.database.row_mapper import row_mapper
+
+class SetattrRow:
+    # The row classes before slotted models
+    def __init__(self, row, cursor):
+        if row is not None:
+            for idx, col in enumerate(cursor.description):
+                setattr(self, col[0], row[idx])
+
+def fetch_rows(count: int):
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    conn.execute("""
+        CREATE TABLE files (
+            id INTEGER PRIMARY KEY, path TEXT, parent TEXT, name TEXT, is_dir BOOLEAN, size INTEGER,
+            mtime_ns INTEGER, mime_type TEXT, category TEXT, inode INTEGER, owner INTEGER, indexed_ns INTEGER
+        )
+    """)
+    conn.executemany(
+        "INSERT INTO files VALUES (?, ?, ?, ?, 0, ?, ?, 'image/jpeg', 'photos', ?, 1000, ?)",
+        (
+            (index, f"/drive/photos/{index // 1000}/IMG_{index}.jpg", f"/drive/photos/{index // 1000}", f"IMG_{index}.jpg",
+             index * 7, 1_700_000_000_000_000_000 + index, index, 1_700_000_000_000_000_000)
+            for index in range(count)
+        ),
+    )
+    cursor = conn.execute("SELECT * FROM files")
+    return cursor, cursor.fetchall()
+
+def measure(build, rows):
+    gc.collect()
+    started = time.perf_counter()
+    built = build(rows)
+    seconds = time.perf_counter() - started
+    del built
+
+    gc.collect()
+    tracemalloc.start()
+    built = build(rows)
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # The list holding them is 8 bytes per row either way
+    return len(rows) / seconds, retained / len(rows) - 8
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    cursor, rows = fetch_rows(count)
+
+    candidates = [
+        ("setattr per column", lambda rows: [SetattrRow(row, cursor) for row in rows]),
+        ("slotted, row mapper", lambda rows: list(map(row_mapper(IndexedFile, cursor.description), rows))),
+    ]
+    for label, build in candidates:
+        rate, per_row = measure(build, rows)
+        print(f"{label:<20} {rate / 1_000_000:6.2f} M rows/s {per_row:7.0f} bytes/row")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Compare file delivery strategies for the stream endpoint on a local socket.
+Run with `python -m benchmarks.bench_stream_delivery [size_mb]`.
+
+Each strategy drives a real ASGI response through a minimal server harness
+that writes to one end of a socket pair while a drain thread reads the other
+end, and reports throughput and process CPU seconds per GB:
+
+- the old `iterfile` generator wrapped in a StreamingResponse
+- FileRangeResponse on a server without extensions (buffered fallback, the
+  path taken under uvicorn)
+- FileRangeResponse on a server offering http.response.pathsend /
+  http.response.zerocopysend, which the harness serves with os.sendfile
+"""
+import asyncio
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+from starlette.responses import StreamingResponse
+from src.services.api.file.file_delivery import PATHSEND, ZEROCOPYSEND, FileRangeResponse
+
+CHUNK_SIZE = 1024 * 1024
+
+def iterfile(file_path):
+    with open(file_path, mode="rb") as file_like:
+        while chunk := file_like.read(CHUNK_SIZE):
+            yield chunk
+
+def sendfile_all(sock, file_like, offset, count):
+    while count > 0:
+        sent = os.sendfile(sock.fileno(), file_like.fileno(), offset, count)
+        if sent == 0:
+            break
+        offset += sent
+        count -= sent
+
+def make_send(sock):
+    """ASGI send callable writing to a blocking socket, like a server's transport."""
+    async def send(message):
+        if message["type"] == "http.response.body":
+            if message.get("body"):
+                sock.sendall(message["body"])
+        elif message["type"] == ZEROCOPYSEND:
+            sendfile_all(sock, message["file"], message["offset"], message["count"])
+        elif message["type"] == PATHSEND:
+            with open(message["path"], "rb") as file_like:
+                sendfile_all(sock, file_like, 0, os.fstat(file_like.fileno()).st_size)
+    return send
+
+async def receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+def drain(sock, file_size):
+    buffer = bytearray(CHUNK_SIZE)
+    received = 0
+    while received < file_size:
+        count = sock.recv_into(buffer)
+        if not count:
+            break
+        received += count
+
+def run(make_response, extensions, file_path, file_size):
+    sender, receiver = socket.socketpair()
+    reader = threading.Thread(target=drain, args=(receiver, file_size))
+    reader.start()
+
+    scope = {"type": "http", "method": "GET", "asgi": {"spec_version": "2.4"}, "extensions": extensions}
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    asyncio.run(make_response()(scope, receive, make_send(sender)))
+    reader.join()
+    wall, cpu = time.perf_counter() - wall_start, time.process_time() - cpu_start
+
+    sender.close()
+    receiver.close()
+    gigabytes = file_size / (1024 ** 3)
+    return file_size / (1024 ** 2) / wall, cpu / gigabytes
+
+def main():
+    size_mb = int(sys.argv[1]) if len(sys.argv) > 1 else 512
+    file_size = size_mb * 1024 * 1024
+
+    with tempfile.NamedTemporaryFile(delete=False) as temp_file:
+        block = os.urandom(CHUNK_SIZE)
+        for _ in range(size_mb):
+            temp_file.write(block)
+
+    path = temp_file.name
+    strategies = [
+        ("iterfile generator", lambda: StreamingResponse(iterfile(path)), {}),
+        ("buffered fallback", lambda: FileRangeResponse(path, file_size), {}),
+        ("pathsend", lambda: FileRangeResponse(path, file_size), {PATHSEND: {}}),
+        ("range zerocopysend", lambda: FileRangeResponse(path, file_size, [(0, file_size - 1)]), {ZEROCOPYSEND: {}}),
+    ]
+
+    try:
+        print(f"file size: {size_mb} MiB")
+        for name, make_response, extensions in strategies:
+            run(make_response, extensions, path, file_size)  # warm the page cache
+            throughput, cpu_per_gb = run(make_response, extensions, path, file_size)
+            print(f"{name:>20}: {throughput:9.1f} MiB/s  {cpu_per_gb:6.3f} CPU s/GB")
+    finally:
+        os.unlink(path)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Report what importing the app costs, module by module, from a fresh
+interpreter's `-X importtime` output. Run with
+`python -m benchmarks.profile_startup [top]` (default 25).
+
+Prints the wall time of `import src.main`, then the modules with the highest
+cumulative import time (a package's own time plus everything it imported)
+and the highest self time.
+"""
+import subprocess
+import sys
+from typing import List, Tuple
+
+IMPORT_APP = "import time; started = time.perf_counter(); import src.main; print(time.perf_counter() - started)"
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int]]:
+    """(module, self µs, cumulative µs) for each line of `-X importtime` output."""
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            # The header line
+            continue
+        modules.append((fields[2].strip(), int(fields[0]), int(fields[1])))
+    return modules
+
+def profile_startup() -> Tuple[float, List[Tuple[str, int, int]]]:
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", IMPORT_APP],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return float(completed.stdout.strip().splitlines()[-1]), parse_importtime(completed.stderr)
+
+def main() -> None:
+    top = int(sys.argv[1]) if len(sys.argv) > 1 else 25
+    seconds, modules = profile_startup()
+
+    print(f"import src.main: {seconds * 1000:.0f} ms wall, {len(modules)} modules imported")
+    for title, column in [("cumulative", 2), ("self", 1)]:
+        print(f"\ntop {top} by {title} time")
+        for module, self_us, cumulative_us in sorted(modules, key=lambda module: module[column], reverse=True)[:top]:
+            print(f"{cumulative_us / 1000:9.1f} ms {self_us / 1000:9.1f} ms  {module}")
+
+if __name__ == "__main__":
+    main()
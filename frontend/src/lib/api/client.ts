@@ -1,4 +1,4 @@
-import { ApiConfig, ErrorResponse, BrowseResponse, LoginRequest, LoginResponse, LogoutResponse, VerifyResponse, UserSettingsResponse, UserSettings, MountedDrivesResponse, FolderItem, ShareFormRequest, ShareFormResponse, AdminCheckResponse } from './types';
+import { ApiConfig, ErrorResponse, BrowseResponse, LoginRequest, LoginResponse, LogoutResponse, VerifyResponse, UserSettingsResponse, UserSettings, MountedDrivesResponse, FolderItem, FolderItemsPage, ListFolderOptions, ShareFormRequest, ShareFormResponse, AdminCheckResponse } from './types';
 import { API_CONFIG, getApiUrl } from './config';
 
 class ApiClient {
@@ -61,12 +61,13 @@ class ApiClient {
   // File Upload
   async uploadFiles(files: File[], currentFilePath : string) {
     const formData = new FormData();
+    // The server streams files straight to disk, so it needs the destination first
+    formData.append('file_path_location', currentFilePath);
+
     files.forEach((file) => {
       formData.append('files', file);
     });
 
-    formData.append('file_path_location', currentFilePath);
-
     const url = getApiUrl(API_CONFIG.endpoints.upload);
     
     try {
@@ -227,6 +228,48 @@ class ApiClient {
     }
   }
 
+  // List one page of Folder Items; pass the returned nextCursor to load the next page
+  async listFolderItemsPage(path: string = "", options: ListFolderOptions = {}): Promise<FolderItemsPage> {
+    const params = new URLSearchParams();
+    if (path) {
+      params.append('path', path);
+    }
+    Object.entries(options).forEach(([key, value]) => {
+      if (value !== undefined && value !== null) {
+        params.append(key, String(value));
+      }
+    });
+
+    const url = `${getApiUrl(API_CONFIG.endpoints.listFolderItems)}?${params.toString()}`;
+
+    try {
+      const response = await fetch(url, {
+        method: 'GET',
+        credentials: 'include',
+      });
+
+      if (!response.ok) {
+        const errorData: ErrorResponse = await response.json().catch(() => ({
+          status: 'error',
+          message: `HTTP ${response.status}: ${response.statusText}`,
+        }));
+
+        throw new Error(errorData.message || `HTTP ${response.status}`);
+      }
+
+      return {
+        items: await response.json(),
+        nextCursor: response.headers.get('X-Next-Cursor'),
+        totalCount: Number(response.headers.get('X-Total-Count') ?? 0),
+      };
+    } catch (error) {
+      if (error instanceof Error) {
+        throw error;
+      }
+      throw new Error('An unexpected error occurred while listing folder items');
+    }
+  }
+
   // Share Method
   async share(shareData: ShareFormRequest): Promise<ShareFormResponse> {
     return this.request<ShareFormResponse>(API_CONFIG.endpoints.share, {
@@ -3,8 +3,20 @@ export interface HealthCheckResponse {
   status: string;
 }
 
+export interface UploadedFile {
+  filename: string;
+  size: number;
+  status: 'uploaded' | 'failed';
+  error: string | null;
+  deduplicated: boolean;
+}
+
 export interface UploadResponse {
   uploaded_files: string[];
+  failed_files: { filename: string; error: string }[];
+  deduplicated_files: string[];
+  bytes_saved: number;
+  files: UploadedFile[];
 }
 
 export interface ErrorResponse {
@@ -118,6 +130,21 @@ export interface ListFolderResponse {
   items: FolderItem[];
 }
 
+export interface ListFolderOptions {
+  limit?: number;
+  cursor?: string | null;
+  sort?: "name" | "mtime" | "size" | "type";
+  order?: "asc" | "desc";
+  type?: "file" | "folder";
+  extension?: string;
+}
+
+export interface FolderItemsPage {
+  items: FolderItem[];
+  nextCursor: string | null;
+  totalCount: number;
+}
+
 // Share Types
 export interface ShareFormRequest {
   name: string;
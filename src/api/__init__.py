@@ -1 +0,0 @@
-from .file import stream
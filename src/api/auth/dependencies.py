@@ -1,7 +1,9 @@
-from fastapi import HTTPException, status, Cookie
+from fastapi import HTTPException, status, Cookie, Depends
 from typing import Optional, Dict, Any
 from src.services.auth.jwt_helper import verify_token
 from src.services.auth.allow_email_helper import is_email_allowed
+from src.services.database.async_db import get_user_context
+from src.services.database.user_context import UserContext
 
 def create_unauthorized_exception(detail: str) -> HTTPException:
     return HTTPException(
@@ -41,3 +43,10 @@ async def get_current_user(token: Optional[str] = Cookie(None, alias="access_tok
         "picture": payload.get("picture"),
         "sub": payload.get("sub")
     }
+
+async def get_current_user_context(current_user: Dict[str, Any] = Depends(get_current_user)) -> Optional[UserContext]:
+    """
+    FastAPI dependency resolving the authenticated User and their settings in
+    one cached query. None when the email has no User row.
+    """
+    return await get_user_context(current_user.get("email"))
@@ -1,5 +1,6 @@
 from fastapi import APIRouter, HTTPException, status, Response
 from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
 from src.services.auth.google_helper import verify_google_token
 from src.services.auth.jwt_helper import create_access_token
 from src.services.auth.allow_email_helper import is_email_allowed
@@ -17,7 +18,8 @@ class LoginResponse(BaseModel):
 @router.post('/', response_model=LoginResponse)
 async def login(request: LoginRequest, response: Response):
     """Login with Google OAuth token."""
-    user_info = verify_google_token(request.token)
+    # A refetch of Google's certificates must not block the event loop
+    user_info = await run_in_threadpool(verify_google_token, request.token)
     if not user_info:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
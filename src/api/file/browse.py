@@ -1,77 +1,73 @@
 from fastapi import APIRouter, Query
-from src.services.api.file_path_helper import get_external_drive_path, get_folder_destination
-from typing import List, Optional
+from src.services.api.file_path_helper import CATEGORIES, get_external_drive_path
+from src.services.api.file.disk_io import run_disk_io
+from src.services.api.file.drive_indexer import ensure_indexed
+from src.services.database.files import query_files
+from src.services.database.db_service import run_db
+from typing import Optional
 import os
-import mimetypes
 from datetime import datetime
 
 router = APIRouter(tags=["File"])
 
+def to_ns(moment: Optional[datetime]) -> Optional[int]:
+    if moment is None:
+        return None
+    return round(moment.timestamp() * 1_000_000) * 1000
+
 @router.get('/')
-async def browse(category: Optional[str] = Query(None, description="Filter by folder type (photos, videos, documents, audio, zip, others)")):
-    """Browse files on the external drive, optionally filtered by category."""
+async def browse(
+    category: Optional[str] = Query(None, description="Filter by folder type (photos, videos, documents, audio, zip, others)"),
+    min_size: Optional[int] = Query(None, ge=0, description="Only files of at least this many bytes"),
+    max_size: Optional[int] = Query(None, ge=0, description="Only files of at most this many bytes"),
+    modified_after: Optional[datetime] = Query(None, description="Only files modified at or after this time"),
+    modified_before: Optional[datetime] = Query(None, description="Only files modified before this time"),
+    sort: str = Query(default="name", pattern="^(name|mtime|size)$", description="Sort key"),
+    order: str = Query(default="asc", pattern="^(asc|desc)$", description="Sort order"),
+    ):
+    """
+    Browse files on the external drive, optionally filtered by category, size
+    and modification time. Results come from the `files` index; category
+    folders that changed since they were indexed are re-scanned first.
+    """
     base_path = get_external_drive_path()
     if not base_path:
         return {"files": [], "total_count": 0}
-    
-    # Define all possible categories
-    categories = ["photos", "videos", "documents", "audio", "zip", "others"]
-    
+
     # If category is specified, validate it
-    if category and category not in categories:
+    if category and category not in CATEGORIES:
         return {"files": [], "total_count": 0}
-    
+
     # Determine which categories to scan
-    categories_to_scan = [category] if category else categories
-    
-    files = []
-    
-    for cat in categories_to_scan:
-        folder_path = os.path.join(base_path, cat)
-        
-        # Check if folder exists
-        if not os.path.exists(folder_path):
-            continue
-            
-        try:
-            # List files in the category folder
-            for filename in os.listdir(folder_path):
-                file_path = os.path.join(folder_path, filename)
-                
-                # Skip directories
-                if os.path.isdir(file_path):
-                    continue
-                
-                # Skip hidden files (starting with .) and macOS resource fork files (._filename)
-                if filename.startswith('.') or filename.startswith('._'):
-                    continue
-                
-                try:
-                    # Get file metadata
-                    stat = os.stat(file_path)
-                    file_size = stat.st_size
-                    modified_time = datetime.fromtimestamp(stat.st_mtime).isoformat()
-                    
-                    # Guess MIME type
-                    mime_type, _ = mimetypes.guess_type(file_path)
-                    mime_type = mime_type or "application/octet-stream"
-                    
-                    files.append({
-                        "name": filename,
-                        "size": file_size,
-                        "type": mime_type,
-                        "modified": modified_time,
-                        "category": cat
-                    })
-                    
-                except (OSError, IOError):
-                    # Skip files that can't be accessed
-                    continue
-                    
-        except (OSError, IOError):
-            # Skip folders that can't be accessed
-            continue
-    
+    categories_to_scan = [category] if category else CATEGORIES
+
+    root = os.path.realpath(base_path)
+    folders = [os.path.join(root, cat) for cat in categories_to_scan]
+    await run_disk_io(ensure_indexed, root, folders)
+
+    indexed_files = await run_db(
+        query_files,
+        parents=folders,
+        is_dir=False,
+        min_size=min_size,
+        max_size=max_size,
+        modified_after_ns=to_ns(modified_after),
+        modified_before_ns=to_ns(modified_before),
+        sort=sort,
+        order=order,
+    )
+
+    files = [
+        {
+            "name": indexed_file.name,
+            "size": indexed_file.size,
+            "type": indexed_file.mime_type,
+            "modified": datetime.fromtimestamp(indexed_file.mtime_ns / 1_000_000_000).isoformat(),
+            "category": indexed_file.category,
+        }
+        for indexed_file in indexed_files
+    ]
+
     return {
         "files": files,
         "total_count": len(files)
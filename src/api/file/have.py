@@ -0,0 +1,78 @@
+from pydantic import BaseModel, Field
+from fastapi import APIRouter, Depends, HTTPException
+from pathlib import Path
+from typing import List, Optional
+from src.api.auth.dependencies import get_current_user_context
+from src.services.database.user_context import UserContext
+from src.services.api.file.disk_io import run_disk_io
+from src.services.api.file.hash_cache import cached_file_hashes
+from src.services.api.file.upload_helper import resolve_upload_directory, safe_filename
+import os
+import stat
+
+router = APIRouter(tags=["File"])
+
+MAX_HAVE_FILES = 10000
+
+class FileDigest(BaseModel):
+    name: str = Field(..., description="File name as it would be uploaded", example="IMG_0001.jpg")
+    size: int = Field(..., ge=0, description="File size in bytes", example=2048576)
+    hash: str = Field(..., pattern="^[0-9a-fA-F]{64}$", description="Hex encoded SHA-256 of the file content")
+
+class HaveRequest(BaseModel):
+    file_path_location: str = Field(..., description="Upload destination on the drive", example="Volume/device_1/photos")
+    files: List[FileDigest] = Field(..., max_length=MAX_HAVE_FILES)
+
+def stat_candidates(directory: Path, files: List[FileDigest]) -> List[Optional[os.stat_result]]:
+    """Stat the file each digest would be uploaded as; None when absent or not a regular file."""
+    stats = []
+    for file in files:
+        try:
+            file_stat = (directory / safe_filename(file.name)).stat()
+        except (OSError, ValueError):
+            file_stat = None
+        stats.append(file_stat if file_stat is not None and stat.S_ISREG(file_stat.st_mode) else None)
+    return stats
+
+@router.post('/')
+async def have(
+    payload: HaveRequest,
+    user_context: Optional[UserContext] = Depends(get_current_user_context)
+    ):
+    """
+    Given the files a client is about to upload, return only those that are not
+    already stored under `file_path_location` with the same size and SHA-256.
+    Server-side hashes are cached, so only new or changed files are read.
+    """
+    if not user_context:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    user_setting = user_context.user_setting
+    if not user_setting:
+        raise HTTPException(status_code=404, detail="Default Path Section not found")
+
+    try:
+        directory = await run_disk_io(resolve_upload_directory, user_setting.hard_drive_path_selection, payload.file_path_location)
+    except ValueError as e:
+        raise HTTPException(status_code=403, detail=str(e))
+
+    if not await run_disk_io(directory.is_dir):
+        raise HTTPException(status_code=404, detail="Upload directory not found")
+
+    stats = await run_disk_io(stat_candidates, directory, payload.files)
+
+    # Only files whose size already matches are worth hashing
+    candidates = {
+        index: (directory / safe_filename(file.name), file_stat)
+        for index, (file, file_stat) in enumerate(zip(payload.files, stats))
+        if file_stat is not None and file_stat.st_size == file.size
+    }
+    hashes = await cached_file_hashes(list(candidates.values()))
+
+    missing = []
+    for index, file in enumerate(payload.files):
+        candidate = candidates.get(index)
+        if candidate is None or hashes[os.path.abspath(candidate[0])] != file.hash.lower():
+            missing.append(file)
+
+    return {"missing": missing, "present_count": len(payload.files) - len(missing)}
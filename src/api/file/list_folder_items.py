@@ -1,30 +1,40 @@
 from fastapi import APIRouter
 from pathlib import Path
-from fastapi import Query, HTTPException, Depends
+from fastapi import Query, HTTPException, Depends, Response
 from fastapi.responses import JSONResponse
 from datetime import datetime
-from src.services.api.file.file_helper import bytes_to_human_readable, is_hidden
-from src.api.auth.dependencies import get_current_user
-from src.services.database.users import get_user_by_email
-from src.services.database.user_settings import get_user_setting
+from typing import Optional
+from src.services.api.file.file_helper import bytes_to_human_readable
+from src.services.api.file.listing_cache import get_listing_cache
+from src.services.api.file.listing_helper import MAX_PAGE_SIZE, page_of, parse_extensions
+from src.api.auth.dependencies import get_current_user_context
+from src.services.database.user_context import UserContext
 
 router = APIRouter(tags=["File"])
 
 @router.get("/")
 def list_folder_items(
+    response: Response,
     path: str = Query(default="", description="Optional relative path"),
-    current_user: dict = Depends(get_current_user),
+    limit: Optional[int] = Query(default=None, ge=1, le=MAX_PAGE_SIZE, description="Page size; all entries when omitted"),
+    cursor: Optional[str] = Query(default=None, description="X-Next-Cursor value from the previous page"),
+    sort: str = Query(default="name", pattern="^(name|mtime|size|type)$", description="Sort key"),
+    order: str = Query(default="asc", pattern="^(asc|desc)$", description="Sort order"),
+    entry_type: Optional[str] = Query(default=None, alias="type", pattern="^(file|folder)$", description="Only files or only folders"),
+    extension: Optional[str] = Query(default=None, description="Comma separated file extensions, e.g. jpg,png"),
+    user_context: Optional[UserContext] = Depends(get_current_user_context),
     ):
     """
     List non-hidden files and folders in the specified directory (non-recursive).
     The path is appended safely to the User's drive selection.
-    """
 
-    email = current_user.get("email")
-    user = get_user_by_email(email)
-    user_setting = get_user_setting(user.id)
+    Entries come back sorted and, when `limit` is given, one page at a time. The
+    `X-Next-Cursor` response header carries the cursor for the following page
+    and is absent on the last one; `X-Total-Count` counts every matching entry.
+    Sorted listings are cached in memory until the folder changes.
+    """
 
-    default_path = user_setting.hard_drive_path_selection
+    default_path = user_context.user_setting.hard_drive_path_selection
     base = Path(default_path).resolve()
     target_path = (base / path).resolve()
 
@@ -38,28 +48,34 @@ def list_folder_items(
     if not target_path.is_dir():
         raise HTTPException(status_code=400, detail=f"Path is not a directory: {target_path}")
 
-    entries = []
+    extensions = parse_extensions(extension)
+    relative_dir = target_path.relative_to(base)
     try:
-        for item in target_path.iterdir():
-            if is_hidden(item):
-                continue
+        entries, keys = get_listing_cache().get(target_path, sort, entry_type, extensions)
 
-            entry = {
-                "name": item.name,
-                "full_path": str(item.resolve()),
-                "relative_path": str(item.relative_to(base)),
-                "type": "folder" if item.is_dir() else "file",
-                "size": None,
-                "modified": datetime.fromtimestamp(item.stat().st_mtime).strftime("%Y-%m-%d %H:%M:%S"),
-            }
+        try:
+            page, next_cursor = page_of(entries, keys, sort, order, limit, cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid cursor: {e}")
 
-            if item.is_file():
-                entry["size"] = bytes_to_human_readable(item.stat().st_size)
+        response.headers["X-Total-Count"] = str(len(entries))
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
 
-            entries.append(entry)
-
-        return entries
+        return [
+            {
+                "name": entry["name"],
+                "full_path": str(target_path / entry["name"]),
+                "relative_path": str(relative_dir / entry["name"]),
+                "type": "folder" if entry["is_dir"] else "file",
+                "size": None if entry["is_dir"] else bytes_to_human_readable(entry["size"]),
+                "modified": datetime.fromtimestamp(entry["mtime"]).strftime("%Y-%m-%d %H:%M:%S"),
+            }
+            for entry in page
+        ]
 
+    except HTTPException:
+        raise
     except PermissionError:
         raise HTTPException(status_code=403, detail=f"Permission denied: {target_path}")
     except Exception as e:
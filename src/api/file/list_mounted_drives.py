@@ -1,10 +1,17 @@
+import asyncio
+import json
 from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
+from src.services.api.file.disk_io import run_disk_io
+from src.services.api.file.drive_inventory import Drive, DriveInventory, DriveSnapshot, get_drive_inventory
 from src.services.api.file.file_helper import bytes_to_human_readable
-import psutil
 
 router = APIRouter(tags=["File"])
 
+# A comment line this often keeps idle event streams open through proxies
+EVENTS_HEARTBEAT_SECONDS = 15
+
 class DriveInfo(BaseModel):
     device: str = Field(..., description="Device path", example="/drive_1")
     mountpoint: str = Field(..., description="Mount point path", example="/Volumes/disk_1")
@@ -15,34 +22,64 @@ class DriveInfo(BaseModel):
     free: str = Field(..., description="Free space", example="999.9 MB")
     percent_used: str = Field(..., description="Percentage used", example="50.5%")
 
+def drive_info(drive: Drive) -> dict:
+    return {
+        "device": drive.device,
+        "mountpoint": drive.mountpoint,
+        "fstype": drive.fstype,
+        "opts": drive.opts,
+        "total": bytes_to_human_readable(drive.total),
+        "used": bytes_to_human_readable(drive.used),
+        "free": bytes_to_human_readable(drive.free),
+        "percent_used": f"{drive.percent}%",
+    }
+
+async def current_snapshot(inventory: DriveInventory) -> DriveSnapshot:
+    snapshot = inventory.snapshot
+    if inventory.is_stale(snapshot):
+        # Probing the mounts can block, so never on the event loop
+        snapshot = await run_disk_io(inventory.sample)
+    return snapshot
+
 @router.get('/', response_model=list[DriveInfo])
 async def list_mounted_drives():
     """List all drives attached to the server"""
-    drives_info = []
-    partitions = psutil.disk_partitions(all=True)  
+    snapshot = await current_snapshot(get_drive_inventory())
+    return [drive_info(drive) for drive in snapshot.drives]
 
-    for partition in partitions:
-        if partition.fstype == 'apfs':
+def drives_event(snapshot: DriveSnapshot) -> str:
+    drives = [drive_info(drive) for drive in snapshot.drives]
+    return f"id: {snapshot.version}\nevent: drives\ndata: {json.dumps(drives)}\n\n"
+
+async def drive_events(inventory: DriveInventory):
+    # Subscribed before the first read, so no change slips in between
+    subscription = inventory.subscribe()
+    _, changed = subscription
+    try:
+        snapshot = await current_snapshot(inventory)
+        yield drives_event(snapshot)
+        version = snapshot.version
+
+        while True:
+            try:
+                await asyncio.wait_for(changed.wait(), timeout=EVENTS_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
                 continue
+            changed.clear()
+
+            snapshot = inventory.snapshot
+            if snapshot.version != version:
+                yield drives_event(snapshot)
+                version = snapshot.version
+    finally:
+        inventory.unsubscribe(subscription)
 
-        try:
-            usage = psutil.disk_usage(partition.mountpoint)
-            drive_data = {
-                "device": partition.device,
-                "mountpoint": partition.mountpoint,
-                "fstype": partition.fstype,
-                "opts": partition.opts,
-                "total": bytes_to_human_readable(usage.total),
-                "used": bytes_to_human_readable(usage.used),
-                "free": bytes_to_human_readable(usage.free),
-                "percent_used": f"{usage.percent}%",
-            }
-            drives_info.append(drive_data)
-        except PermissionError:
-            # Skip partitions the process doesn’t have access to
-            continue
-        except Exception:
-            # Handle transient or non-standard partitions gracefully
-            continue
-
-    return drives_info
+@router.get('/events')
+async def list_mounted_drives_events():
+    """Server-sent events: the drive list now, then again every time it changes"""
+    return StreamingResponse(
+        drive_events(get_drive_inventory()),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
+    )
@@ -0,0 +1,268 @@
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from starlette.requests import ClientDisconnect
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Optional
+from src.api.auth.dependencies import get_current_user
+from src.services.database.async_db import get_user_context
+from src.services.api.file.disk_io import run_disk_io
+from src.services.api.file.range_helper import http_date
+from src.services.api.file.upload_helper import (
+    create_staging_file,
+    discard_staging_file,
+    finalize_upload,
+    open_staging_file,
+    parse_upload_metadata,
+    resolve_upload_directory,
+    safe_filename,
+    staging_path,
+    sync_and_close,
+)
+from src.services.database.upload_sessions import (
+    create_upload_session,
+    delete_upload_session,
+    get_expired_upload_sessions,
+    get_upload_session,
+    update_upload_offset,
+)
+from src.services.database.db_service import run_db
+import os
+import uuid
+
+router = APIRouter(tags=["File"])
+
+TUS_VERSION = "1.0.0"
+TUS_HEADERS = {"Tus-Resumable": TUS_VERSION}
+WRITE_BUFFER_SIZE = 1024 * 1024
+# Sessions without progress for this long are discarded along with their staged bytes
+UPLOAD_EXPIRATION = timedelta(hours=int(os.getenv("UPLOAD_EXPIRATION_HOURS", "24")))
+SESSION_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Sessions with a PATCH in flight; a second concurrent PATCH would race on the offset
+_active_uploads = set()
+
+def check_tus_version(request: Request):
+    version = request.headers.get("tus-resumable")
+    if version is not None and version != TUS_VERSION:
+        raise HTTPException(status_code=412, detail="Unsupported Tus-Resumable version", headers={"Tus-Version": TUS_VERSION})
+
+async def get_owned_session(upload_id: str, current_user: dict):
+    upload_session = await run_db(get_upload_session, upload_id)
+    if not upload_session or upload_session.owner_email != current_user.get("email"):
+        raise HTTPException(status_code=404, detail="Upload not found", headers=TUS_HEADERS)
+
+    if upload_expires(upload_session) <= datetime.now(timezone.utc):
+        await discard_upload_session(upload_session)
+        raise HTTPException(status_code=404, detail="Upload not found", headers=TUS_HEADERS)
+    return upload_session
+
+async def get_drive_root(current_user: dict) -> str:
+    user_context = await get_user_context(current_user.get("email"))
+    if not user_context:
+        raise HTTPException(status_code=404, detail="User not found", headers=TUS_HEADERS)
+
+    user_setting = user_context.user_setting
+    if not user_setting:
+        raise HTTPException(status_code=404, detail="Default Path Section not found", headers=TUS_HEADERS)
+    return user_setting.hard_drive_path_selection
+
+def upload_expires(upload_session) -> datetime:
+    updated_at = datetime.strptime(upload_session.updated_at, SESSION_TIME_FORMAT).replace(tzinfo=timezone.utc)
+    return updated_at + UPLOAD_EXPIRATION
+
+async def discard_upload_session(upload_session) -> None:
+    await run_disk_io(discard_staging_file, upload_session.temp_path)
+    await run_db(delete_upload_session, upload_session.id)
+
+async def expire_upload_sessions() -> None:
+    """Discard every session, and its staged bytes, that has outlived UPLOAD_EXPIRATION."""
+    updated_before = (datetime.now(timezone.utc) - UPLOAD_EXPIRATION).strftime(SESSION_TIME_FORMAT)
+    for upload_session in await run_db(get_expired_upload_sessions, updated_before):
+        if upload_session.id not in _active_uploads:
+            await discard_upload_session(upload_session)
+
+def offset_headers(upload_session, upload_offset: Optional[int] = None) -> dict:
+    return {
+        **TUS_HEADERS,
+        "Upload-Offset": str(upload_session.upload_offset if upload_offset is None else upload_offset),
+        "Upload-Length": str(upload_session.upload_length),
+        "Upload-Expires": http_date(upload_expires(upload_session).timestamp()),
+        "Cache-Control": "no-store",
+    }
+
+@router.options('/')
+async def resumable_upload_options():
+    """Advertise the supported tus protocol version and extensions"""
+    return Response(status_code=204, headers={
+        **TUS_HEADERS,
+        "Tus-Version": TUS_VERSION,
+        "Tus-Extension": "creation,termination,expiration",
+    })
+
+@router.post('/', status_code=201)
+async def create_resumable_upload(
+    request: Request,
+    response: Response,
+    current_user: dict = Depends(get_current_user)
+    ):
+    """
+    Create an upload session. Expects `Upload-Length` and an `Upload-Metadata`
+    header carrying base64 encoded `filename` and `file_path_location`, a folder
+    on the user's drive. Expired sessions are swept out first.
+    """
+    check_tus_version(request)
+
+    try:
+        upload_length = int(request.headers.get("upload-length", ""))
+        metadata = parse_upload_metadata(request.headers.get("upload-metadata", ""))
+        filename = safe_filename(metadata.get("filename", ""))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid upload request: {e}", headers=TUS_HEADERS)
+
+    if upload_length < 0:
+        raise HTTPException(status_code=400, detail="Upload-Length must not be negative", headers=TUS_HEADERS)
+
+    drive_root = await get_drive_root(current_user)
+    try:
+        file_path_location = await run_disk_io(resolve_upload_directory, drive_root, metadata.get("file_path_location", ""))
+    except ValueError as e:
+        raise HTTPException(status_code=403, detail=str(e), headers=TUS_HEADERS)
+
+    if not await run_disk_io(file_path_location.is_dir):
+        raise HTTPException(status_code=400, detail="Upload directory not found", headers=TUS_HEADERS)
+
+    await expire_upload_sessions()
+
+    upload_id = uuid.uuid4().hex
+    temp_path = staging_path(file_path_location, upload_id)
+    await run_disk_io(create_staging_file, temp_path)
+
+    upload_session = await run_db(create_upload_session, {
+        "id": upload_id,
+        "owner_email": current_user.get("email"),
+        "file_path_location": str(file_path_location),
+        "filename": filename,
+        "upload_length": upload_length,
+        "temp_path": str(temp_path),
+    })
+
+    if upload_length == 0:
+        await run_disk_io(finalize_upload, str(temp_path), file_path_location / filename)
+        await run_db(delete_upload_session, upload_id)
+
+    response.headers.update(offset_headers(upload_session, 0))
+    response.headers["Location"] = f"{request.url.path.rstrip('/')}/{upload_id}"
+    return {"upload_id": upload_id, "upload_offset": 0, "upload_length": upload_length}
+
+@router.head('/{upload_id}')
+async def resumable_upload_offset(upload_id: str, current_user: dict = Depends(get_current_user)):
+    """Report the committed offset of an upload session (tus HEAD)"""
+    upload_session = await get_owned_session(upload_id, current_user)
+    return Response(status_code=200, headers=offset_headers(upload_session))
+
+@router.get('/{upload_id}')
+async def resumable_upload_status(
+    upload_id: str,
+    response: Response,
+    current_user: dict = Depends(get_current_user)
+    ):
+    """Report the committed offset of an upload session as JSON"""
+    upload_session = await get_owned_session(upload_id, current_user)
+    response.headers.update(offset_headers(upload_session))
+    return {
+        "upload_id": upload_session.id,
+        "filename": upload_session.filename,
+        "upload_offset": upload_session.upload_offset,
+        "upload_length": upload_session.upload_length,
+    }
+
+@router.patch('/{upload_id}')
+async def resumable_upload_append(
+    upload_id: str,
+    request: Request,
+    current_user: dict = Depends(get_current_user)
+    ):
+    """
+    Append the request body at `Upload-Offset`. Whatever arrives before the
+    connection drops is committed, and the upload is moved into place once
+    the final byte lands.
+    """
+    check_tus_version(request)
+    if request.headers.get("content-type") != "application/offset+octet-stream":
+        raise HTTPException(status_code=415, detail="Content-Type must be application/offset+octet-stream", headers=TUS_HEADERS)
+
+    try:
+        upload_offset = int(request.headers.get("upload-offset", ""))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Missing or invalid Upload-Offset", headers=TUS_HEADERS)
+
+    # Claim the session before reading it, so the offset compared below cannot
+    # be moved by another PATCH in this process while we append
+    if upload_id in _active_uploads:
+        raise HTTPException(status_code=409, detail="Upload is already in progress", headers=TUS_HEADERS)
+
+    _active_uploads.add(upload_id)
+    try:
+        upload_session = await get_owned_session(upload_id, current_user)
+        if upload_offset != upload_session.upload_offset:
+            raise HTTPException(status_code=409, detail="Upload-Offset does not match the committed offset", headers=offset_headers(upload_session))
+
+        committed = await append_body(request, upload_session)
+    finally:
+        _active_uploads.discard(upload_id)
+
+    if committed == upload_session.upload_length:
+        destination = Path(upload_session.file_path_location) / upload_session.filename
+        await run_disk_io(finalize_upload, upload_session.temp_path, destination)
+        await run_db(delete_upload_session, upload_id)
+
+    return Response(status_code=204, headers=offset_headers(upload_session, committed))
+
+async def append_body(request: Request, upload_session) -> int:
+    """
+    Write the request body to the staging file and record the new committed
+    offset. Only bytes that were written and synced are committed; anything
+    past the committed offset is truncated by the next PATCH.
+    """
+    file_like = await run_disk_io(open_staging_file, upload_session.temp_path, upload_session.upload_offset)
+    committed = upload_session.upload_offset
+    buffer = bytearray()
+    try:
+        try:
+            async for chunk in request.stream():
+                if committed + len(buffer) + len(chunk) > upload_session.upload_length:
+                    raise HTTPException(status_code=413, detail="Request body exceeds Upload-Length", headers=TUS_HEADERS)
+
+                buffer += chunk
+                if len(buffer) >= WRITE_BUFFER_SIZE:
+                    await run_disk_io(file_like.write, bytes(buffer))
+                    committed += len(buffer)
+                    buffer.clear()
+        except ClientDisconnect:
+            pass
+
+        if buffer:
+            await run_disk_io(file_like.write, bytes(buffer))
+            committed += len(buffer)
+    finally:
+        await run_disk_io(sync_and_close, file_like)
+
+    advanced = await run_db(update_upload_offset, {
+        "id": upload_session.id,
+        "expected_offset": upload_session.upload_offset,
+        "upload_offset": committed,
+    })
+    if not advanced:
+        raise HTTPException(status_code=409, detail="Upload offset was changed by another request", headers=TUS_HEADERS)
+
+    return committed
+
+@router.delete('/{upload_id}')
+async def resumable_upload_terminate(upload_id: str, current_user: dict = Depends(get_current_user)):
+    """Abort an upload session and discard its staged bytes"""
+    upload_session = await get_owned_session(upload_id, current_user)
+    if upload_id in _active_uploads:
+        raise HTTPException(status_code=409, detail="Upload is already in progress", headers=TUS_HEADERS)
+
+    await discard_upload_session(upload_session)
+    return Response(status_code=204, headers=TUS_HEADERS)
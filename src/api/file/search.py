@@ -0,0 +1,79 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from datetime import datetime
+from typing import Optional
+from src.api.auth.dependencies import get_current_user_context
+from src.services.api.file.drive_indexer import get_drive_indexer
+from src.services.api.file.listing_helper import MAX_PAGE_SIZE
+from src.services.api.file.search_helper import MIN_SUBSTRING_LENGTH, SEARCH_CANDIDATES, match_queries
+from src.services.database.files import get_index_scan, search_files
+from src.services.database.db_service import run_db
+from src.services.database.user_context import UserContext
+import os
+
+router = APIRouter(tags=["File"])
+
+@router.get('/')
+async def search(
+    q: str = Query(..., min_length=1, max_length=200, description="Text to look for in file and folder names"),
+    mode: str = Query(default="auto", pattern="^(auto|prefix|substring|words)$", description="Word prefixes, substrings, whole words, or prefixes then substrings"),
+    entry_type: Optional[str] = Query(default=None, alias="type", pattern="^(file|folder)$", description="Only files or only folders"),
+    category: Optional[str] = Query(default=None, description="Only entries of this category (photos, videos, documents, audio, zip, others)"),
+    limit: int = Query(default=50, ge=1, le=MAX_PAGE_SIZE, description="Page size"),
+    offset: int = Query(default=0, ge=0, description="next_offset from the previous page"),
+    user_context: Optional[UserContext] = Depends(get_current_user_context)
+    ):
+    """
+    Search names across the User's drive selection through the full-text
+    index. Word prefix matches rank above names that merely contain the text,
+    and shorter names above longer ones. `truncated` is true when the search
+    matched more than SEARCH_CANDIDATES names in an index and only those were
+    ranked. `index_complete` is false until the drive has been indexed once,
+    and results may be missing until then.
+    """
+    if not user_context:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    user_setting = user_context.user_setting
+    if not user_setting:
+        raise HTTPException(status_code=404, detail="Default Path Section not found")
+
+    words_query, substring_query = match_queries(q, mode)
+    if mode == "substring" and substring_query is None:
+        raise HTTPException(status_code=400, detail=f"Substring search needs at least {MIN_SUBSTRING_LENGTH} characters")
+
+    root = os.path.realpath(user_setting.hard_drive_path_selection)
+    index_scan = await run_db(get_index_scan, root)
+    index_complete = index_scan is not None and index_scan.completed_ns is not None
+    if not index_complete:
+        get_drive_indexer().request_scan()
+
+    # One extra row tells whether another page follows
+    indexed_files, truncated = await run_db(
+        search_files,
+        root,
+        words_query,
+        substring_query,
+        is_dir=None if entry_type is None else entry_type == "folder",
+        category=category,
+        limit=limit + 1,
+        offset=offset,
+        candidates=SEARCH_CANDIDATES,
+    )
+
+    return {
+        "results": [
+            {
+                "name": indexed_file.name,
+                "relative_path": os.path.relpath(indexed_file.path, root),
+                "type": "folder" if indexed_file.is_dir else "file",
+                "size": None if indexed_file.is_dir else indexed_file.size,
+                "mime_type": indexed_file.mime_type,
+                "category": indexed_file.category,
+                "modified": datetime.fromtimestamp(indexed_file.mtime_ns / 1_000_000_000).strftime("%Y-%m-%d %H:%M:%S"),
+            }
+            for indexed_file in indexed_files[:limit]
+        ],
+        "next_offset": offset + limit if len(indexed_files) > limit else None,
+        "truncated": truncated,
+        "index_complete": index_complete,
+    }
@@ -1,9 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import StreamingResponse
-from pathlib import Path
-from src.api.auth.dependencies import get_current_user
-from src.services.database.users import get_user_by_email
-from src.services.database.user_settings import get_user_setting
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from typing import Optional
+from src.api.auth.dependencies import get_current_user_context
+from src.services.database.user_context import UserContext
+from src.services.api.file.disk_io import run_disk_io, stat_file
+from src.services.api.file.cache_helper import etag_version, is_not_modified, make_etag, validator_headers
+from src.services.api.file.file_delivery import FileRangeResponse
+from src.services.api.file.range_helper import RangeNotSatisfiable, http_date, if_range_matches, parse_range_header
 import mimetypes
 
 router = APIRouter(tags=["File"])
@@ -11,31 +13,46 @@ router = APIRouter(tags=["File"])
 @router.get('/')
 async def stream(
     file_name: str,
-    current_user: dict = Depends(get_current_user)
+    request: Request,
+    v: Optional[str] = Query(default=None, description="ETag of the expected version; a match makes media cacheable long term"),
+    user_context: Optional[UserContext] = Depends(get_current_user_context)
     ):
-    """Stream a file that exists on the drive"""
-    email = current_user.get("email")
-    user = get_user_by_email(email)
-    
-    if not user:
+    """Stream a file that exists on the drive, honouring conditional and HTTP Range requests"""
+    if not user_context:
         raise HTTPException(status_code=404, detail="User not found")
 
-    user_setting = get_user_setting(user.id)
+    user_setting = user_context.user_setting
     if not user_setting:
         raise HTTPException(status_code=404, detail="Default Path Section not found")
 
     default_path = user_setting.hard_drive_path_selection
-    file_path = Path(Path(default_path) / Path(file_name)).resolve()
-    
-    if not file_path.exists():
+    file_path, file_stat = await run_disk_io(stat_file, default_path, file_name)
+
+    if file_stat is None:
         raise HTTPException(status_code=404, detail="File not found")
-    
+
     mime_type, _ = mimetypes.guess_type(file_path)
     mime_type = mime_type or "application/octet-stream"
 
-    return StreamingResponse(iterfile(file_path), media_type=mime_type)
+    file_size = file_stat.st_size
+    etag = make_etag(file_stat)
+    headers = validator_headers(etag, http_date(file_stat.st_mtime), mime_type, versioned=v == etag_version(etag))
+
+    # Answer revalidations from the stat alone, without opening the file
+    if is_not_modified(request.headers, etag, file_stat.st_mtime):
+        return Response(status_code=304, headers=headers)
+
+    headers["Accept-Ranges"] = "bytes"
+    range_header = request.headers.get("range")
+    ranges = None
+    if range_header and if_range_matches(request.headers.get("if-range"), file_stat.st_mtime, etag):
+        try:
+            ranges = parse_range_header(range_header, file_size)
+        except RangeNotSatisfiable:
+            raise HTTPException(
+                status_code=416,
+                detail="Requested range not satisfiable",
+                headers={"Content-Range": f"bytes */{file_size}", "Accept-Ranges": "bytes"},
+            )
 
-def iterfile(file_path):
-    with open(file_path, mode="rb") as file_like:
-        while chunk := file_like.read(1024 * 1024):
-            yield chunk
+    return FileRangeResponse(file_path, file_size, ranges, headers=headers, media_type=mime_type)
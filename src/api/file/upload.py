@@ -1,26 +1,57 @@
-from fastapi import APIRouter, File, UploadFile, Form
-from typing import List
-import shutil
-from pathlib import Path
+from fastapi import APIRouter, Query, Request
+from typing import Optional
+from src.services.api.file.multipart_upload import MultipartUploadReceiver
 
 router = APIRouter(tags=["File"])
 
-@router.post('/')
+@router.post('/', openapi_extra={
+    "requestBody": {
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "required": ["file_path_location", "files"],
+                    "properties": {
+                        "file_path_location": {"type": "string"},
+                        "files": {"type": "array", "items": {"type": "string", "format": "binary"}},
+                    },
+                }
+            }
+        },
+        "required": True,
+    }
+})
 async def upload(
-    file_path_location: str = Form(...),
-    files: List[UploadFile] = File(...)
+    request: Request,
+    file_path_location: Optional[str] = Query(default=None, description="Destination folder, if not sent as a form field before the files"),
     ):
-    """Upload your file to the drive given a path"""
-    uploaded_filenames = []
+    """
+    Upload your file to the drive given a path. The multipart body is parsed as
+    it arrives and each file is written straight into place without spooling,
+    several files at a time. A file that fails is reported in `failed_files`
+    without aborting the rest of the batch. Files are reported under the name
+    they were stored as. When dedup is enabled, files whose content was already
+    on the drive are listed in `deduplicated_files`.
+    """
+    content_length = request.headers.get("content-length")
 
-    for file in files:
-        file_location = Path(file_path_location) / file.filename
-        with open(file_location, "wb") as buffer:
-            try:
-                shutil.copyfileobj(file.file, buffer)
-            except Exception as e:
-                return {"status": "error", "message": f"Unexpected error occurred: {e}"}
-        
-        uploaded_filenames.append(file.filename)
-    
-    return {"uploaded_files": uploaded_filenames}
+    try:
+        receiver = MultipartUploadReceiver(
+            request.headers.get("content-type", ""),
+            int(content_length) if content_length and content_length.isdigit() else None,
+            file_path_location,
+        )
+        results = await receiver.receive(request.stream())
+    except Exception as e:
+        return {"status": "error", "message": f"Unexpected error occurred: {e}"}
+
+    return {
+        "uploaded_files": [result["filename"] for result in results if result["status"] == "uploaded"],
+        "failed_files": [
+            {"filename": result["filename"], "error": result["error"]}
+            for result in results if result["status"] == "failed"
+        ],
+        "deduplicated_files": [result["filename"] for result in results if result["deduplicated"]],
+        "bytes_saved": sum(result["size"] for result in results if result["deduplicated"]),
+        "files": results,
+    }
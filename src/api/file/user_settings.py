@@ -2,9 +2,9 @@ from pydantic import BaseModel, Field
 from fastapi import APIRouter, HTTPException, Depends
 from datetime import datetime
 from typing import Optional
-from src.services.database.users import get_user_by_email
-from src.services.database.user_settings import get_user_setting, create_user_setting, update_user_setting
-from src.api.auth.dependencies import get_current_user
+from src.services.database.async_db import create_user_setting, update_user_setting
+from src.services.database.user_context import UserContext
+from src.api.auth.dependencies import get_current_user_context
 
 router = APIRouter(tags=["File"])
 
@@ -21,25 +21,23 @@ class UserSettingModel(BaseModel):
 @router.put('/')
 async def user_settings(
         payload: UserSettings,
-        current_user: dict = Depends(get_current_user)
+        user_context: Optional[UserContext] = Depends(get_current_user_context)
     ):
     """Create or Update User Settings based off email from cookie (access token)"""
     
-    email = current_user.get("email")
-    user = get_user_by_email(email)
-    
-    if not user:
+    if not user_context:
         raise HTTPException(status_code=404, detail="User not found")
 
-    user_setting = get_user_setting(user.id)
+    user = user_context.user
+    user_setting = user_context.user_setting
     if not user_setting:
-        create_user_setting({
+        await create_user_setting({
                             "user_id": user.id,
                             "hard_drive_path_selection": payload.hard_drive_path_selection
                             })
         return {"status": "ok"}
 
-    update_user_setting({
+    await update_user_setting({
         "user_id": user.id,
         "hard_drive_path_selection": payload.hard_drive_path_selection
     }) 
@@ -48,17 +46,14 @@ async def user_settings(
 
 @router.get('/', response_model=Optional[UserSettingModel])
 async def user_settings(
-        current_user: dict = Depends(get_current_user),
+        user_context: Optional[UserContext] = Depends(get_current_user_context),
     ):
     """Get User Settings for the current user based off email from Cookie (access token)"""
 
-    email = current_user.get("email")
-    user = get_user_by_email(email)
-
-    if not user:
+    if not user_context:
         raise HTTPException(status_code=404, detail="User not found")
 
-    user_setting = get_user_setting(user.id)
+    user_setting = user_context.user_setting
 
     if not user_setting:
         return None
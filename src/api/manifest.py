@@ -0,0 +1,56 @@
+"""
+The routers the app serves: (module, URL prefix, public). A public router
+skips the `get_current_user` dependency.
+
+Listing them here saves walking and importing every `src.api` package at
+startup. After adding, moving or removing a router, regenerate the list with
+`python -m src.api.manifest`; tests/api/test_manifest.py fails until it
+matches the tree.
+"""
+import importlib
+import pkgutil
+from pathlib import Path
+from typing import List, Tuple
+
+PUBLIC_ROUTES = ["auth/login", "auth/logout", "health_check"]
+
+ROUTES = (
+    ("src.api.auth.login", "/auth/login", True),
+    ("src.api.auth.logout", "/auth/logout", True),
+    ("src.api.auth.verify", "/auth/verify", False),
+    ("src.api.file.browse", "/file/browse", False),
+    ("src.api.file.have", "/file/have", False),
+    ("src.api.file.list_folder_items", "/file/list_folder_items", False),
+    ("src.api.file.list_mounted_drives", "/file/list_mounted_drives", False),
+    ("src.api.file.resumable_upload", "/file/resumable_upload", False),
+    ("src.api.file.search", "/file/search", False),
+    ("src.api.file.stream", "/file/stream", False),
+    ("src.api.file.upload", "/file/upload", False),
+    ("src.api.file.user_settings", "/file/user_settings", False),
+    ("src.api.health_check", "/health_check", True),
+    ("src.api.permissions.admin_check", "/permissions/admin_check", False),
+    ("src.api.permissions.share", "/permissions/share", False),
+)
+
+def convert_module_path_to_url_prefix(module_name: str, package: str) -> str:
+    partial_relative_path = module_name.replace(package + ".", "")
+
+    return partial_relative_path.replace(".", "/")
+
+def discover_routes(package: str = "src.api") -> List[Tuple[str, str, bool]]:
+    """Walk `package` for modules with a `router`, the way ROUTES is generated."""
+    api_path = Path(__file__).parent
+    routes = []
+    for module_info in pkgutil.walk_packages([str(api_path)], prefix=f"{package}."):
+        module = importlib.import_module(module_info.name)
+
+        if hasattr(module, "router"):
+            relative_path = convert_module_path_to_url_prefix(module_info.name, package)
+            routes.append((module_info.name, f"/{relative_path}", relative_path in PUBLIC_ROUTES))
+    return routes
+
+if __name__ == "__main__":
+    print("ROUTES = (")
+    for route in discover_routes():
+        print(f"    {route!r},")
+    print(")")
@@ -1,8 +1,17 @@
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel, Field
-from src.api.auth.dependencies import get_current_user
-from src.services.database.user_settings import get_user_setting, update_user_setting, create_user_setting
-from src.services.database.users import get_user_by_email, create_user, update_user
+from typing import Optional
+from src.api.auth.dependencies import get_current_user_context
+from src.services.database.async_db import (
+    create_user,
+    create_user_setting,
+    get_user_by_email,
+    get_user_setting,
+    reload_allowed_emails,
+    update_user,
+    update_user_setting,
+)
+from src.services.database.user_context import UserContext
 
 router = APIRouter(tags=["Permissions"])
 
@@ -14,17 +23,14 @@ class ShareForm(BaseModel):
 @router.put('/')
 async def share(
         payload: ShareForm,
-        current_user: dict = Depends(get_current_user)
+        user_context: Optional[UserContext] = Depends(get_current_user_context)
     ):
     """Create or Update User for sharing a specific file path on the drive"""
-    email = current_user.get("email")
-    user = get_user_by_email(email)
-
-    if not user.is_admin:
+    if not user_context or not user_context.user.is_admin:
          raise HTTPException(status_code=401, detail="Unauthorized sharing access")
 
     form_email = payload.email
-    form_user = get_user_by_email(form_email)
+    form_user = await get_user_by_email(form_email)
 
     if not form_user:
         user_payload = {
@@ -33,32 +39,34 @@ async def share(
             "is_admin": False,
             "is_guest": True
         }
-        new_form_user = create_user(user_payload)
+        new_form_user = await create_user(user_payload)
+        # Let them sign in straight away
+        await reload_allowed_emails()
 
         user_setting_payload = {
             "user_id": new_form_user.id,
             "hard_drive_path_selection": payload.hard_drive_path_selection
         }
-        create_user_setting(user_setting_payload)
+        await create_user_setting(user_setting_payload)
 
         return {"status": "ok"}
 
-    update_user({
+    await update_user({
         "email": form_user.email,
         "name": payload.name,
         "is_admin": False,
         "is_guest": True
     })
 
-    user_setting = get_user_setting(form_user.id)
+    user_setting = await get_user_setting(form_user.id)
     if not user_setting:
-        create_user_setting({
+        await create_user_setting({
                             "user_id": form_user.id,
                             "hard_drive_path_selection": payload.hard_drive_path_selection
                             })
         return {"status": "ok"}
     
-    update_user_setting({
+    await update_user_setting({
         "user_id": form_user.id,
         "hard_drive_path_selection": payload.hard_drive_path_selection
     })
@@ -1,28 +1,73 @@
 import importlib
+import sqlite3
+import zlib
 from pathlib import Path
-from src.services.database.db_service import get_connection
+from typing import List
+from src.services.database.db_service import get_connection, transaction
+
+# Every migration in order. Regenerate with `python -m src.database.initializer`
+# after adding one; tests/database/test_initializer.py fails until it matches.
+MIGRATIONS = (
+    "001_initial_schema",
+    "002_upload_sessions",
+    "003_file_hashes",
+    "004_files",
+    "005_file_index_checkpoints",
+    "006_files_search",
+)
+
+# Kept in PRAGMA user_version once every migration above is applied. It changes
+# whenever the list does, so a database migrated by an older build never matches.
+SCHEMA_VERSION = zlib.crc32("\n".join(MIGRATIONS).encode()) & 0x7FFFFFFF
+
+def execute_script(conn, script: str) -> None:
+    """
+    Run each statement of `script` in turn. Unlike `executescript`, which
+    commits first, this leaves the caller's transaction open.
+    """
+    statement = ""
+    for line in script.splitlines(keepends=True):
+        statement += line
+        if sqlite3.complete_statement(statement):
+            conn.execute(statement)
+            statement = ""
+
+def discover_migrations() -> List[str]:
+    """The migration files on disk, the way MIGRATIONS is generated."""
+    migration_dir = Path(__file__).parent / "migrations"
+    return [migration_file.stem for migration_file in sorted(migration_dir.glob("*.py"))]
 
 class DatabaseInitializer:
     def __init__(self):
         self.run_migrations()
 
     def run_migrations(self):
+        # Fast path: one read of the database header when nothing is pending
         with get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
+            if conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION:
+                return
+
+        # All pending migrations and the new version commit together, or not at all
+        with transaction() as conn:
+            conn.execute("""
                 CREATE TABLE IF NOT EXISTS migrations (
                     name TEXT PRIMARY KEY
                 )
             """)
-            conn.commit()
-            
-            migration_dir = Path(__file__).parent / "migrations"
-            for migration_file in sorted(migration_dir.glob("*.py")):
-                migration = migration_file.stem
-                cursor.execute("SELECT name FROM migrations WHERE name = :migration", {"migration": migration})
-                if not cursor.fetchone():
-                    module = importlib.import_module(f"src.database.migrations.{migration}")
-                    module.up(conn)
-                    cursor.execute("INSERT INTO migrations (name) VALUES (:migration)", {"migration": migration})
-                    conn.commit()
-                    print(f"Ran migration: {migration}")
\ No newline at end of file
+            applied = {row[0] for row in conn.execute("SELECT name FROM migrations")}
+
+            for migration in MIGRATIONS:
+                if migration in applied:
+                    continue
+                module = importlib.import_module(f"src.database.migrations.{migration}")
+                module.up(conn)
+                conn.execute("INSERT INTO migrations (name) VALUES (:migration)", {"migration": migration})
+                print(f"Ran migration: {migration}")
+
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+if __name__ == "__main__":
+    print("MIGRATIONS = (")
+    for migration in discover_migrations():
+        print(f"    {migration!r},")
+    print(")")
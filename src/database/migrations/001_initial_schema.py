@@ -1,13 +1,14 @@
 # 001_initial_schema
 import os
 from dotenv import load_dotenv
+from src.database.initializer import execute_script
 
 def up(conn):
     load_dotenv()
     first_user_email = os.getenv("FIRST_USER_EMAIL", "first.last@example.com")
     first_user_name = os.getenv("FIRST_USER_NAME", "First Last")
 
-    conn.executescript("""
+    execute_script(conn, """
         CREATE TABLE users (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             email TEXT UNIQUE NOT NULL,
@@ -25,17 +26,14 @@ def up(conn):
             updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
         );
     """)
-    conn.commit()
 
     conn.execute(
         "INSERT INTO users (email, name, is_admin, is_guest) VALUES (:email, :name, :is_admin, :is_guest);",
         {"email": first_user_email, "name": first_user_name, "is_admin": 1, "is_guest": 0}
     )
-    conn.commit()
 
 def down(conn):
-    conn.executescript("""
+    execute_script(conn, """
         DROP TABLE user_settings;
         DROP TABLE users;
     """)
-    conn.commit()
\ No newline at end of file
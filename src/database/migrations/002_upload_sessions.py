@@ -0,0 +1,22 @@
+# 002_upload_sessions
+from src.database.initializer import execute_script
+
+def up(conn):
+    execute_script(conn, """
+        CREATE TABLE upload_sessions (
+            id TEXT PRIMARY KEY,
+            owner_email TEXT NOT NULL,
+            file_path_location TEXT NOT NULL,
+            filename TEXT NOT NULL,
+            upload_length INTEGER NOT NULL,
+            upload_offset INTEGER NOT NULL DEFAULT 0,
+            temp_path TEXT NOT NULL,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        );
+    """)
+
+def down(conn):
+    execute_script(conn, """
+        DROP TABLE upload_sessions;
+    """)
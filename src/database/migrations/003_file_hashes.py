@@ -0,0 +1,23 @@
+# 003_file_hashes
+from src.database.initializer import execute_script
+
+def up(conn):
+    execute_script(conn, """
+        CREATE TABLE file_hashes (
+            path TEXT PRIMARY KEY,
+            hash TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            inode INTEGER NOT NULL,
+            mtime_ns INTEGER NOT NULL,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        );
+
+        CREATE INDEX idx_file_hashes_hash ON file_hashes (hash, size);
+    """)
+
+def down(conn):
+    execute_script(conn, """
+        DROP INDEX idx_file_hashes_hash;
+        DROP TABLE file_hashes;
+    """)
@@ -0,0 +1,40 @@
+# 004_files
+from src.database.initializer import execute_script
+
+def up(conn):
+    execute_script(conn, """
+        CREATE TABLE files (
+            path TEXT PRIMARY KEY,
+            parent TEXT NOT NULL,
+            name TEXT NOT NULL,
+            is_dir BOOLEAN NOT NULL DEFAULT FALSE,
+            size INTEGER NOT NULL,
+            mtime_ns INTEGER NOT NULL,
+            mime_type TEXT,
+            category TEXT,
+            inode INTEGER NOT NULL,
+            owner INTEGER,
+            indexed_ns INTEGER NOT NULL
+        );
+
+        CREATE INDEX idx_files_parent ON files (parent, name);
+        CREATE INDEX idx_files_category_mtime ON files (category, mtime_ns);
+        CREATE INDEX idx_files_category_size ON files (category, size);
+
+        CREATE TABLE file_index_scans (
+            root TEXT PRIMARY KEY,
+            started_ns INTEGER NOT NULL,
+            completed_ns INTEGER,
+            file_count INTEGER NOT NULL DEFAULT 0,
+            directory_count INTEGER NOT NULL DEFAULT 0
+        );
+    """)
+
+def down(conn):
+    execute_script(conn, """
+        DROP TABLE file_index_scans;
+        DROP INDEX idx_files_category_size;
+        DROP INDEX idx_files_category_mtime;
+        DROP INDEX idx_files_parent;
+        DROP TABLE files;
+    """)
@@ -0,0 +1,29 @@
+# 005_file_index_checkpoints
+from src.database.initializer import execute_script
+
+def up(conn):
+    execute_script(conn, """
+        CREATE INDEX idx_files_inode ON files (inode);
+
+        CREATE TABLE file_index_checkpoints (
+            root TEXT PRIMARY KEY,
+            started_ns INTEGER NOT NULL,
+            pending TEXT NOT NULL,
+            file_count INTEGER NOT NULL DEFAULT 0,
+            directory_count INTEGER NOT NULL DEFAULT 0,
+            skipped_count INTEGER NOT NULL DEFAULT 0,
+            renamed_count INTEGER NOT NULL DEFAULT 0,
+            updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        );
+
+        ALTER TABLE file_index_scans ADD COLUMN skipped_count INTEGER NOT NULL DEFAULT 0;
+        ALTER TABLE file_index_scans ADD COLUMN renamed_count INTEGER NOT NULL DEFAULT 0;
+    """)
+
+def down(conn):
+    execute_script(conn, """
+        ALTER TABLE file_index_scans DROP COLUMN renamed_count;
+        ALTER TABLE file_index_scans DROP COLUMN skipped_count;
+        DROP TABLE file_index_checkpoints;
+        DROP INDEX idx_files_inode;
+    """)
@@ -0,0 +1,104 @@
+# 006_files_search
+from src.database.initializer import execute_script
+
+def up(conn):
+    # FTS5 external content tables address rows by an integer key, so the files
+    # table is rebuilt with an explicit one that VACUUM can never renumber
+    execute_script(conn, """
+        CREATE TABLE files_new (
+            id INTEGER PRIMARY KEY,
+            path TEXT NOT NULL UNIQUE,
+            parent TEXT NOT NULL,
+            name TEXT NOT NULL,
+            is_dir BOOLEAN NOT NULL DEFAULT FALSE,
+            size INTEGER NOT NULL,
+            mtime_ns INTEGER NOT NULL,
+            mime_type TEXT,
+            category TEXT,
+            inode INTEGER NOT NULL,
+            owner INTEGER,
+            indexed_ns INTEGER NOT NULL
+        );
+
+        INSERT INTO files_new (path, parent, name, is_dir, size, mtime_ns, mime_type, category, inode, owner, indexed_ns)
+        SELECT path, parent, name, is_dir, size, mtime_ns, mime_type, category, inode, owner, indexed_ns
+        FROM files;
+
+        DROP TABLE files;
+        ALTER TABLE files_new RENAME TO files;
+
+        CREATE INDEX idx_files_parent ON files (parent, name);
+        CREATE INDEX idx_files_category_mtime ON files (category, mtime_ns);
+        CREATE INDEX idx_files_category_size ON files (category, size);
+        CREATE INDEX idx_files_inode ON files (inode);
+
+        -- Whole words and word prefixes; `_`, `-`, `.` and spaces all split words
+        CREATE VIRTUAL TABLE files_words USING fts5(
+            name,
+            content = 'files',
+            content_rowid = 'id',
+            tokenize = 'unicode61 remove_diacritics 2',
+            prefix = '2 3'
+        );
+        -- Any substring of three characters or more
+        CREATE VIRTUAL TABLE files_trigram USING fts5(
+            name,
+            content = 'files',
+            content_rowid = 'id',
+            tokenize = 'trigram'
+        );
+        INSERT INTO files_words (files_words) VALUES ('rebuild');
+        INSERT INTO files_trigram (files_trigram) VALUES ('rebuild');
+
+        CREATE TRIGGER files_search_insert AFTER INSERT ON files BEGIN
+            INSERT INTO files_words (rowid, name) VALUES (new.id, new.name);
+            INSERT INTO files_trigram (rowid, name) VALUES (new.id, new.name);
+        END;
+
+        CREATE TRIGGER files_search_delete AFTER DELETE ON files BEGIN
+            INSERT INTO files_words (files_words, rowid, name) VALUES ('delete', old.id, old.name);
+            INSERT INTO files_trigram (files_trigram, rowid, name) VALUES ('delete', old.id, old.name);
+        END;
+
+        CREATE TRIGGER files_search_update AFTER UPDATE OF name ON files BEGIN
+            INSERT INTO files_words (files_words, rowid, name) VALUES ('delete', old.id, old.name);
+            INSERT INTO files_trigram (files_trigram, rowid, name) VALUES ('delete', old.id, old.name);
+            INSERT INTO files_words (rowid, name) VALUES (new.id, new.name);
+            INSERT INTO files_trigram (rowid, name) VALUES (new.id, new.name);
+        END;
+    """)
+
+def down(conn):
+    execute_script(conn, """
+        DROP TRIGGER files_search_update;
+        DROP TRIGGER files_search_delete;
+        DROP TRIGGER files_search_insert;
+        DROP TABLE files_trigram;
+        DROP TABLE files_words;
+
+        CREATE TABLE files_old (
+            path TEXT PRIMARY KEY,
+            parent TEXT NOT NULL,
+            name TEXT NOT NULL,
+            is_dir BOOLEAN NOT NULL DEFAULT FALSE,
+            size INTEGER NOT NULL,
+            mtime_ns INTEGER NOT NULL,
+            mime_type TEXT,
+            category TEXT,
+            inode INTEGER NOT NULL,
+            owner INTEGER,
+            indexed_ns INTEGER NOT NULL
+        );
+
+        INSERT INTO files_old (path, parent, name, is_dir, size, mtime_ns, mime_type, category, inode, owner, indexed_ns)
+        SELECT path, parent, name, is_dir, size, mtime_ns, mime_type, category, inode, owner, indexed_ns
+        FROM files;
+
+        DROP TABLE files;
+        ALTER TABLE files_old RENAME TO files;
+
+        CREATE INDEX idx_files_parent ON files (parent, name);
+        CREATE INDEX idx_files_category_mtime ON files (category, mtime_ns);
+        CREATE INDEX idx_files_category_size ON files (category, size);
+        CREATE INDEX idx_files_inode ON files (inode);
+    """)
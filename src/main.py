@@ -1,45 +1,94 @@
+from contextlib import asynccontextmanager
+import asyncio
+import signal
 from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from pathlib import Path
-import pkgutil
 import importlib
 from src.api.auth.dependencies import get_current_user
+from src.api.manifest import ROUTES
 from dotenv import load_dotenv
 from src.database.initializer import DatabaseInitializer
+from src.services.api.file.drive_indexer import get_drive_indexer
+from src.services.api.file.drive_inventory import get_drive_inventory
+from src.services.auth.allow_email_helper import reload_allowed_emails
+from src.services.auth.google_helper import get_google_certs
+from src.services.auth.jwt_helper import reload_jwt_settings
+from src.services.database.db_service import close_connections
 
 load_dotenv()
 
-app = FastAPI(title = "Personal Cloud Service")
-DatabaseInitializer()
+def reload_settings() -> None:
+    """SIGHUP handler: re-read .env so a rotated JWT key or allow-list applies without a restart."""
+    load_dotenv(override=True)
+    try:
+        reload_jwt_settings()
+    except ValueError as e:
+        print(f"Exception [reload_settings]: {e}")
+    try:
+        reload_allowed_emails()
+    except Exception as e:
+        print(f"Exception [reload_settings]: {e}")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Migrate on startup rather than on import, so importing the app stays cheap
+    DatabaseInitializer()
+
+    # Parse the JWT key once up front, and again on SIGHUP
+    reload_jwt_settings()
+    try:
+        asyncio.get_running_loop().add_signal_handler(signal.SIGHUP, reload_settings)
+    except (NotImplementedError, RuntimeError, ValueError, AttributeError):
+        # Only the main thread of a Unix process can take signals
+        pass
+
+    # Build the allow-list before the first request needs it
+    try:
+        reload_allowed_emails()
+    except Exception as e:
+        print(f"Exception [lifespan]: {e}")
+
+    # Keep Google's signing keys fetched ahead of logins
+    google_certs = get_google_certs()
+    google_certs.start()
+
+    # Keep the files index reconciled with the drives in the background
+    drive_indexer = get_drive_indexer()
+    drive_indexer.start()
+
+    # Sample the mounted drives off the request path
+    drive_inventory = get_drive_inventory()
+    drive_inventory.start()
+    yield
+    drive_inventory.stop()
+    drive_indexer.stop()
+    google_certs.stop()
+    close_connections()
+
+app = FastAPI(title = "Personal Cloud Service", lifespan = lifespan)
 
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:3000", "http://127.0.0.1:3000"],  # Your Next.js dev server
     allow_credentials=True,
-    allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
+    allow_methods=["GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
     allow_headers=["*"],
+    expose_headers=[
+        "Accept-Ranges", "Content-Range", "Content-Length", "ETag",
+        "X-Next-Cursor", "X-Total-Count",
+        "Location", "Upload-Offset", "Upload-Length", "Upload-Expires", "Tus-Resumable", "Tus-Version", "Tus-Extension",
+    ],
 )
 
 def include_routers():
-    package = "src.api"
-    api_path = Path(__file__).parent / "api"
-
-    for module_info in pkgutil.walk_packages([str(api_path)], prefix=f"{package}."):
-        module = importlib.import_module(module_info.name)
-        
-        if hasattr(module, "router"):
-            relative_path = convert_module_path_to_url_prefix(module_info, package)
-            prefix = f"/{relative_path}"
-
-            if relative_path not in ["auth/login", "auth/logout", "health_check"]:
-                app.include_router(module.router, prefix=prefix, dependencies=[Depends(get_current_user)])
-            else:
-                app.include_router(module.router, prefix=prefix)
-
-def convert_module_path_to_url_prefix(module_info, package):
-    partial_relative_path = module_info.name.replace(package + ".", "")
-    
-    return partial_relative_path.replace(".", "/")
-            
-include_routers()
\ No newline at end of file
+    # The precomputed manifest, rather than walking src.api on every start
+    for module_name, prefix, public in ROUTES:
+        module = importlib.import_module(module_name)
+
+        if public:
+            app.include_router(module.router, prefix=prefix)
+        else:
+            app.include_router(module.router, prefix=prefix, dependencies=[Depends(get_current_user)])
+
+include_routers()
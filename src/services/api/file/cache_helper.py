@@ -0,0 +1,64 @@
+# api/file/cache_helper.py
+from email.utils import parsedate_to_datetime
+from typing import Dict
+import os
+
+DEFAULT_CACHE_CONTROL = "private, no-cache"
+
+# `/file/stream/?file_name=...` URLs are not versioned and uploads may replace a
+# file under the same name, so by default every response revalidates. That is
+# cheap because a matching validator is answered with 304 from a single stat.
+# Media requested with `v=<etag>` names one exact version of the file and can be
+# cached for a long time without revalidation.
+VERSIONED_CACHE_CONTROL_POLICIES = {
+    "image": "private, max-age=31536000, immutable",
+    "video": "private, max-age=31536000, immutable",
+    "audio": "private, max-age=31536000, immutable",
+}
+
+def make_etag(file_stat: os.stat_result) -> str:
+    """Strong entity tag built from the file's inode, size and modification time."""
+    return f'"{file_stat.st_ino:x}-{file_stat.st_size:x}-{file_stat.st_mtime_ns:x}"'
+
+def etag_version(etag: str) -> str:
+    """The entity tag without quotes, as clients pass it in the `v` query parameter."""
+    return etag.strip('"')
+
+def cache_control_for(mime_type: str, versioned: bool = False) -> str:
+    if not versioned:
+        return DEFAULT_CACHE_CONTROL
+    family = mime_type.split("/", 1)[0]
+    return VERSIONED_CACHE_CONTROL_POLICIES.get(family, DEFAULT_CACHE_CONTROL)
+
+def parse_entity_tags(header: str):
+    """Split an If-None-Match / If-Match list into entity tags, keeping any W/ prefix."""
+    return [tag.strip() for tag in header.split(",") if tag.strip()]
+
+def weak_match(first: str, second: str) -> bool:
+    return first.removeprefix("W/") == second.removeprefix("W/")
+
+def is_not_modified(headers: Dict[str, str], etag: str, mtime: float) -> bool:
+    """
+    Evaluate If-None-Match and If-Modified-Since per RFC 7232. If-None-Match takes
+    precedence; If-Modified-Since is only consulted when it is absent.
+    """
+    if_none_match = headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = parse_entity_tags(if_none_match)
+        return "*" in tags or any(weak_match(tag, etag) for tag in tags)
+
+    if_modified_since = headers.get("if-modified-since")
+    if if_modified_since is None:
+        return False
+
+    try:
+        return int(mtime) <= int(parsedate_to_datetime(if_modified_since).timestamp())
+    except (TypeError, ValueError):
+        return False
+
+def validator_headers(etag: str, last_modified: str, mime_type: str, versioned: bool = False) -> Dict[str, str]:
+    return {
+        "ETag": etag,
+        "Last-Modified": last_modified,
+        "Cache-Control": cache_control_for(mime_type, versioned),
+    }
@@ -0,0 +1,86 @@
+# api/file/dedup_helper.py
+from pathlib import Path
+from typing import Dict, List, Optional
+import hashlib
+import os
+import uuid
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# "off", "reflink" (copy-on-write clone, falls back to a plain copy) or "hardlink"
+DEDUP_MODE = os.getenv("UPLOAD_DEDUP", "off").lower()
+# FICLONE from linux/fs.h; Btrfs and XFS support it
+FICLONE = 0x40049409
+
+def new_hasher():
+    return hashlib.sha256()
+
+def hash_record(path: Path, hash: str, file_stat) -> Dict:
+    return {
+        "path": os.path.abspath(path),
+        "hash": hash,
+        "size": file_stat.st_size,
+        "inode": file_stat.st_ino,
+        "mtime_ns": file_stat.st_mtime_ns,
+    }
+
+def record_matches(file_stat, record) -> bool:
+    """Whether a file still is the one hashed into `record`, so the stored hash can be trusted."""
+    return (
+        file_stat.st_ino == record.inode
+        and file_stat.st_size == record.size
+        and file_stat.st_mtime_ns == record.mtime_ns
+    )
+
+def find_original(destination: Path, records: List) -> Optional[Path]:
+    """
+    Pick a file among `records` that still holds the hashed bytes and lives on
+    the same filesystem as `destination`, so it can be linked to.
+    """
+    destination = Path(os.path.abspath(destination))
+    device = destination.parent.stat().st_dev
+    for record in records:
+        path = Path(record.path)
+        if path == destination:
+            continue
+        try:
+            file_stat = path.stat()
+        except OSError:
+            continue
+        if file_stat.st_dev == device and record_matches(file_stat, record):
+            return path
+    return None
+
+def link_duplicate(original: Path, destination: Path, mode: str) -> bool:
+    """
+    Replace `destination` with a reflink or hard link to `original`, which holds
+    the same bytes. Returns False, leaving `destination` untouched, when the
+    filesystem cannot share the blob.
+    """
+    temp_path = destination.parent / f".{destination.name}.{uuid.uuid4().hex}.link"
+    try:
+        if mode == "reflink":
+            reflink(original, temp_path)
+        else:
+            os.link(original, temp_path)
+    except OSError:
+        try:
+            os.remove(temp_path)
+        except FileNotFoundError:
+            pass
+        return False
+
+    os.replace(temp_path, destination)
+    return True
+
+def reflink(source: Path, target: Path) -> None:
+    if fcntl is None:
+        raise OSError("Reflinks are not supported on this platform")
+    with open(source, "rb") as source_file, open(target, "wb") as target_file:
+        fcntl.ioctl(target_file.fileno(), FICLONE, source_file.fileno())
+
+def deduplicate_file(destination: Path, records: List, mode: str) -> bool:
+    original = find_original(destination, records)
+    return original is not None and link_duplicate(original, destination, mode)
@@ -0,0 +1,43 @@
+# api/file/directory_scanner.py
+from typing import Dict, Iterator, List, Tuple
+import os
+import stat
+
+FILE_ATTRIBUTE_HIDDEN = 0x2
+
+def iter_directory(path) -> Iterator[Tuple[os.DirEntry, os.stat_result]]:
+    """
+    Yield each non-hidden entry of a directory with its stat, one `stat` per entry.
+
+    Dot files are skipped on the name alone, before any syscall. On Windows the
+    stat is filled in from the directory listing itself, hidden attribute
+    included. Entries that cannot be stat'ed, such as broken symlinks, are
+    skipped.
+    """
+    with os.scandir(path) as iterator:
+        for entry in iterator:
+            if entry.name.startswith("."):
+                continue
+
+            try:
+                entry_stat = entry.stat()
+            except OSError:
+                continue
+
+            if getattr(entry_stat, "st_file_attributes", 0) & FILE_ATTRIBUTE_HIDDEN:
+                continue
+
+            yield entry, entry_stat
+
+def scan_directory(path) -> List[Dict]:
+    """List the non-hidden entries of a directory; the type comes from the same stat as the size and mtime."""
+    return [
+        {
+            "name": entry.name,
+            "path": entry.path,
+            "is_dir": stat.S_ISDIR(entry_stat.st_mode),
+            "size": entry_stat.st_size,
+            "mtime": entry_stat.st_mtime,
+        }
+        for entry, entry_stat in iter_directory(path)
+    ]
@@ -0,0 +1,72 @@
+# api/file/disk_io.py
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import AsyncIterator, Optional, Tuple
+import asyncio
+import functools
+import os
+import stat
+
+CHUNK_SIZE = 1024 * 1024
+
+_disk_executor = None
+
+def get_disk_executor() -> ThreadPoolExecutor:
+    """
+    Bounded pool for blocking filesystem calls. Kept separate from the default
+    threadpool so a spinning-up drive cannot starve unrelated requests.
+    """
+    global _disk_executor
+    if _disk_executor is None:
+        _disk_executor = ThreadPoolExecutor(
+            max_workers=int(os.getenv("DISK_IO_WORKERS", "4")),
+            thread_name_prefix="disk-io",
+        )
+    return _disk_executor
+
+def submit_disk_io(func, *args) -> asyncio.Future:
+    """Schedule `func(*args)` on the disk pool immediately and return its future."""
+    loop = asyncio.get_running_loop()
+    return loop.run_in_executor(get_disk_executor(), functools.partial(func, *args))
+
+async def run_disk_io(func, *args):
+    return await submit_disk_io(func, *args)
+
+def stat_file(base_path: str, relative_path: str) -> Tuple[Path, Optional[os.stat_result]]:
+    """Resolve a path under the drive and stat it; the stat is None unless it is a regular file."""
+    file_path = Path(Path(base_path) / Path(relative_path)).resolve()
+    try:
+        file_stat = file_path.stat()
+    except (FileNotFoundError, NotADirectoryError):
+        return file_path, None
+
+    if not stat.S_ISREG(file_stat.st_mode):
+        return file_path, None
+    return file_path, file_stat
+
+async def read_file_range(file_like, start: int, end: int, chunk_size: int = CHUNK_SIZE) -> AsyncIterator[bytes]:
+    """
+    Yield the inclusive byte range [start, end] of an open file. The next chunk
+    is read on the disk pool while the caller is still sending the current one.
+    """
+    def read_chunk(size):
+        return file_like.read(size)
+
+    await run_disk_io(file_like.seek, start)
+    remaining = end - start + 1
+    pending = submit_disk_io(read_chunk, min(chunk_size, remaining))
+    try:
+        while pending is not None:
+            chunk = await pending
+            pending = None
+            if not chunk:
+                break
+
+            remaining -= len(chunk)
+            if remaining > 0:
+                pending = submit_disk_io(read_chunk, min(chunk_size, remaining))
+            yield chunk
+    finally:
+        if pending is not None:
+            # Let an abandoned read-ahead finish before the file is closed
+            await asyncio.wait([pending])
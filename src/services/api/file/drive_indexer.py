@@ -0,0 +1,334 @@
+# api/file/drive_indexer.py
+from typing import Callable, Dict, List, Optional, Tuple
+from src.services.api.file.directory_scanner import iter_directory
+from src.services.api.file.listing_cache import MTIME_SETTLE_SECONDS
+from src.services.api.file_path_helper import CATEGORIES, get_external_drive_path, get_folder_destination
+from src.services.database.files import (
+    delete_stale_children,
+    delete_stale_files,
+    finish_index_scan,
+    get_child_directories,
+    get_children,
+    get_files_by_inode,
+    get_index_checkpoint,
+    get_indexed_file,
+    save_index_batch,
+    start_index_scan,
+    subtree_bounds,
+    upsert_files,
+)
+from src.services.database.user_settings import get_drive_path_selections
+import mimetypes
+import os
+import stat
+import threading
+import time
+
+# Seconds between reconciliation scans of every drive; 0 disables the background indexer
+DRIVE_INDEX_INTERVAL = int(os.getenv("DRIVE_INDEX_INTERVAL", "3600"))
+INDEX_BATCH_SIZE = 5000
+
+def category_for(root: str, path: str, mime_type: Optional[str]) -> Optional[str]:
+    """
+    The category folder an entry sits in, or for files outside the category
+    folders the one an upload of its type would be sorted into.
+    """
+    top, _, rest = os.path.relpath(path, root).partition(os.sep)
+    if top in CATEGORIES and rest:
+        return top
+    if mime_type is None:
+        return None
+    return get_folder_destination(mime_type).lstrip("/")
+
+def index_record(root: str, path: str, entry_stat: os.stat_result, indexed_ns: int) -> Dict:
+    is_dir = stat.S_ISDIR(entry_stat.st_mode)
+    mime_type = None
+    if not is_dir:
+        mime_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+
+    return {
+        "path": path,
+        "parent": os.path.dirname(path),
+        "name": os.path.basename(path),
+        "is_dir": is_dir,
+        "size": entry_stat.st_size,
+        "mtime_ns": entry_stat.st_mtime_ns,
+        "mime_type": mime_type,
+        "category": category_for(root, path, mime_type),
+        "inode": entry_stat.st_ino,
+        "owner": getattr(entry_stat, "st_uid", None),
+        "indexed_ns": indexed_ns,
+    }
+
+def refresh_directory(root: str, directory: str) -> None:
+    """Re-index the entries of one folder and drop the ones that are gone, subtrees included."""
+    indexed_ns = time.time_ns()
+    try:
+        directory_stat = os.stat(directory)
+        records = [index_record(root, directory, directory_stat, indexed_ns)]
+        records += [index_record(root, entry.path, entry_stat, indexed_ns) for entry, entry_stat in iter_directory(directory)]
+    except OSError:
+        # Gone or unreadable: nothing in it can be listed any more
+        delete_stale_files(directory, indexed_ns)
+        return
+
+    for index in range(0, len(records), INDEX_BATCH_SIZE):
+        upsert_files(records[index:index + INDEX_BATCH_SIZE])
+    delete_stale_children(directory, indexed_ns)
+
+def is_settled(mtime_ns: int, indexed_ns: int, directory_stat: os.stat_result) -> bool:
+    """
+    Whether a folder indexed with `mtime_ns` at `indexed_ns` still lists what is
+    on disk. Its mtime must be unchanged, and must have settled before it was
+    indexed, since a change in the same mtime tick would otherwise go unnoticed.
+    """
+    return mtime_ns == directory_stat.st_mtime_ns and indexed_ns - mtime_ns >= MTIME_SETTLE_SECONDS * 1_000_000_000
+
+def is_fresh(indexed, directory_stat: Optional[os.stat_result]) -> bool:
+    if indexed is None or directory_stat is None or not indexed.is_dir:
+        return indexed is None and directory_stat is None
+    return is_settled(indexed.mtime_ns, indexed.indexed_ns, directory_stat)
+
+def ensure_indexed(root: str, directories: List[str]) -> None:
+    """
+    Bring the index entries of `directories` up to date before they are queried,
+    re-scanning only the folders whose mtime moved since they were indexed, so
+    files added, removed or renamed since the last full scan are never missed.
+    """
+    for directory in directories:
+        try:
+            directory_stat = os.stat(directory)
+        except OSError:
+            directory_stat = None
+
+        if not is_fresh(get_indexed_file(directory), directory_stat):
+            refresh_directory(root, directory)
+
+class DriveScan:
+    """
+    One reconciliation pass over a drive. Folders whose mtime has not moved
+    since they were last indexed are not listed again: their entries are only
+    confirmed, and their subfolders visited. A name that appears in a folder
+    already indexed is matched by inode against entries whose path is gone, so
+    a renamed or moved folder carries its whole subtree, and the cached hashes
+    under it, over to the new path instead of being re-indexed.
+
+    Changes are written INDEX_BATCH_SIZE at a time, each batch in one
+    transaction together with a checkpoint of the folders still to visit, so a
+    scan interrupted by a crash resumes where it stopped.
+    """
+
+    def __init__(self, root: str, incremental: bool = True):
+        self.root = os.path.realpath(root)
+        self.incremental = incremental
+        # An unmounted drive must fail the scan, not empty the index
+        if not os.path.isdir(self.root):
+            raise FileNotFoundError(f"Drive not found: {self.root}")
+        self.records: List[Dict] = []
+        self.touched: List[str] = []
+        self.renames: List[Tuple[str, str]] = []
+        self.claimed = set()
+        self.current = None
+
+        checkpoint = get_index_checkpoint(self.root)
+        self.resumed = checkpoint is not None
+        if checkpoint is not None:
+            self.started_ns = checkpoint.started_ns
+            self.pending = checkpoint.pending
+            self.file_count = checkpoint.file_count
+            self.directory_count = checkpoint.directory_count
+            self.skipped_count = checkpoint.skipped_count
+            self.renamed_count = checkpoint.renamed_count
+        else:
+            self.started_ns = time.time_ns()
+            start_index_scan(self.root, self.started_ns)
+            indexed = get_indexed_file(self.root)
+            self.pending = [[self.root, indexed.mtime_ns, indexed.indexed_ns] if indexed else [self.root, None, None]]
+            self.file_count = self.directory_count = self.skipped_count = self.renamed_count = 0
+
+    def run(self) -> Dict:
+        while self.pending:
+            self.current = self.pending.pop()
+            self.visit(*self.current)
+            self.current = None
+            if len(self.records) + len(self.touched) >= INDEX_BATCH_SIZE:
+                self.flush()
+        self.flush()
+
+        completed_ns = time.time_ns()
+        totals = {
+            "file_count": self.file_count,
+            "directory_count": self.directory_count,
+            "skipped_count": self.skipped_count,
+            "renamed_count": self.renamed_count,
+        }
+        removed_count = finish_index_scan({
+            **totals,
+            "root": self.root,
+            "started_ns": self.started_ns,
+            "completed_ns": completed_ns,
+        })
+        return {
+            "root": self.root,
+            "files": self.file_count,
+            "directories": self.directory_count,
+            "skipped_directories": self.skipped_count,
+            "renamed": self.renamed_count,
+            "removed": removed_count,
+            "resumed": self.resumed,
+            "seconds": (completed_ns - self.started_ns) / 1_000_000_000,
+        }
+
+    def visit(self, directory: str, mtime_ns: Optional[int], indexed_ns: Optional[int]) -> None:
+        try:
+            directory_stat = os.lstat(directory)
+        except OSError:
+            return
+        # Symlinked folders are indexed but never followed, so loops cannot trap the walk
+        if not stat.S_ISDIR(directory_stat.st_mode):
+            return
+
+        self.directory_count += 1
+        self.records.append(index_record(self.root, directory, directory_stat, self.started_ns))
+
+        if self.incremental and mtime_ns is not None and is_settled(mtime_ns, indexed_ns, directory_stat):
+            self.skipped_count += 1
+            self.touched.append(directory)
+            child_directories, file_count = get_child_directories(directory)
+            self.pending += [[child.path, child.mtime_ns, child.indexed_ns] for child in child_directories]
+            self.file_count += file_count
+            return
+
+        indexed_children = {child.name: child for child in get_children(directory)} if mtime_ns is not None else {}
+        try:
+            for entry, entry_stat in iter_directory(directory):
+                indexed = indexed_children.get(entry.name)
+                if indexed is None and mtime_ns is not None:
+                    indexed = self.find_rename(entry.path, entry_stat)
+                    if indexed is not None and category_for(self.root, indexed.path, None) != category_for(self.root, entry.path, None):
+                        # Moved into another category folder: list the subtree again to re-categorise it
+                        indexed = None
+
+                record = index_record(self.root, entry.path, entry_stat, self.started_ns)
+                self.records.append(record)
+                if record["is_dir"]:
+                    self.pending.append([entry.path, *((indexed.mtime_ns, indexed.indexed_ns) if indexed else (None, None))])
+                else:
+                    self.file_count += 1
+        except OSError:
+            # An unreadable folder keeps none of its old entries; they are unreachable
+            return
+
+    def find_rename(self, path: str, entry_stat: os.stat_result):
+        """The indexed entry `path` was renamed from, matched on inode, type, and for files size and mtime."""
+        is_dir = stat.S_ISDIR(entry_stat.st_mode)
+        lower, upper = subtree_bounds(self.root)
+        for candidate in get_files_by_inode(entry_stat.st_ino):
+            if candidate.path in self.claimed or not lower < candidate.path < upper:
+                continue
+            if bool(candidate.is_dir) != is_dir:
+                continue
+            if not is_dir and (candidate.size, candidate.mtime_ns) != (entry_stat.st_size, entry_stat.st_mtime_ns):
+                continue
+            if os.path.lexists(candidate.path):
+                # A hard link, not a rename
+                continue
+
+            self.claimed.add(candidate.path)
+            self.renames.append((candidate.path, path))
+            self.renamed_count += 1
+            # Commit the move straight away so the new path's subtree is read back from the index
+            self.flush()
+            return candidate
+        return None
+
+    def flush(self) -> None:
+        pending = self.pending + ([self.current] if self.current is not None else [])
+        save_index_batch(self.root, self.renames, self.records, self.touched, {
+            "started_ns": self.started_ns,
+            "pending": pending,
+            "file_count": self.file_count,
+            "directory_count": self.directory_count,
+            "skipped_count": self.skipped_count,
+            "renamed_count": self.renamed_count,
+        })
+        self.records, self.touched, self.renames = [], [], []
+
+def index_drive(root: str, incremental: bool = True) -> Dict:
+    """
+    Reconcile the `files` index with a drive, resuming an interrupted scan,
+    and drop every entry the scan did not see. Returns a report of the scan.
+    """
+    return DriveScan(root, incremental).run()
+
+def drive_roots() -> List[str]:
+    """The mounted external drive and every user's drive selection that exists."""
+    try:
+        external_drive = get_external_drive_path()
+    except (OSError, RuntimeError, ImportError):
+        external_drive = None
+
+    roots = []
+    for root in [external_drive, *get_drive_path_selections()]:
+        if root and os.path.isdir(root) and os.path.realpath(root) not in roots:
+            roots.append(os.path.realpath(root))
+    return roots
+
+class DriveIndexer:
+    """
+    Background thread that reconciles the `files` index with every drive once
+    per `interval` seconds, or as soon as a scan is requested.
+    """
+
+    def __init__(self, interval: int = DRIVE_INDEX_INTERVAL, roots: Callable[[], List[str]] = drive_roots):
+        self.interval = interval
+        self.roots = roots
+        self.reports: Dict[str, Dict] = {}
+        self.wakeup = threading.Event()
+        self.stopped = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self.interval <= 0 or (self.thread is not None and self.thread.is_alive()):
+            return
+        self.stopped.clear()
+        self.thread = threading.Thread(target=self.run, name="drive-indexer", daemon=True)
+        self.thread.start()
+
+    def request_scan(self) -> None:
+        self.wakeup.set()
+
+    def stop(self) -> None:
+        self.stopped.set()
+        self.wakeup.set()
+        if self.thread is not None:
+            self.thread.join(timeout=5)
+
+    def run(self) -> None:
+        while not self.stopped.is_set():
+            self.wakeup.clear()
+            self.scan_all()
+            self.wakeup.wait(self.interval)
+
+    def scan_all(self) -> None:
+        try:
+            roots = self.roots()
+        except Exception as e:
+            print(f"Exception [DriveIndexer.scan_all]: {e}")
+            return
+
+        for root in roots:
+            if self.stopped.is_set():
+                return
+            try:
+                self.reports[root] = index_drive(root)
+            except Exception as e:
+                print(f"Exception [DriveIndexer.scan_all] {root}: {e}")
+
+_drive_indexer = None
+
+def get_drive_indexer() -> DriveIndexer:
+    global _drive_indexer
+    if _drive_indexer is None:
+        _drive_indexer = DriveIndexer()
+    return _drive_indexer
@@ -0,0 +1,163 @@
+"""
+Mounted drive inventory, sampled by a background thread so the endpoint
+serves a snapshot instead of probing every mount per request.
+
+`disk_usage` is a statvfs, which can block for seconds on a sleeping disk and
+forever on a stale network mount. Each sample probes every mount in parallel
+and waits at most DISK_USAGE_TIMEOUT seconds. A mount that has not answered
+is left out, and is not probed again until its hung call returns.
+"""
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set, Tuple
+
+DRIVE_INVENTORY_INTERVAL = int(os.getenv("DRIVE_INVENTORY_INTERVAL", "30"))
+DISK_USAGE_TIMEOUT = float(os.getenv("DISK_USAGE_TIMEOUT", "2"))
+DISK_USAGE_WORKERS = 4
+
+# Kernel and virtual filesystems that hold no user files. apfs is here too:
+# on macOS it is the system's own volumes, which were never listed
+PSEUDO_FILESYSTEMS = frozenset([
+    "apfs", "autofs", "binfmt_misc", "bpf", "cgroup", "cgroup2", "configfs", "debugfs", "devfs", "devpts",
+    "devtmpfs", "efivarfs", "fusectl", "hugetlbfs", "mqueue", "nsfs", "overlay", "proc", "pstore", "ramfs",
+    "rpc_pipefs", "securityfs", "selinuxfs", "squashfs", "sysfs", "tmpfs", "tracefs",
+])
+
+@dataclass(frozen=True, slots=True)
+class Drive:
+    device: str
+    mountpoint: str
+    fstype: str
+    opts: str
+    total: int
+    used: int
+    free: int
+    percent: float
+
+@dataclass(frozen=True, slots=True)
+class DriveSnapshot:
+    drives: Tuple[Drive, ...]
+    version: int
+    sampled_at: float
+
+class DriveInventory:
+    """
+    Background thread that samples the mounted drives every `interval`
+    seconds. Readers take `snapshot`, an immutable DriveSnapshot replaced
+    whole; subscribers are woken on their own event loop when it changes.
+    """
+
+    def __init__(self, interval: int = DRIVE_INVENTORY_INTERVAL, timeout: float = DISK_USAGE_TIMEOUT):
+        self.interval = interval
+        self.timeout = timeout
+        self.snapshot: Optional[DriveSnapshot] = None
+        self.executor = ThreadPoolExecutor(max_workers=DISK_USAGE_WORKERS, thread_name_prefix="drive-usage")
+        self.hung: Dict[str, Future] = {}
+        self.subscribers: Set[Tuple[asyncio.AbstractEventLoop, asyncio.Event]] = set()
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self.interval <= 0 or (self.thread is not None and self.thread.is_alive()):
+            return
+        self.stopped.clear()
+        self.thread = threading.Thread(target=self.run, name="drive-inventory", daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        self.stopped.set()
+        if self.thread is not None:
+            self.thread.join(timeout=5)
+
+    def run(self) -> None:
+        while not self.stopped.is_set():
+            try:
+                self.sample()
+            except Exception as e:
+                print(f"Exception [DriveInventory.run]: {e}")
+            self.stopped.wait(self.interval)
+
+    def is_sampling(self) -> bool:
+        return self.thread is not None and self.thread.is_alive()
+
+    def is_stale(self, snapshot: Optional[DriveSnapshot]) -> bool:
+        """True when there is no snapshot yet, or no thread is keeping it fresh and it is older than `interval`."""
+        if snapshot is None:
+            return True
+        return not self.is_sampling() and time.monotonic() - snapshot.sampled_at >= self.interval
+
+    def sample(self) -> DriveSnapshot:
+        # Imported on first use to keep it off the cold start
+        import psutil
+
+        partitions = [partition for partition in psutil.disk_partitions(all=True) if partition.fstype not in PSEUDO_FILESYSTEMS]
+        with self.lock:
+            for mountpoint, future in list(self.hung.items()):
+                if future.done():
+                    del self.hung[mountpoint]
+            partitions = [partition for partition in partitions if partition.mountpoint not in self.hung]
+
+        futures = {partition.mountpoint: self.executor.submit(psutil.disk_usage, partition.mountpoint) for partition in partitions}
+        wait(futures.values(), timeout=self.timeout)
+
+        drives: List[Drive] = []
+        for partition in partitions:
+            future = futures[partition.mountpoint]
+            if not future.done():
+                print(f"Exception [DriveInventory.sample] {partition.mountpoint}: disk_usage timed out")
+                with self.lock:
+                    self.hung[partition.mountpoint] = future
+                continue
+            try:
+                usage = future.result()
+            except Exception:
+                # Mounts the process cannot read, or that vanished since listing
+                continue
+            drives.append(Drive(
+                partition.device, partition.mountpoint, partition.fstype, partition.opts,
+                usage.total, usage.used, usage.free, usage.percent,
+            ))
+
+        return self.publish(tuple(drives))
+
+    def publish(self, drives: Tuple[Drive, ...]) -> DriveSnapshot:
+        with self.lock:
+            previous = self.snapshot
+            if previous is not None and previous.drives == drives:
+                # Unchanged: only the sample time moves, and nobody is woken
+                snapshot = self.snapshot = DriveSnapshot(drives, previous.version, time.monotonic())
+                return snapshot
+            snapshot = self.snapshot = DriveSnapshot(drives, previous.version + 1 if previous else 1, time.monotonic())
+            subscribers = list(self.subscribers)
+
+        for loop, changed in subscribers:
+            try:
+                loop.call_soon_threadsafe(changed.set)
+            except RuntimeError:
+                # Its loop closed without unsubscribing
+                self.unsubscribe((loop, changed))
+        return snapshot
+
+    def subscribe(self) -> Tuple[asyncio.AbstractEventLoop, asyncio.Event]:
+        """Register for change notifications on the running event loop; pass the result to unsubscribe."""
+        subscription = (asyncio.get_running_loop(), asyncio.Event())
+        with self.lock:
+            self.subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Tuple[asyncio.AbstractEventLoop, asyncio.Event]) -> None:
+        with self.lock:
+            self.subscribers.discard(subscription)
+
+_drive_inventory = None
+
+def get_drive_inventory() -> DriveInventory:
+    global _drive_inventory
+    if _drive_inventory is None:
+        _drive_inventory = DriveInventory()
+    return _drive_inventory
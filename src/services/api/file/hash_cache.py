@@ -0,0 +1,45 @@
+# api/file/hash_cache.py
+from pathlib import Path
+from typing import Dict, List, Tuple
+from src.services.api.file.dedup_helper import hash_record, new_hasher, record_matches
+from src.services.api.file.disk_io import run_disk_io
+from src.services.database.file_hashes import get_file_hashes_by_paths, upsert_file_hashes
+from src.services.database.db_service import run_db
+import asyncio
+import os
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+def hash_file(path: Path) -> str:
+    hasher = new_hasher()
+    with open(path, "rb") as file_like:
+        while chunk := file_like.read(HASH_CHUNK_SIZE):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+async def cached_file_hashes(files: List[Tuple[Path, os.stat_result]]) -> Dict[str, str]:
+    """
+    SHA-256 of each (path, stat) pair, keyed by absolute path. Hashes stored in
+    the file_hashes index are reused while the file's inode, size and mtime are
+    unchanged; everything else is hashed on the disk pool and indexed.
+    """
+    paths = [os.path.abspath(path) for path, _ in files]
+    records = {record.path: record for record in await run_db(get_file_hashes_by_paths, paths)}
+
+    hashes = {}
+    stale = []
+    for path, (_, file_stat) in zip(paths, files):
+        record = records.get(path)
+        if record is not None and record_matches(file_stat, record):
+            hashes[path] = record.hash
+        else:
+            stale.append((path, file_stat))
+
+    computed = await asyncio.gather(*(run_disk_io(hash_file, path) for path, _ in stale))
+    if stale:
+        await run_db(upsert_file_hashes, [
+            hash_record(path, hash, file_stat) for (path, file_stat), hash in zip(stale, computed)
+        ])
+        hashes.update((path, hash) for (path, _), hash in zip(stale, computed))
+
+    return hashes
@@ -0,0 +1,251 @@
+# api/file/listing_cache.py
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+from src.services.api.file.directory_scanner import scan_directory
+from src.services.api.file.listing_helper import matches_filter, sort_entries
+import ctypes
+import ctypes.util
+import os
+import struct
+import sys
+import threading
+import time
+
+LISTING_CACHE_SIZE = int(os.getenv("LISTING_CACHE_SIZE", "128"))
+LISTING_CACHE_MAX_ENTRIES = int(os.getenv("LISTING_CACHE_MAX_ENTRIES", "500000"))
+# A folder changed this recently may change again within the same mtime tick
+# (two seconds on FAT), so without inotify its listing is not cached yet
+MTIME_SETTLE_SECONDS = 2
+
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = (
+    IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+    | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF
+)
+EVENT_HEADER = struct.Struct("iIII")
+
+class InotifyWatcher:
+    """
+    Watch directories through Linux inotify, called via ctypes so no extra
+    dependency is needed. `on_change(path)` runs on the watcher thread for every
+    event in a watched directory, and `on_change(None)` when the kernel queue
+    overflowed and events were lost.
+    """
+
+    def __init__(self, libc, fd: int, on_change: Callable[[Optional[str]], None]):
+        self.libc = libc
+        self.fd = fd
+        self.on_change = on_change
+        self.paths: Dict[int, str] = {}
+        self.watches: Dict[str, int] = {}
+        self.lock = threading.Lock()
+        self.thread = threading.Thread(target=self.run, name="listing-inotify", daemon=True)
+        self.thread.start()
+
+    @classmethod
+    def create(cls, on_change: Callable[[Optional[str]], None]) -> Optional["InotifyWatcher"]:
+        """Start a watcher, or return None where inotify is unavailable."""
+        if not sys.platform.startswith("linux"):
+            return None
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+            fd = libc.inotify_init1(IN_CLOEXEC)
+        except (OSError, AttributeError):
+            return None
+        if fd < 0:
+            return None
+        return cls(libc, fd, on_change)
+
+    def watch(self, path: str) -> bool:
+        with self.lock:
+            if path in self.watches:
+                return True
+            wd = self.libc.inotify_add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+            if wd < 0:
+                # Usually fs.inotify.max_user_watches is exhausted
+                return False
+            self.watches[path] = wd
+            self.paths[wd] = path
+            return True
+
+    def unwatch(self, path: str) -> None:
+        with self.lock:
+            wd = self.watches.pop(path, None)
+            if wd is not None:
+                self.paths.pop(wd, None)
+                self.libc.inotify_rm_watch(self.fd, wd)
+
+    def is_watched(self, path: str) -> bool:
+        with self.lock:
+            return path in self.watches
+
+    def run(self) -> None:
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except OSError:
+                return
+            for wd, mask, name in parse_events(data):
+                if mask & IN_Q_OVERFLOW:
+                    self.on_change(None)
+                    continue
+
+                with self.lock:
+                    path = self.paths.get(wd)
+                    if mask & IN_IGNORED and path is not None:
+                        # The directory is gone or unmounted; the kernel dropped the watch
+                        self.paths.pop(wd, None)
+                        self.watches.pop(path, None)
+                if path is None:
+                    continue
+                # Staging and temp files are hidden and never listed; their
+                # final rename shows up as a visible IN_MOVED_TO
+                if name.startswith(".") and not mask & (IN_IGNORED | IN_DELETE_SELF | IN_MOVE_SELF):
+                    continue
+                self.on_change(path)
+
+def parse_events(data: bytes) -> List[Tuple[int, int, str]]:
+    events = []
+    offset = 0
+    while offset + EVENT_HEADER.size <= len(data):
+        wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+        offset += EVENT_HEADER.size
+        name = data[offset:offset + length].rstrip(b"\0").decode("utf-8", "surrogateescape")
+        offset += length
+        events.append((wd, mask, name))
+    return events
+
+class CachedListing:
+    def __init__(self, entries: List[Dict], keys: List[Tuple], generation: Tuple[int, int], mtime_ns: Optional[int]):
+        self.entries = entries
+        self.keys = keys
+        self.generation = generation
+        # None when an inotify watch guards the listing
+        self.mtime_ns = mtime_ns
+
+class ListingCache:
+    """
+    In-memory cache of sorted, filtered folder listings, keyed by (resolved
+    path, sort, type filter, extensions), with LRU eviction bounded both by the
+    number of listings and the total number of entries held.
+
+    Listings of a watched folder are dropped as soon as inotify reports a
+    change in it. Where a watch cannot be placed, a hit is validated against
+    the folder's mtime instead, which catches entries being added, removed or
+    renamed, the way uploads land.
+    """
+
+    def __init__(
+        self,
+        max_listings: int = LISTING_CACHE_SIZE,
+        max_entries: int = LISTING_CACHE_MAX_ENTRIES,
+        watcher_factory: Callable = InotifyWatcher.create,
+    ):
+        self.max_listings = max_listings
+        self.max_entries = max_entries
+        self.listings: "OrderedDict[Tuple, CachedListing]" = OrderedDict()
+        self.entry_count = 0
+        # Bumped on every change to a folder, or for every folder through the
+        # epoch, so a scan racing a change is never stored
+        self.generations: Dict[str, int] = {}
+        self.epoch = 0
+        self.lock = threading.Lock()
+        self.watcher = watcher_factory(self.invalidate)
+
+    def get(
+        self,
+        directory,
+        sort: str = "name",
+        entry_type: Optional[str] = None,
+        extensions: Optional[List[str]] = None,
+    ) -> Tuple[List[Dict], List[Tuple]]:
+        """Return the listing of `directory` sorted ascending by `sort`, with its sort keys."""
+        directory = str(directory)
+        key = (directory, sort, entry_type, tuple(extensions) if extensions else None)
+
+        with self.lock:
+            cached = self.listings.get(key)
+            generation = self.generation(directory)
+
+        if cached is not None and cached.generation == generation:
+            if cached.mtime_ns is None or os.stat(directory).st_mtime_ns == cached.mtime_ns:
+                with self.lock:
+                    if key in self.listings:
+                        self.listings.move_to_end(key)
+                return cached.entries, cached.keys
+
+        # Watch before scanning, so a change during the scan bumps the generation
+        watched = self.watcher is not None and self.watcher.watch(directory)
+        directory_stat = os.stat(directory)
+        entries, keys = sort_entries(
+            [entry for entry in scan_directory(directory) if matches_filter(entry, entry_type, extensions)],
+            sort,
+        )
+
+        mtime_ns = None
+        if not watched:
+            if time.time() - directory_stat.st_mtime < MTIME_SETTLE_SECONDS:
+                return entries, keys
+            mtime_ns = directory_stat.st_mtime_ns
+
+        with self.lock:
+            if self.generation(directory) == generation:
+                self.store(key, CachedListing(entries, keys, generation, mtime_ns))
+            else:
+                self.release(directory)
+        return entries, keys
+
+    def generation(self, directory: str) -> Tuple[int, int]:
+        return self.epoch, self.generations.get(directory, 0)
+
+    def store(self, key: Tuple, listing: CachedListing) -> None:
+        previous = self.listings.pop(key, None)
+        if previous is not None:
+            self.entry_count -= len(previous.entries)
+        if len(listing.entries) > self.max_entries:
+            self.release(key[0])
+            return
+
+        self.listings[key] = listing
+        self.entry_count += len(listing.entries)
+        while len(self.listings) > self.max_listings or self.entry_count > self.max_entries:
+            evicted_key, evicted = self.listings.popitem(last=False)
+            self.entry_count -= len(evicted.entries)
+            self.release(evicted_key[0])
+
+    def release(self, directory: str) -> None:
+        """Drop the inotify watch of a folder once none of its listings are cached."""
+        if self.watcher is not None and not any(key[0] == directory for key in self.listings):
+            self.watcher.unwatch(directory)
+
+    def invalidate(self, directory: Optional[str] = None) -> None:
+        """Forget the listings of one folder, or of every folder when `directory` is None."""
+        with self.lock:
+            if directory is None:
+                self.epoch += 1
+                self.listings.clear()
+                self.entry_count = 0
+                return
+
+            self.generations[directory] = self.generations.get(directory, 0) + 1
+            for key in [key for key in self.listings if key[0] == directory]:
+                self.entry_count -= len(self.listings.pop(key).entries)
+
+_listing_cache = None
+
+def get_listing_cache() -> ListingCache:
+    global _listing_cache
+    if _listing_cache is None:
+        _listing_cache = ListingCache()
+    return _listing_cache
@@ -0,0 +1,112 @@
+# api/file/listing_helper.py
+from typing import Dict, List, Optional, Tuple
+import base64
+import binascii
+import bisect
+import json
+
+SORT_KEYS = ["name", "mtime", "size", "type"]
+SORT_ORDERS = ["asc", "desc"]
+MAX_PAGE_SIZE = 1000
+
+def sort_key(entry: Dict, sort: str) -> Tuple:
+    """
+    Total order for a listing entry. Every key ends in the entry name, which is
+    unique within a folder, so ties never reorder between pages.
+    """
+    name = (entry["name"].casefold(), entry["name"])
+    if sort == "mtime":
+        return (entry["mtime"], *name)
+    if sort == "size":
+        # Folders carry no size and sort before every file
+        return (entry["size"] if not entry["is_dir"] else -1, *name)
+    if sort == "type":
+        return (0 if entry["is_dir"] else 1, *name)
+    return name
+
+def encode_cursor(sort: str, order: str, key: Tuple) -> str:
+    payload = json.dumps({"sort": sort, "order": order, "key": list(key)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+def decode_cursor(cursor: str, sort: str, order: str) -> Tuple:
+    """Return the sort key a cursor resumes after; raises ValueError if it belongs to another listing order."""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (binascii.Error, UnicodeError, ValueError) as e:
+        raise ValueError("Malformed cursor") from e
+
+    if not isinstance(payload, dict) or payload.get("sort") != sort or payload.get("order") != order:
+        raise ValueError("Cursor does not match the requested sort order")
+    return tuple(payload.get("key") or ())
+
+def matches_filter(entry: Dict, entry_type: Optional[str], extensions: Optional[List[str]]) -> bool:
+    if entry_type == "folder" and not entry["is_dir"]:
+        return False
+    if entry_type == "file" and entry["is_dir"]:
+        return False
+    if extensions:
+        if entry["is_dir"]:
+            return False
+        _, dot, extension = entry["name"].rpartition(".")
+        return bool(dot) and extension.lower() in extensions
+    return True
+
+def parse_extensions(extension: Optional[str]) -> Optional[List[str]]:
+    """Turn `jpg,.PNG` into ["jpg", "png"]."""
+    if not extension:
+        return None
+    return [part.strip().lstrip(".").lower() for part in extension.split(",") if part.strip().lstrip(".")]
+
+def sort_entries(entries: List[Dict], sort: str = "name") -> Tuple[List[Dict], List[Tuple]]:
+    """Sort entries ascending and return them with their sort keys, ready for `page_of`."""
+    keyed = sorted(((sort_key(entry, sort), entry) for entry in entries), key=lambda pair: pair[0])
+    return [entry for _, entry in keyed], [key for key, _ in keyed]
+
+def page_of(
+    entries: List[Dict],
+    keys: List[Tuple],
+    sort: str = "name",
+    order: str = "asc",
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+) -> Tuple[List[Dict], Optional[str]]:
+    """
+    Return one page of ascending `entries` in the requested order, resuming
+    after `cursor`, along with the cursor for the next page (None on the last
+    page). `keys` are the entries' sort keys, so a page is found by bisection
+    and costs the same wherever it falls in the folder.
+    """
+    descending = order == "desc"
+    start, end = 0, len(entries)
+    if cursor is not None:
+        after = decode_cursor(cursor, sort, order)
+        try:
+            if descending:
+                end = bisect.bisect_left(keys, after)
+            else:
+                start = bisect.bisect_right(keys, after)
+        except TypeError as e:
+            raise ValueError("Malformed cursor") from e
+
+    if limit is not None and end - start > limit:
+        if descending:
+            start = end - limit
+        else:
+            end = start + limit
+        last = start if descending else end - 1
+        next_cursor = encode_cursor(sort, order, keys[last])
+    else:
+        next_cursor = None
+
+    page = entries[start:end]
+    return (page[::-1] if descending else page), next_cursor
+
+def paginate(
+    entries: List[Dict],
+    sort: str = "name",
+    order: str = "asc",
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+) -> Tuple[List[Dict], Optional[str]]:
+    """Sort unsorted `entries` and return one page of them, as `page_of` does."""
+    return page_of(*sort_entries(entries, sort), sort, order, limit, cursor)
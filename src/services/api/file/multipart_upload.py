@@ -0,0 +1,323 @@
+# api/file/multipart_upload.py
+from pathlib import Path
+from typing import Dict, List, Optional
+from src.services.api.file.dedup_helper import DEDUP_MODE, deduplicate_file, hash_record, new_hasher
+from src.services.api.file.disk_io import run_disk_io
+from src.services.api.file.upload_helper import safe_filename
+from src.services.database.file_hashes import get_file_hashes_by_content, upsert_file_hash
+from src.services.database.db_service import run_db
+import asyncio
+import os
+import uuid
+try:
+    from python_multipart import MultipartParser
+    from python_multipart.multipart import parse_options_header
+except ImportError:
+    from multipart.multipart import MultipartParser, parse_options_header
+
+WRITE_BUFFER_SIZE = 1024 * 1024
+MAX_FIELD_SIZE = 64 * 1024
+PREALLOCATE = os.getenv("UPLOAD_PREALLOCATE", "false").lower() in ["1", "true", "yes"]
+UPLOAD_WORKERS = int(os.getenv("UPLOAD_WORKERS", "4"))
+# Body chunks queued per file before the parser waits for the writer to catch up
+QUEUE_DEPTH = 8
+
+class MultipartUploadError(Exception):
+    """Raised when the multipart body cannot be turned into files on the drive."""
+
+class FilePartWriter:
+    """
+    Write one uploaded file straight to a hidden temp name in its destination
+    folder, in WRITE_BUFFER_SIZE sized writes, then rename it into place.
+
+    With a dedup mode other than "off" the bytes are hashed as they are written,
+    and a file whose content is already on the drive is swapped for a link to
+    the existing copy once it lands.
+    """
+
+    def __init__(self, directory: Path, filename: str, preallocate: int = 0, dedup_mode: str = "off"):
+        self.filename = filename
+        self.preallocate = preallocate
+        self.dedup_mode = dedup_mode
+        self.hasher = new_hasher() if dedup_mode != "off" else None
+        self.hash: Optional[str] = None
+        self.deduplicated = False
+        self.buffer = bytearray()
+        self.size = 0
+        self.file_like = None
+        self.error: Optional[str] = None
+        try:
+            self.destination = directory / safe_filename(filename)
+            self.temp_path = directory / f".{self.destination.name}.{uuid.uuid4().hex}.part"
+        except ValueError as e:
+            self.destination = self.temp_path = None
+            self.error = str(e)
+
+    def result(self) -> Dict:
+        return {
+            "filename": self.destination.name if self.destination is not None else self.filename,
+            "size": self.size,
+            "status": "failed" if self.error else "uploaded",
+            "error": self.error,
+            "deduplicated": self.deduplicated,
+        }
+
+    async def run(self, queue: asyncio.Queue) -> None:
+        """
+        Consume body chunks from `queue` until a None sentinel arrives. A failure
+        is recorded on the writer rather than raised, and the rest of the file's
+        chunks are drained so the parser never blocks on a dead writer.
+        """
+        drained = False
+        try:
+            if self.destination is None:
+                raise MultipartUploadError(self.error)
+            await self.open()
+            while (data := await queue.get()) is not None:
+                await self.write(data)
+            drained = True
+            await self.close()
+        except asyncio.CancelledError:
+            await self.abort()
+            raise
+        except Exception as e:
+            self.error = str(e)
+            await self.abort()
+            while not drained and await queue.get() is not None:
+                pass
+
+    async def open(self) -> None:
+        self.file_like = await run_disk_io(self._open)
+
+    def _open(self):
+        file_like = open(self.temp_path, "wb")
+        if self.preallocate and hasattr(os, "posix_fallocate"):
+            try:
+                os.posix_fallocate(file_like.fileno(), 0, self.preallocate)
+            except OSError:
+                # Not every filesystem supports preallocation; the write still succeeds
+                pass
+        return file_like
+
+    async def write(self, data: bytes) -> None:
+        self.buffer += data
+        if len(self.buffer) >= WRITE_BUFFER_SIZE:
+            aligned = len(self.buffer) - len(self.buffer) % WRITE_BUFFER_SIZE
+            await self.flush(aligned)
+
+    async def flush(self, length: Optional[int] = None) -> None:
+        length = len(self.buffer) if length is None else length
+        if not length:
+            return
+        chunk = bytes(self.buffer[:length])
+        del self.buffer[:length]
+        await run_disk_io(self._write, chunk)
+        self.size += length
+
+    def _write(self, chunk: bytes) -> None:
+        # Hash on the disk pool too, so large files never stall the event loop
+        if self.hasher is not None:
+            self.hasher.update(chunk)
+        self.file_like.write(chunk)
+
+    async def close(self) -> None:
+        """Flush the tail, drop any unused preallocation and move the file into place."""
+        await self.flush()
+        await run_disk_io(self._finish)
+        if self.hasher is not None and self.size:
+            await self.deduplicate()
+
+    async def deduplicate(self) -> None:
+        """Link the file to an identical one already on the drive and index its hash."""
+        self.hash = self.hasher.hexdigest()
+        records = await run_db(get_file_hashes_by_content, self.hash, self.size)
+        self.deduplicated = await run_disk_io(deduplicate_file, self.destination, records, self.dedup_mode)
+
+        file_stat = await run_disk_io(os.stat, self.destination)
+        await run_db(upsert_file_hash, hash_record(self.destination, self.hash, file_stat))
+
+    def _finish(self) -> None:
+        if self.preallocate:
+            self.file_like.truncate(self.size)
+        self.file_like.close()
+        os.replace(self.temp_path, self.destination)
+
+    async def abort(self) -> None:
+        await run_disk_io(self._discard)
+
+    def _discard(self) -> None:
+        if self.file_like is not None:
+            self.file_like.close()
+        if self.temp_path is None:
+            return
+        try:
+            os.remove(self.temp_path)
+        except FileNotFoundError:
+            pass
+
+class MultipartUploadReceiver:
+    """
+    Parse a multipart/form-data request body as it arrives and pipe every file
+    part directly into its destination, so each uploaded byte is written once.
+
+    The destination comes from `file_path_location`, given either up front or as
+    a form field that precedes the files in the body. `dedup_mode` defaults to
+    the UPLOAD_DEDUP setting.
+    """
+
+    def __init__(
+        self,
+        content_type: str,
+        content_length: Optional[int] = None,
+        file_path_location: Optional[str] = None,
+        dedup_mode: Optional[str] = None,
+    ):
+        _, params = parse_options_header(content_type)
+        boundary = params.get(b"boundary")
+        if not boundary:
+            raise MultipartUploadError("Missing boundary in multipart body")
+
+        self.content_length = content_length
+        self.file_path_location = file_path_location
+        self.dedup_mode = dedup_mode or DEDUP_MODE
+        self.received = 0
+        self.file_parts = 0
+        self.events = []
+        self.header_field = b""
+        self.header_value = b""
+        self.headers = {}
+        self.parser = MultipartParser(boundary, {
+            "on_part_begin": self.on_part_begin,
+            "on_part_data": self.on_part_data,
+            "on_part_end": self.on_part_end,
+            "on_header_field": self.on_header_field,
+            "on_header_value": self.on_header_value,
+            "on_header_end": self.on_header_end,
+            "on_headers_finished": self.on_headers_finished,
+        })
+
+    # Parser callbacks run synchronously inside `parser.write`; they only queue
+    # events, which `receive` then applies with awaitable disk writes.
+    def on_part_begin(self) -> None:
+        self.headers = {}
+
+    def on_part_data(self, data: bytes, start: int, end: int) -> None:
+        self.events.append(("data", data[start:end]))
+
+    def on_part_end(self) -> None:
+        self.events.append(("end", None))
+
+    def on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self.header_field += data[start:end]
+
+    def on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self.header_value += data[start:end]
+
+    def on_header_end(self) -> None:
+        self.headers[self.header_field.lower()] = self.header_value
+        self.header_field = b""
+        self.header_value = b""
+
+    def on_headers_finished(self) -> None:
+        _, options = parse_options_header(self.headers.get(b"content-disposition", b""))
+        name = options.get(b"name", b"").decode("utf-8")
+        filename = options.get(b"filename")
+        part_length = self.headers.get(b"content-length", b"").strip()
+        self.events.append(("part", (
+            name,
+            filename.decode("utf-8") if filename is not None else None,
+            int(part_length) if part_length.isdigit() else None,
+        )))
+
+    async def receive(self, stream) -> List[Dict]:
+        """
+        Consume the request body stream and return a result per file part.
+
+        Each file is handed to its own writer task through a bounded queue. At most
+        UPLOAD_WORKERS files are in flight, so a slow disk pushes back on the
+        parser and memory stays flat however many files the batch holds. A body
+        without any file part, or one that ends in the middle of a file, is
+        rejected.
+        """
+        slots = asyncio.Semaphore(UPLOAD_WORKERS)
+        tasks = []
+        writers: List[FilePartWriter] = []
+        queue = None
+        field_name = None
+        field_value = bytearray()
+
+        async def start_writer(writer: FilePartWriter, queue: asyncio.Queue) -> None:
+            try:
+                await writer.run(queue)
+            finally:
+                slots.release()
+
+        try:
+            async for chunk in stream:
+                self.received += len(chunk)
+                self.parser.write(chunk)
+                events, self.events = self.events, []
+
+                for event, payload in events:
+                    if event == "part":
+                        name, filename, part_length = payload
+                        if filename is None:
+                            field_name = name
+                            field_value.clear()
+                            continue
+
+                        writer = self.create_writer(filename, part_length)
+                        await slots.acquire()
+                        queue = asyncio.Queue(maxsize=QUEUE_DEPTH)
+                        writers.append(writer)
+                        tasks.append(asyncio.create_task(start_writer(writer, queue)))
+                    elif event == "data":
+                        if queue is not None:
+                            await queue.put(payload)
+                        else:
+                            field_value += payload
+                            if len(field_value) > MAX_FIELD_SIZE:
+                                raise MultipartUploadError(f"Form field {field_name!r} is too large")
+                    elif event == "end":
+                        if queue is not None:
+                            await queue.put(None)
+                            queue = None
+                        elif field_name == "file_path_location":
+                            self.file_path_location = field_value.decode("utf-8")
+
+            self.parser.finalize()
+            if queue is not None:
+                raise MultipartUploadError("Multipart body ended in the middle of a file")
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+        if not writers:
+            raise MultipartUploadError("No files were sent")
+
+        return [writer.result() for writer in writers]
+
+    def create_writer(self, filename: str, part_length: Optional[int] = None) -> FilePartWriter:
+        if not self.file_path_location:
+            raise MultipartUploadError("file_path_location must be sent before the files")
+
+        self.file_parts += 1
+        return FilePartWriter(Path(self.file_path_location), filename, self.preallocate_size(part_length), self.dedup_mode)
+
+    def preallocate_size(self, part_length: Optional[int]) -> int:
+        """
+        Size to reserve for the next file: its own Content-Length when the part
+        carries one, otherwise the rest of the body for the first file only.
+        Later files without a length are not preallocated, so the total stays
+        bounded by the request size.
+        """
+        if not PREALLOCATE:
+            return 0
+        if part_length is not None:
+            return part_length
+        if self.file_parts == 1 and self.content_length:
+            return max(self.content_length - self.received, 0)
+        return 0
@@ -0,0 +1,96 @@
+# api/file/range_helper.py
+from email.utils import formatdate, parsedate_to_datetime
+from typing import List, Optional, Tuple
+
+MAX_RANGES = 64
+
+class RangeNotSatisfiable(Exception):
+    """Raised when none of the requested byte ranges overlap the file."""
+
+def parse_range_header(range_header: str, file_size: int) -> Optional[List[Tuple[int, int]]]:
+    """
+    Parse an RFC 7233 `Range` header into inclusive (start, end) byte offsets.
+    Returns None when the header is malformed or uses an unknown unit, in which
+    case the caller should ignore it and send the full file. Overlapping and
+    adjacent ranges are always merged, so a request cannot ask for the same
+    bytes more than once (RFC 7233 section 6.1).
+    """
+    unit, _, range_set = range_header.partition("=")
+    if unit.strip().lower() != "bytes" or not range_set.strip():
+        return None
+
+    ranges = []
+    has_range_spec = False
+    for range_spec in range_set.split(","):
+        range_spec = range_spec.strip()
+        if not range_spec:
+            continue
+        has_range_spec = True
+
+        first, dash, last = range_spec.partition("-")
+        first, last = first.strip(), last.strip()
+        if not dash or not (first.isdigit() or first == "") or not (last.isdigit() or last == ""):
+            return None
+
+        if first == "":
+            # Suffix range: the last N bytes of the file
+            if last == "":
+                return None
+            suffix_length = int(last)
+            if suffix_length == 0 or file_size == 0:
+                continue
+            ranges.append((max(file_size - suffix_length, 0), file_size - 1))
+            continue
+
+        start = int(first)
+        end = int(last) if last else file_size - 1
+        if last and end < start:
+            return None
+        if start >= file_size:
+            continue
+        ranges.append((start, min(end, file_size - 1)))
+
+    if not has_range_spec:
+        return None
+    if not ranges:
+        raise RangeNotSatisfiable()
+
+    ranges = coalesce_ranges(ranges)
+    if len(ranges) > MAX_RANGES:
+        return None
+
+    return ranges
+
+def coalesce_ranges(ranges: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """Merge overlapping or adjacent byte ranges."""
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+def http_date(timestamp: float) -> str:
+    return formatdate(timestamp, usegmt=True)
+
+def if_range_matches(if_range: Optional[str], mtime: float, etag: Optional[str] = None) -> bool:
+    """
+    Evaluate an `If-Range` precondition against the file's entity tag or
+    modification time. A missing header always matches; entity tags need a
+    strong match, so weak tags never do.
+    """
+    if if_range is None:
+        return True
+
+    if_range = if_range.strip()
+    if if_range.startswith('"') or if_range.startswith("W/"):
+        return etag is not None and if_range == etag
+
+    try:
+        return int(parsedate_to_datetime(if_range).timestamp()) == int(mtime)
+    except (TypeError, ValueError):
+        return False
+
+def content_range(start: int, end: int, file_size: int) -> str:
+    return f"bytes {start}-{end}/{file_size}"
@@ -0,0 +1,45 @@
+# api/file/search_helper.py
+from typing import List, Optional
+import os
+import re
+
+SEARCH_MODES = ["auto", "prefix", "substring", "words"]
+# The trigram index cannot match anything shorter
+MIN_SUBSTRING_LENGTH = 3
+# Matches considered per index; broader searches are truncated and should be narrowed
+SEARCH_CANDIDATES = int(os.getenv("SEARCH_CANDIDATES", "2000"))
+
+WORD_PATTERN = re.compile(r"\w+")
+
+def quote(term: str) -> str:
+    """An FTS5 string literal, so user input is never parsed as query syntax."""
+    return '"' + term.replace('"', '""') + '"'
+
+def search_terms(query: str) -> List[str]:
+    return WORD_PATTERN.findall(query)
+
+def words_query(query: str, prefix: bool) -> Optional[str]:
+    """Match names containing every word of `query`, the last one (or all, for `prefix`) as a prefix."""
+    terms = search_terms(query)
+    if not terms:
+        return None
+    return " AND ".join(quote(term) + ("*" if prefix else "") for term in terms)
+
+def substring_query(query: str) -> Optional[str]:
+    query = query.strip()
+    if len(query) < MIN_SUBSTRING_LENGTH:
+        return None
+    return quote(query)
+
+def match_queries(query: str, mode: str = "auto") -> List[Optional[str]]:
+    """
+    The (words, substring) MATCH expressions for a search. `auto` ranks word
+    prefix matches first, then names that only contain the text somewhere.
+    """
+    if mode == "words":
+        return [words_query(query, prefix=False), None]
+    if mode == "prefix":
+        return [words_query(query, prefix=True), None]
+    if mode == "substring":
+        return [None, substring_query(query)]
+    return [words_query(query, prefix=True), substring_query(query)]
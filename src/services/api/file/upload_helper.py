@@ -0,0 +1,100 @@
+# api/file/upload_helper.py
+from pathlib import Path
+from typing import Dict
+import base64
+import binascii
+import itertools
+import os
+
+STAGING_DIR_NAME = ".uploads"
+
+def safe_filename(filename: str) -> str:
+    """Strip any directory components a client sent along with the file name."""
+    name = Path(filename.replace("\\", "/")).name
+    if name in ("", ".", ".."):
+        raise ValueError(f"Invalid file name: {filename!r}")
+    return name
+
+def resolve_upload_directory(root: str, file_path_location: str) -> Path:
+    """
+    Resolve an upload destination against the user's drive root. Relative
+    locations are taken from the root, and anything resolving outside of it,
+    through `..` or a symlink, is rejected.
+    """
+    root_path = Path(root).resolve()
+    directory = (root_path / file_path_location).resolve()
+    if directory != root_path and root_path not in directory.parents:
+        raise ValueError(f"Upload directory is outside of the drive: {file_path_location!r}")
+    return directory
+
+def staging_path(file_path_location: str, upload_id: str) -> Path:
+    """
+    Partial uploads are staged in a hidden folder inside the destination so the
+    final rename never crosses a filesystem boundary.
+    """
+    return Path(file_path_location) / STAGING_DIR_NAME / f"{upload_id}.part"
+
+def create_staging_file(temp_path: Path) -> None:
+    temp_path.parent.mkdir(exist_ok=True)
+    temp_path.touch()
+
+def open_staging_file(temp_path: str, offset: int):
+    """Open a staged upload for writing at `offset`, dropping any bytes past the committed offset."""
+    file_like = open(temp_path, "r+b")
+    file_like.truncate(offset)
+    file_like.seek(offset)
+    return file_like
+
+def sync_and_close(file_like) -> None:
+    try:
+        file_like.flush()
+        os.fsync(file_like.fileno())
+    finally:
+        file_like.close()
+
+def finalize_upload(temp_path: str, destination: Path) -> Path:
+    """
+    Move a completed upload into place without replacing an existing file. A
+    taken name gets a " (n)" suffix; the path actually used is returned.
+    """
+    for candidate in candidate_names(destination):
+        try:
+            # Linking fails atomically when the name is taken, unlike a rename
+            os.link(temp_path, candidate)
+        except FileExistsError:
+            continue
+        except OSError:
+            # Filesystems without hard links, such as exFAT
+            if candidate.exists():
+                continue
+            os.replace(temp_path, candidate)
+            return candidate
+
+        os.remove(temp_path)
+        return candidate
+
+def candidate_names(destination: Path):
+    yield destination
+    for index in itertools.count(1):
+        yield destination.with_name(f"{destination.stem} ({index}){destination.suffix}")
+
+def discard_staging_file(temp_path: str) -> None:
+    try:
+        os.remove(temp_path)
+    except FileNotFoundError:
+        pass
+
+def parse_upload_metadata(header: str) -> Dict[str, str]:
+    """Decode a tus `Upload-Metadata` header: comma separated `key base64value` pairs."""
+    metadata = {}
+    for pair in header.split(","):
+        pair = pair.strip()
+        if not pair:
+            continue
+
+        key, _, encoded = pair.partition(" ")
+        try:
+            metadata[key] = base64.b64decode(encoded.strip(), validate=True).decode("utf-8")
+        except (binascii.Error, UnicodeDecodeError) as e:
+            raise ValueError(f"Invalid Upload-Metadata value for {key!r}") from e
+    return metadata
@@ -1,9 +1,8 @@
 import platform
 import os
-try:
-    import psutil
-except ImportError:
-    psutil = None
+
+# Top-level folders uploads are sorted into, see get_folder_destination
+CATEGORIES = ["photos", "videos", "documents", "audio", "zip", "others"]
 
 def get_external_drive_path():
     system = platform.system()
@@ -22,8 +21,10 @@ def get_external_drive_path():
         drives = [d for d in os.listdir(base_path) if os.path.isdir(os.path.join(base_path, d))]
         return os.path.join(base_path, drives[1]) if len(drives) > 1 else None
     else:  # Windows
-        if psutil is None:
-            raise ImportError("psutil is required for Windows support")
+        try:
+            import psutil
+        except ImportError as e:
+            raise ImportError("psutil is required for Windows support") from e
         for partition in psutil.disk_partitions():
             if "removable" in partition.opts.lower():  # Detect USB drive
                 return partition.mountpoint
@@ -1,21 +1,57 @@
 import os
 import json
+import threading
+from typing import FrozenSet, Optional
+from src.services.database.users import get_user_emails
 
-_cached_allowed_emails_set = None
+class AllowList:
+    """
+    One immutable snapshot of the emails allowed in: the owners listed in
+    ALLOWED_EMAILS and everyone with a User row, which `share` creates.
+    A reload builds a new snapshot and swaps the reference, so lookups read
+    whichever snapshot is current without taking a lock.
+    """
+    __slots__ = ("emails", "version")
+
+    def __init__(self, emails: FrozenSet[str], version: int):
+        self.emails = emails
+        self.version = version
+
+_allow_list: Optional[AllowList] = None
+_reload_lock = threading.Lock()
+_version = 0
+
+def load_env_allowed_emails() -> FrozenSet[str]:
+    ALLOWED_EMAILS = os.getenv("ALLOWED_EMAILS")
+    if not ALLOWED_EMAILS:
+        raise ValueError("ALLOWED_EMAILS environment variable not set")
+    try:
+        allowed_emails = json.loads(ALLOWED_EMAILS)
+    except json.JSONDecodeError as e:
+        raise ValueError("ALLOWED_EMAILS environment variable is not valid JSON") from e
+    if not isinstance(allowed_emails, list):
+        raise ValueError("ALLOWED_EMAILS environment variable must be a JSON list")
+    return frozenset(allowed.lower() for allowed in allowed_emails if isinstance(allowed, str))
+
+def reload_allowed_emails() -> AllowList:
+    """Rebuild the allow-list from ALLOWED_EMAILS and the users table, and swap it in."""
+    global _allow_list, _version
+    # Serialized, so a slow rebuild never replaces a newer one
+    with _reload_lock:
+        emails = load_env_allowed_emails() | frozenset(
+            email.lower() for email in get_user_emails() if isinstance(email, str)
+        )
+        _version += 1
+        _allow_list = AllowList(emails, _version)
+        return _allow_list
+
+def get_allow_list() -> AllowList:
+    allow_list = _allow_list
+    if allow_list is None:
+        allow_list = reload_allowed_emails()
+    return allow_list
 
 def is_email_allowed(email: str) -> bool:
-    global _cached_allowed_emails_set
     if not email:
         return False
-    if _cached_allowed_emails_set is None:
-        ALLOWED_EMAILS = os.getenv("ALLOWED_EMAILS")
-        if not ALLOWED_EMAILS:
-            raise ValueError("ALLOWED_EMAILS environment variable not set")
-        try:
-            allowed_emails = json.loads(ALLOWED_EMAILS)
-        except json.JSONDecodeError as e:
-            raise ValueError("ALLOWED_EMAILS environment variable is not valid JSON") from e
-        if not isinstance(allowed_emails, list):
-            raise ValueError("ALLOWED_EMAILS environment variable must be a JSON list")
-        _cached_allowed_emails_set = set(allowed.lower() for allowed in allowed_emails if isinstance(allowed, str))
-    return email.lower() in _cached_allowed_emails_set
+    return email.lower() in get_allow_list().emails
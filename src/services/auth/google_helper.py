@@ -1,7 +1,142 @@
 import os
+import re
+import threading
+import time
 from typing import Optional, Dict, Any
-from google.oauth2 import id_token
-from google.auth.transport import requests
+
+GOOGLE_JWKS_URL = os.getenv("GOOGLE_JWKS_URL", "https://www.googleapis.com/oauth2/v3/certs")
+GOOGLE_ISSUERS = ["accounts.google.com", "https://accounts.google.com"]
+# Certificates are kept this long when Google sends no max-age
+DEFAULT_CERTS_MAX_AGE = 3600
+# Refresh this many seconds before the certificates expire, and never fetch
+# more often than MIN_REFRESH_SECONDS, however many unknown key ids turn up
+REFRESH_MARGIN_SECONDS = 300
+MIN_REFRESH_SECONDS = 60
+FETCH_TIMEOUT_SECONDS = 10
+CLOCK_SKEW_SECONDS = 10
+MAX_AGE = re.compile(r"max-age=(\d+)")
+
+def cache_lifetime(headers) -> int:
+    """Seconds a certificates response stays fresh, from Cache-Control max-age less its Age."""
+    match = MAX_AGE.search(headers.get("Cache-Control", ""))
+    if match is None:
+        return DEFAULT_CERTS_MAX_AGE
+    try:
+        age = int(headers.get("Age", "0"))
+    except ValueError:
+        age = 0
+    return max(int(match.group(1)) - age, 0)
+
+class GoogleCerts:
+    """
+    Google's ID-token signing keys, fetched as a JWKS over one pooled HTTP
+    session and parsed once. They are kept for as long as Cache-Control
+    allows, and a background thread fetches the next set shortly before that,
+    so a login never waits on Google. Stale keys are still served while a
+    refresh fails; Google publishes new keys well before it signs with them.
+    """
+
+    def __init__(self, url: str = GOOGLE_JWKS_URL, session=None):
+        self.url = url
+        self.session = session
+        self.keys: Dict[str, Any] = {}
+        self.expires_at = 0.0
+        self.attempted_at = None
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+
+    def refresh(self) -> None:
+        # requests and jose load here, usually on the refresh thread, not during startup
+        from jose import jwk
+        if self.session is None:
+            import requests
+            self.session = requests.Session()
+
+        response = self.session.get(self.url, timeout=FETCH_TIMEOUT_SECONDS)
+        response.raise_for_status()
+        keys = {
+            key["kid"]: jwk.construct(key, key.get("alg", "RS256"))
+            for key in response.json().get("keys", [])
+            if "kid" in key
+        }
+        if not keys:
+            raise ValueError("Google certificates response has no keys")
+
+        with self.lock:
+            self.keys = keys
+            self.expires_at = time.monotonic() + cache_lifetime(response.headers)
+
+    def get_key(self, kid: str):
+        """The key `kid`, fetching the certificates when they expired or the id is new to them."""
+        with self.lock:
+            key = self.keys.get(kid)
+            now = time.monotonic()
+            if key is not None and now < self.expires_at:
+                return key
+            if self.attempted_at is not None and now - self.attempted_at < MIN_REFRESH_SECONDS:
+                return key
+            self.attempted_at = now
+
+        try:
+            self.refresh()
+        except Exception as e:
+            print(f"Exception [GoogleCerts.get_key]: {e}")
+        with self.lock:
+            return self.keys.get(kid)
+
+    def start(self) -> None:
+        if self.thread is not None and self.thread.is_alive():
+            return
+        self.stopped.clear()
+        self.thread = threading.Thread(target=self.run, name="google-certs", daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        self.stopped.set()
+        if self.thread is not None:
+            self.thread.join(timeout=5)
+
+    def run(self) -> None:
+        while not self.stopped.is_set():
+            try:
+                self.refresh()
+                wait = max(self.expires_at - time.monotonic() - REFRESH_MARGIN_SECONDS, MIN_REFRESH_SECONDS)
+            except Exception as e:
+                print(f"Exception [GoogleCerts.run]: {e}")
+                wait = MIN_REFRESH_SECONDS
+            self.stopped.wait(wait)
+
+_google_certs = None
+
+def get_google_certs() -> GoogleCerts:
+    global _google_certs
+    if _google_certs is None:
+        _google_certs = GoogleCerts()
+    return _google_certs
+
+def decode_google_id_token(token: str, client_id: str, certs: Optional[GoogleCerts] = None) -> Dict[str, Any]:
+    """
+    Verify a Google ID token's signature against the cached certificates, and
+    its audience, issuer and expiry. Raises ValueError when it is not valid.
+    """
+    from jose import JWTError, jwt
+    certs = certs if certs is not None else get_google_certs()
+    try:
+        kid = jwt.get_unverified_header(token).get("kid")
+        key = certs.get_key(kid) if kid else None
+        if key is None:
+            raise ValueError(f"Token signed with unknown key: {kid}")
+        return jwt.decode(
+            token,
+            key,
+            algorithms=["RS256"],
+            audience=client_id,
+            issuer=GOOGLE_ISSUERS,
+            options={"leeway": CLOCK_SKEW_SECONDS, "require_exp": True, "verify_at_hash": False},
+        )
+    except JWTError as e:
+        raise ValueError(str(e)) from e
 
 def verify_google_token(token: str) -> Optional[Dict[str, Any]]:
     """Verify a Google OAuth token and return user info."""
@@ -10,14 +145,10 @@ def verify_google_token(token: str) -> Optional[Dict[str, Any]]:
         client_id = os.getenv("GOOGLE_CLIENT_ID")
         if not client_id:
             raise ValueError("GOOGLE_CLIENT_ID environment variable not set")
-        
+
         # Verify the token
-        idinfo = id_token.verify_oauth2_token(
-            token, 
-            requests.Request(), 
-            client_id
-        )
-        
+        idinfo = decode_google_id_token(token, client_id)
+
         # Extract user information
         user_info = {
             "email": idinfo.get("email"),
@@ -26,13 +157,13 @@ def verify_google_token(token: str) -> Optional[Dict[str, Any]]:
             "sub": idinfo.get("sub"),  # Google user ID
             "email_verified": idinfo.get("email_verified", False)
         }
-        
+
         # Verify email is verified by Google
         if not user_info["email_verified"]:
             return None
-            
+
         return user_info
-        
+
     except ValueError as e:
         print(f"ValueError [verify_google_token] invalid token: {e}")
 
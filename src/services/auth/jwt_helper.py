@@ -1,13 +1,70 @@
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
+import hashlib
 import os
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+import threading
+import time
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# jose and passlib are imported on first use, which keeps them off the cold start
 
-def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
-    """Create a JWT access token."""
+VERIFIED_TOKEN_CACHE_SIZE = int(os.getenv("VERIFIED_TOKEN_CACHE_SIZE", "4096"))
+
+class JwtSettings:
+    def __init__(self, secret_key: str, algorithm: str, access_token_expire_minutes: Optional[int]):
+        self.secret_key = secret_key
+        self.algorithm = algorithm
+        self.access_token_expire_minutes = access_token_expire_minutes
+
+class VerifiedTokenCache:
+    """
+    Bounded LRU from the SHA-256 of a token that passed verification to its
+    claims, so a token seen before costs a hash and a dict lookup instead of a
+    signature check. Entries are served only until the token's `exp`.
+    """
+
+    def __init__(self, max_entries: int = VERIFIED_TOKEN_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.tokens: "OrderedDict[bytes, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, digest: bytes) -> Optional[Dict[str, Any]]:
+        with self.lock:
+            cached = self.tokens.get(digest)
+            if cached is None:
+                return None
+            if cached[0] <= time.time():
+                del self.tokens[digest]
+                return None
+            self.tokens.move_to_end(digest)
+            return cached[1]
+
+    def put(self, digest: bytes, payload: Dict[str, Any]) -> None:
+        expires = payload.get("exp")
+        if self.max_entries <= 0 or not isinstance(expires, (int, float)):
+            return
+        with self.lock:
+            self.tokens[digest] = (expires, payload)
+            self.tokens.move_to_end(digest)
+            while len(self.tokens) > self.max_entries:
+                self.tokens.popitem(last=False)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.tokens.clear()
+
+_jwt_settings = None
+_verified_tokens = VerifiedTokenCache()
+_pwd_context = None
+
+def get_pwd_context():
+    global _pwd_context
+    if _pwd_context is None:
+        from passlib.context import CryptContext
+        _pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    return _pwd_context
+
+def load_jwt_settings() -> JwtSettings:
     SECRET_KEY = os.getenv("JWT_SECRET_KEY")
     if not SECRET_KEY:
         raise ValueError("JWT_SECRET_KEY environment variable is not set")
@@ -16,42 +73,70 @@ def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta]
     if not ALGORITHM:
         raise ValueError("JWT_ALGORITHM environment variable is not set")
 
+    # Checked when a token is created, so verification works without it
     access_token_expire_minutes_str = os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES")
-    if not access_token_expire_minutes_str:
+    ACCESS_TOKEN_EXPIRE_MINUTES = None
+    if access_token_expire_minutes_str:
+        try:
+            ACCESS_TOKEN_EXPIRE_MINUTES = int(access_token_expire_minutes_str)
+        except (TypeError, ValueError):
+            raise ValueError("ACCESS_TOKEN_EXPIRE_MINUTES environment variable must be an integer")
+
+    return JwtSettings(SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES)
+
+def get_jwt_settings() -> JwtSettings:
+    """The JWT key and algorithm, read from the environment on first use."""
+    global _jwt_settings
+    if _jwt_settings is None:
+        _jwt_settings = load_jwt_settings()
+    return _jwt_settings
+
+def reload_jwt_settings() -> None:
+    """
+    Re-read the JWT settings from the environment and forget every verified
+    token, so a rotated key takes effect at once.
+    """
+    global _jwt_settings
+    _jwt_settings = load_jwt_settings()
+    _verified_tokens.clear()
+
+def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
+    """Create a JWT access token."""
+    from jose import jwt
+    settings = get_jwt_settings()
+    if not expires_delta and settings.access_token_expire_minutes is None:
         raise ValueError("ACCESS_TOKEN_EXPIRE_MINUTES environment variable is not set")
-    try:
-        ACCESS_TOKEN_EXPIRE_MINUTES = int(access_token_expire_minutes_str)
-    except (TypeError, ValueError):
-        raise ValueError("ACCESS_TOKEN_EXPIRE_MINUTES environment variable must be an integer")
     to_encode = data.copy()
     
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
     else:
-        expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+        expire = datetime.utcnow() + timedelta(minutes=settings.access_token_expire_minutes)
     
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    encoded_jwt = jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
     return encoded_jwt
 
 def verify_token(token: str) -> Optional[Dict[str, Any]]:
-    """Verify and decode a JWT token."""
-    SECRET_KEY = os.getenv("JWT_SECRET_KEY")
-    if not SECRET_KEY:
-        raise ValueError("JWT_SECRET_KEY environment variable is not set")
-    ALGORITHM = os.getenv("JWT_ALGORITHM")
-    if not ALGORITHM:
-        raise ValueError("JWT_ALGORITHM environment variable is not set")
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    """Verify and decode a JWT token. Tokens verified before are answered from the cache until they expire."""
+    settings = get_jwt_settings()
+    digest = hashlib.sha256(token.encode()).digest()
+    payload = _verified_tokens.get(digest)
+    if payload is not None:
         return payload
+
+    from jose import JWTError, jwt
+    try:
+        payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
     except JWTError:
         return None
+    _verified_tokens.put(digest, payload)
+    return payload
 
 def get_password_hash(password: str) -> str:
     """Hash a password (not used for Google OAuth, but included for completeness)."""
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password (not used for Google OAuth, but included for completeness)."""
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
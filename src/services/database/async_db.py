@@ -0,0 +1,43 @@
+"""
+Awaitable versions of the user and user setting queries for `async def`
+handlers. Each runs the synchronous query of the same name on the database
+pool, so the event loop keeps serving other requests while it waits.
+"""
+from src.services.auth import allow_email_helper
+from src.services.database import user_context, user_settings, users
+from src.services.database.db_service import run_db
+from src.services.database.user_context_cache import get_user_context_cache
+
+async def get_user_by_id(id: str):
+    return await run_db(users.get_user_by_id, id)
+
+async def get_user_by_email(email: str):
+    return await run_db(users.get_user_by_email, email)
+
+async def create_user(parameters):
+    return await run_db(users.create_user, parameters)
+
+async def update_user(parameters):
+    return await run_db(users.update_user, parameters)
+
+async def get_user_setting(id: str):
+    return await run_db(user_settings.get_user_setting, id)
+
+async def get_drive_path_selections():
+    return await run_db(user_settings.get_drive_path_selections)
+
+async def create_user_setting(parameters):
+    return await run_db(user_settings.create_user_setting, parameters)
+
+async def update_user_setting(parameters):
+    return await run_db(user_settings.update_user_setting, parameters)
+
+async def get_user_context(email: str):
+    # A cache hit is answered on the event loop without a trip to the pool
+    context = get_user_context_cache().get(email)
+    if context is not None:
+        return context
+    return await run_db(user_context.get_user_context, email)
+
+async def reload_allowed_emails():
+    return await run_db(allow_email_helper.reload_allowed_emails)
@@ -0,0 +1,103 @@
+from datetime import datetime, timezone
+from src.services.database.db_service import get_connection
+
+class FileHash:
+    def __init__(self, row, cursor):
+        if row is not None:
+            # Set each column as an attribute with its name from the cursor description
+            for idx, col in enumerate(cursor.description):
+                setattr(self, col[0], row[idx])
+
+def get_file_hash(path: str):
+    with get_connection() as conn:
+        cursor = conn.cursor()
+
+        cursor.execute("""
+                    SELECT *
+                    FROM file_hashes AS fh
+                    WHERE fh.path = :path
+                """,
+                {
+                    "path" : path
+                })
+
+        file_hash = cursor.fetchone()
+
+        if file_hash is None:
+            return None
+
+        return FileHash(file_hash, cursor)
+
+def get_file_hashes_by_content(hash: str, size: int):
+    with get_connection() as conn:
+        cursor = conn.cursor()
+
+        cursor.execute("""
+                    SELECT *
+                    FROM file_hashes AS fh
+                    WHERE fh.hash = :hash AND fh.size = :size
+                """,
+                {
+                    "hash" : hash,
+                    "size" : size
+                })
+
+        return [FileHash(row, cursor) for row in cursor.fetchall()]
+
+def get_file_hashes_by_paths(paths):
+    # Stay well below SQLite's limit on bound variables per statement
+    batch_size = 500
+    file_hashes = []
+    with get_connection() as conn:
+        cursor = conn.cursor()
+
+        for index in range(0, len(paths), batch_size):
+            batch = paths[index:index + batch_size]
+            placeholders = ", ".join(f":path_{position}" for position in range(len(batch)))
+            cursor.execute(f"""
+                        SELECT *
+                        FROM file_hashes AS fh
+                        WHERE fh.path IN ({placeholders})
+                    """,
+                    {f"path_{position}": path for position, path in enumerate(batch)})
+
+            file_hashes.extend(FileHash(row, cursor) for row in cursor.fetchall())
+
+    return file_hashes
+
+def upsert_file_hash(parameters):
+    upsert_file_hashes([parameters])
+
+def upsert_file_hashes(parameters_list):
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        updated_at = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+
+        cursor.executemany("""
+                INSERT INTO file_hashes (path, hash, size, inode, mtime_ns)
+                VALUES (:path, :hash, :size, :inode, :mtime_ns)
+                ON CONFLICT (path) DO UPDATE SET
+                    hash = excluded.hash,
+                    size = excluded.size,
+                    inode = excluded.inode,
+                    mtime_ns = excluded.mtime_ns,
+                    updated_at = :updated_at
+                """,
+                [{**parameters, "updated_at": updated_at} for parameters in parameters_list]
+                )
+
+        conn.commit()
+
+def delete_file_hash(path: str):
+    with get_connection() as conn:
+        cursor = conn.cursor()
+
+        cursor.execute("""
+                DELETE FROM file_hashes
+                WHERE path = :path
+                """,
+                {
+                    "path" : path
+                })
+
+        conn.commit()
@@ -0,0 +1,521 @@
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Optional
+from src.services.database.db_service import get_connection, transaction
+from src.services.database.row_mapper import row_mapper
+import json
+import os
+
+# Columns each listing sort orders by, always followed by the name so ties
+# keep a stable order, matching listing_helper.sort_key
+SORT_COLUMNS = {
+    "name": [],
+    "mtime": ["f.mtime_ns"],
+    "size": ["CASE WHEN f.is_dir THEN -1 ELSE f.size END"],
+    "type": ["NOT f.is_dir"],
+}
+NAME_COLUMNS = ["f.name COLLATE NOCASE", "f.name"]
+
+UPSERT_FILE = """
+        INSERT INTO files (path, parent, name, is_dir, size, mtime_ns, mime_type, category, inode, owner, indexed_ns)
+        VALUES (:path, :parent, :name, :is_dir, :size, :mtime_ns, :mime_type, :category, :inode, :owner, :indexed_ns)
+        ON CONFLICT (path) DO UPDATE SET
+            is_dir = excluded.is_dir,
+            size = excluded.size,
+            mtime_ns = excluded.mtime_ns,
+            mime_type = excluded.mime_type,
+            category = excluded.category,
+            inode = excluded.inode,
+            owner = excluded.owner,
+            indexed_ns = excluded.indexed_ns
+        """
+
+@dataclass(slots=True)
+class IndexedFile:
+    """One row of the `files` index; fields a query did not select stay None."""
+    id: Optional[int] = None
+    path: Optional[str] = None
+    parent: Optional[str] = None
+    name: Optional[str] = None
+    is_dir: Optional[bool] = None
+    size: Optional[int] = None
+    mtime_ns: Optional[int] = None
+    mime_type: Optional[str] = None
+    category: Optional[str] = None
+    inode: Optional[int] = None
+    owner: Optional[int] = None
+    indexed_ns: Optional[int] = None
+
+class IndexCheckpoint:
+    def __init__(self, row, cursor):
+        if row is not None:
+            # Set each column as an attribute with its name from the cursor description
+            for idx, col in enumerate(cursor.description):
+                setattr(self, col[0], row[idx])
+
+class IndexScan:
+    def __init__(self, row, cursor):
+        if row is not None:
+            # Set each column as an attribute with its name from the cursor description
+            for idx, col in enumerate(cursor.description):
+                setattr(self, col[0], row[idx])
+
+def subtree_bounds(path: str):
+    """Half-open range of `path` values strictly inside the folder `path`, so subtree queries use the primary key."""
+    return path + os.sep, path + chr(ord(os.sep) + 1)
+
+def get_indexed_file(path: str):
+    with get_connection() as conn:
+        cursor = conn.cursor()
+
+        cursor.execute("""
+                    SELECT *
+                    FROM files AS f
+                    WHERE f.path = :path
+                """,
+                {
+                    "path" : path
+                })
+
+        indexed_file = cursor.fetchone()
+
+        if indexed_file is None:
+            return None
+
+        return row_mapper(IndexedFile, cursor.description)(indexed_file)
+
+def get_children(parent: str):
+    with get_connection() as conn:
+        cursor = conn.cursor()
+
+        cursor.execute("""
+                    SELECT *
+                    FROM files AS f
+                    WHERE f.parent = :parent
+                """,
+                {
+                    "parent" : parent
+                })
+
+        return list(map(row_mapper(IndexedFile, cursor.description), cursor.fetchall()))
+
+def get_child_directories(parent: str):
+    """The indexed subfolders of `parent`, and how many files it holds besides."""
+    with get_connection() as conn:
+        cursor = conn.cursor()
+
+        cursor.execute("""
+                    SELECT f.path, f.mtime_ns, f.indexed_ns
+                    FROM files AS f
+                    WHERE f.parent = :parent AND f.is_dir
+                """,
+                {
+                    "parent" : parent
+                })
+        directories = list(map(row_mapper(IndexedFile, cursor.description), cursor.fetchall()))
+
+        cursor.execute("""
+                    SELECT COUNT(*)
+                    FROM files AS f
+                    WHERE f.parent = :parent AND NOT f.is_dir
+                """,
+                {
+                    "parent" : parent
+                })
+
+        return directories, cursor.fetchone()[0]
+
+def get_files_by_inode(inode: int):
+    with get_connection() as conn:
+        cursor = conn.cursor()
+
+        cursor.execute("""
+                    SELECT *
+                    FROM files AS f
+                    WHERE f.inode = :inode
+                """,
+                {
+                    "inode" : inode
+                })
+
+        return list(map(row_mapper(IndexedFile, cursor.description), cursor.fetchall()))
+
+def query_files(
+    parents=None,
+    category=None,
+    is_dir=None,
+    min_size=None,
+    max_size=None,
+    modified_after_ns=None,
+    modified_before_ns=None,
+    sort="name",
+    order="asc",
+    limit=None,
+):
+    conditions = []
+    parameters = {}
+    if parents is not None:
+        placeholders = ", ".join(f":parent_{position}" for position in range(len(parents)))
+        conditions.append(f"f.parent IN ({placeholders})")
+        parameters.update({f"parent_{position}": parent for position, parent in enumerate(parents)})
+    for column, operator, value in [
+        ("f.category", "=", category),
+        ("f.is_dir", "=", is_dir),
+        ("f.size", ">=", min_size),
+        ("f.size", "<=", max_size),
+        ("f.mtime_ns", ">=", modified_after_ns),
+        ("f.mtime_ns", "<", modified_before_ns),
+    ]:
+        if value is not None:
+            name = f"condition_{len(parameters)}"
+            conditions.append(f"{column} {operator} :{name}")
+            parameters[name] = value
+
+    direction = "DESC" if order == "desc" else "ASC"
+    order_by = ", ".join(f"{column} {direction}" for column in SORT_COLUMNS[sort] + NAME_COLUMNS)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    limit_clause = ""
+    if limit is not None:
+        limit_clause = "LIMIT :limit"
+        parameters["limit"] = limit
+
+    with get_connection() as conn:
+        cursor = conn.cursor()
+
+        cursor.execute(f"""
+                    SELECT *
+                    FROM files AS f
+                    {where}
+                    ORDER BY {order_by}
+                    {limit_clause}
+                """,
+                parameters)
+
+        return list(map(row_mapper(IndexedFile, cursor.description), cursor.fetchall()))
+
+def search_files(root: str, words_query=None, substring_query=None, is_dir=None, category=None, limit=50, offset=0, candidates=2000):
+    """
+    Entries under `root` whose name matches the FTS5 `words_query` or
+    `substring_query`, and whether the match was truncated.
+
+    Each index contributes at most `candidates` matches, which keeps broad
+    queries as fast as narrow ones. Word matches rank before substring-only
+    matches, and within each group shorter names, where the match covers more
+    of the name, come first. bm25 is not used: on short single-column names it
+    hardly discriminates, and it costs a pass over every match.
+    """
+    branches = []
+    if words_query is not None:
+        branches.append("""
+                SELECT * FROM (
+                    SELECT rowid AS id, 0 AS tier
+                    FROM files_words
+                    WHERE files_words MATCH :words_query
+                    LIMIT :candidates + 1
+                )
+            """)
+    if substring_query is not None:
+        branches.append("""
+                SELECT * FROM (
+                    SELECT rowid AS id, 1 AS tier
+                    FROM files_trigram
+                    WHERE files_trigram MATCH :substring_query
+                    LIMIT :candidates + 1
+                )
+            """)
+    if not branches:
+        return [], False
+
+    lower, upper = subtree_bounds(root)
+    conditions = ["f.path > :lower", "f.path < :upper"]
+    if is_dir is not None:
+        conditions.append("f.is_dir = :is_dir")
+    if category is not None:
+        conditions.append("f.category = :category")
+
+    with get_connection() as conn:
+        cursor = conn.cursor()
+
+        cursor.execute(f"""
+                    WITH matches AS ({" UNION ALL ".join(branches)})
+                    SELECT f.*, MIN(m.tier) AS tier
+                    FROM matches AS m
+                    JOIN files AS f ON f.id = m.id
+                    WHERE {" AND ".join(conditions)}
+                    GROUP BY f.id
+                    ORDER BY MIN(m.tier), length(f.name), f.name COLLATE NOCASE, f.name
+                    LIMIT :limit OFFSET :offset
+                """,
+                {
+                    "words_query" : words_query,
+                    "substring_query" : substring_query,
+                    "candidates" : candidates,
+                    "lower" : lower,
+                    "upper" : upper,
+                    "is_dir" : is_dir,
+                    "category" : category,
+                    "limit" : limit,
+                    "offset" : offset
+                })
+        indexed_files = list(map(row_mapper(IndexedFile, cursor.description), cursor.fetchall()))
+
+        truncated = False
+        for match_query, table in [(words_query, "files_words"), (substring_query, "files_trigram")]:
+            if match_query is not None and not truncated:
+                cursor.execute(f"""
+                            SELECT COUNT(*) FROM (
+                                SELECT rowid
+                                FROM {table}
+                                WHERE {table} MATCH :match_query
+                                LIMIT :candidates + 1
+                            )
+                        """,
+                        {
+                            "match_query" : match_query,
+                            "candidates" : candidates
+                        })
+                truncated = cursor.fetchone()[0] > candidates
+
+        return indexed_files, truncated
+
+def upsert_files(parameters_list):
+    with get_connection() as conn:
+        cursor = conn.cursor()
+
+        cursor.executemany(UPSERT_FILE, parameters_list)
+
+        conn.commit()
+
+def delete_stale_children(parent: str, indexed_before: int):
+    """Drop the entries of `parent` not seen since `indexed_before`, and everything under stale folders."""
+    with get_connection() as conn:
+        cursor = conn.cursor()
+
+        cursor.execute("""
+                    SELECT f.path
+                    FROM files AS f
+                    WHERE f.parent = :parent AND f.is_dir AND f.indexed_ns < :indexed_before
+                """,
+                {
+                    "parent" : parent,
+                    "indexed_before" : indexed_before
+                })
+
+        for (path,) in cursor.fetchall():
+            lower, upper = subtree_bounds(path)
+            cursor.execute("""
+                    DELETE FROM files
+                    WHERE path > :lower AND path < :upper
+                    """,
+                    {
+                        "lower" : lower,
+                        "upper" : upper
+                    })
+
+        cursor.execute("""
+                DELETE FROM files
+                WHERE parent = :parent AND indexed_ns < :indexed_before
+                """,
+                {
+                    "parent" : parent,
+                    "indexed_before" : indexed_before
+                })
+
+        conn.commit()
+
+def delete_stale_files(root: str, indexed_before: int):
+    """Drop every entry in or under `root` not seen since `indexed_before`; returns how many went."""
+    lower, upper = subtree_bounds(root)
+    with get_connection() as conn:
+        cursor = conn.cursor()
+
+        cursor.execute("""
+                DELETE FROM files
+                WHERE (path = :root OR (path > :lower AND path < :upper)) AND indexed_ns < :indexed_before
+                """,
+                {
+                    "root" : root,
+                    "lower" : lower,
+                    "upper" : upper,
+                    "indexed_before" : indexed_before
+                })
+
+        conn.commit()
+        return cursor.rowcount
+
+def rename_subtree(cursor, old_path: str, new_path: str):
+    """Move an entry and everything under it to a new path, in the index and in the hash cache."""
+    lower, upper = subtree_bounds(old_path)
+    new_lower, new_upper = subtree_bounds(new_path)
+    parameters = {
+        "old_path" : old_path,
+        "new_path" : new_path,
+        "new_parent" : os.path.dirname(new_path),
+        "new_name" : os.path.basename(new_path),
+        "lower" : lower,
+        "upper" : upper,
+        "new_lower" : new_lower,
+        "new_upper" : new_upper,
+        "length" : len(old_path),
+    }
+
+    for table in ["files", "file_hashes"]:
+        # Whatever is left at the destination is stale: the path was new on disk
+        cursor.execute(f"""
+                DELETE FROM {table}
+                WHERE path = :new_path OR (path > :new_lower AND path < :new_upper)
+                """,
+                parameters)
+        cursor.execute(f"""
+                UPDATE {table}
+                SET path = :new_path || substr(path, :length + 1)
+                WHERE path = :old_path OR (path > :lower AND path < :upper)
+                """,
+                parameters)
+
+    cursor.execute("""
+            UPDATE files
+            SET parent = :new_path || substr(parent, :length + 1)
+            WHERE path > :new_lower AND path < :new_upper
+            """,
+            parameters)
+    cursor.execute("""
+            UPDATE files
+            SET parent = :new_parent, name = :new_name
+            WHERE path = :new_path
+            """,
+            parameters)
+
+def save_index_batch(root: str, renames, records, touched_parents, checkpoint):
+    """
+    Write one batch of an index scan in a single transaction: renames first,
+    then upserted entries, then the folders whose entries were confirmed
+    unchanged, and the checkpoint the scan resumes from after a crash.
+    """
+    with transaction() as conn:
+        cursor = conn.cursor()
+
+        for old_path, new_path in renames:
+            rename_subtree(cursor, old_path, new_path)
+        cursor.executemany(UPSERT_FILE, records)
+        cursor.executemany("""
+                UPDATE files
+                SET indexed_ns = :indexed_ns
+                WHERE parent = :parent
+                """,
+                [{"parent": parent, "indexed_ns": checkpoint["started_ns"]} for parent in touched_parents]
+                )
+        cursor.execute("""
+                INSERT INTO file_index_checkpoints (root, started_ns, pending, file_count, directory_count, skipped_count, renamed_count)
+                VALUES (:root, :started_ns, :pending, :file_count, :directory_count, :skipped_count, :renamed_count)
+                ON CONFLICT (root) DO UPDATE SET
+                    started_ns = excluded.started_ns,
+                    pending = excluded.pending,
+                    file_count = excluded.file_count,
+                    directory_count = excluded.directory_count,
+                    skipped_count = excluded.skipped_count,
+                    renamed_count = excluded.renamed_count,
+                    updated_at = :updated_at
+                """,
+                {
+                    **checkpoint,
+                    "root" : root,
+                    "pending" : json.dumps(checkpoint["pending"]),
+                    "updated_at" : datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S"),
+                })
+
+def get_index_checkpoint(root: str):
+    with get_connection() as conn:
+        cursor = conn.cursor()
+
+        cursor.execute("""
+                    SELECT *
+                    FROM file_index_checkpoints AS fic
+                    WHERE fic.root = :root
+                """,
+                {
+                    "root" : root
+                })
+
+        index_checkpoint = cursor.fetchone()
+
+        if index_checkpoint is None:
+            return None
+
+        index_checkpoint = IndexCheckpoint(index_checkpoint, cursor)
+        index_checkpoint.pending = json.loads(index_checkpoint.pending)
+        return index_checkpoint
+
+def finish_index_scan(parameters):
+    """Drop what the scan did not see, record its totals and clear its checkpoint; returns the entries dropped."""
+    lower, upper = subtree_bounds(parameters["root"])
+    with transaction() as conn:
+        cursor = conn.cursor()
+
+        cursor.execute("""
+                DELETE FROM files
+                WHERE (path = :root OR (path > :lower AND path < :upper)) AND indexed_ns < :started_ns
+                """,
+                {
+                    **parameters,
+                    "lower" : lower,
+                    "upper" : upper
+                })
+        removed_count = cursor.rowcount
+
+        cursor.execute("""
+                UPDATE file_index_scans
+                SET completed_ns = :completed_ns,
+                    file_count = :file_count,
+                    directory_count = :directory_count,
+                    skipped_count = :skipped_count,
+                    renamed_count = :renamed_count
+                WHERE root = :root AND started_ns = :started_ns
+                """,
+                parameters
+                )
+        cursor.execute("""
+                DELETE FROM file_index_checkpoints
+                WHERE root = :root
+                """,
+                parameters
+                )
+
+        return removed_count
+
+def get_index_scan(root: str):
+    with get_connection() as conn:
+        cursor = conn.cursor()
+
+        cursor.execute("""
+                    SELECT *
+                    FROM file_index_scans AS fis
+                    WHERE fis.root = :root
+                """,
+                {
+                    "root" : root
+                })
+
+        index_scan = cursor.fetchone()
+
+        if index_scan is None:
+            return None
+
+        return IndexScan(index_scan, cursor)
+
+def start_index_scan(root: str, started_ns: int):
+    with get_connection() as conn:
+        cursor = conn.cursor()
+
+        cursor.execute("""
+                INSERT INTO file_index_scans (root, started_ns)
+                VALUES (:root, :started_ns)
+                ON CONFLICT (root) DO UPDATE SET
+                    started_ns = excluded.started_ns
+                """,
+                {
+                    "root" : root,
+                    "started_ns" : started_ns
+                })
+
+        conn.commit()
@@ -0,0 +1,35 @@
+from dataclasses import MISSING, fields
+from functools import lru_cache
+from typing import Callable, Sequence, Tuple
+
+def row_mapper(model, description, prefix: str = "") -> Callable[[Sequence], object]:
+    """
+    The function that turns a row of a query with this cursor `description`
+    into a `model` dataclass, compiled once per model and column list.
+    Each field is read from the column of the same name, after `prefix`.
+    Fields the query did not select take their default, and columns without
+    a field are left out.
+    """
+    return compile_row_mapper(model, tuple(column[0] for column in description), prefix)
+
+@lru_cache(maxsize=256)
+def compile_row_mapper(model, columns: Tuple[str, ...], prefix: str) -> Callable[[Sequence], object]:
+    positions = {column: index for index, column in enumerate(columns)}
+    namespace = {"model": model}
+    arguments = []
+    for field in fields(model):
+        if not field.init:
+            continue
+        position = positions.get(prefix + field.name)
+        if position is not None:
+            arguments.append(f"row[{position}]")
+        elif field.default is not MISSING:
+            namespace[f"default_{field.name}"] = field.default
+            arguments.append(f"default_{field.name}")
+        else:
+            raise ValueError(f"{model.__name__}.{field.name} has no column and no default")
+
+    # One positional call with constant indexes, like namedtuple builds its methods
+    source = f"def map_row(row):\n    return model({', '.join(arguments)})\n"
+    exec(source, namespace)
+    return namespace["map_row"]
@@ -0,0 +1,95 @@
+from datetime import datetime, timezone
+from src.services.database.db_service import get_connection
+
+class UploadSession:
+    def __init__(self, row, cursor):
+        if row is not None:
+            # Set each column as an attribute with its name from the cursor description
+            for idx, col in enumerate(cursor.description):
+                setattr(self, col[0], row[idx])
+
+def get_upload_session(id: str):
+    with get_connection() as conn:
+        cursor = conn.cursor()
+
+        cursor.execute("""
+                    SELECT *
+                    FROM upload_sessions AS us
+                    WHERE us.id = :id
+                """,
+                {
+                    "id" : id
+                })
+
+        upload_session = cursor.fetchone()
+
+        if upload_session is None:
+            return None
+
+        return UploadSession(upload_session, cursor)
+
+def create_upload_session(parameters):
+    with get_connection() as conn:
+        cursor = conn.cursor()
+
+        cursor.execute("""
+                INSERT INTO upload_sessions (id, owner_email, file_path_location, filename, upload_length, temp_path)
+                VALUES (:id, :owner_email, :file_path_location, :filename, :upload_length, :temp_path)
+                """,
+                parameters
+                )
+
+        conn.commit()
+
+    return get_upload_session(parameters["id"])
+
+def get_expired_upload_sessions(updated_before: str):
+    with get_connection() as conn:
+        cursor = conn.cursor()
+
+        cursor.execute("""
+                    SELECT *
+                    FROM upload_sessions AS us
+                    WHERE us.updated_at < :updated_before
+                """,
+                {
+                    "updated_before" : updated_before
+                })
+
+        return [UploadSession(row, cursor) for row in cursor.fetchall()]
+
+def update_upload_offset(parameters):
+    """
+    Move the committed offset from `expected_offset` to `upload_offset`. The
+    update only applies while the stored offset still equals `expected_offset`,
+    so returns False when another writer got there first.
+    """
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        parameters["updated_at"] = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+
+        cursor.execute("""
+                UPDATE upload_sessions
+                SET upload_offset = :upload_offset, updated_at = :updated_at
+                WHERE id = :id AND upload_offset = :expected_offset
+                """,
+                parameters
+                )
+
+        conn.commit()
+
+        return cursor.rowcount == 1
+
+def delete_upload_session(id: str):
+    with get_connection() as conn:
+        cursor = conn.cursor()
+
+        cursor.execute("""
+                DELETE FROM upload_sessions
+                WHERE id = :id
+                """,
+                {
+                    "id" : id
+                })
+
+        conn.commit()
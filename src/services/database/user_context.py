@@ -0,0 +1,52 @@
+from typing import Optional
+from src.services.database.db_service import get_connection
+from src.services.database.row_mapper import row_mapper
+from src.services.database.user_context_cache import UserContext, get_user_context_cache
+from src.services.database.user_settings import UserSetting
+from src.services.database.users import User
+
+SETTING_PREFIX = "setting_"
+
+def load_user_context(email: str) -> Optional[UserContext]:
+    """Read a User and their settings with one JOIN, bypassing the cache."""
+    with get_connection() as conn:
+        cursor = conn.cursor()
+
+        cursor.execute("""
+                    SELECT u.*,
+                        us.id AS setting_id,
+                        us.user_id AS setting_user_id,
+                        us.hard_drive_path_selection AS setting_hard_drive_path_selection,
+                        us.created_at AS setting_created_at,
+                        us.updated_at AS setting_updated_at
+                    FROM users AS u
+                    LEFT JOIN user_settings AS us ON us.user_id = u.id
+                    WHERE u.email = :email
+                    ORDER BY us.id
+                    LIMIT 1
+                """,
+                {
+                    "email" : email
+                })
+
+        row = cursor.fetchone()
+
+        if row is None:
+            return None
+
+        user = row_mapper(User, cursor.description)(row)
+        user_setting = row_mapper(UserSetting, cursor.description, SETTING_PREFIX)(row)
+        return UserContext(user, user_setting if user_setting.id is not None else None)
+
+def get_user_context(email: str) -> Optional[UserContext]:
+    """The cached UserContext of `email`, read from the database on a miss."""
+    cache = get_user_context_cache()
+    context = cache.get(email)
+    if context is not None:
+        return context
+
+    generation = cache.generation
+    context = load_user_context(email)
+    if context is not None:
+        cache.put(email, context, generation)
+    return context
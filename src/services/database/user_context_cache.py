@@ -0,0 +1,66 @@
+from collections import OrderedDict
+from typing import Optional, Tuple
+import os
+import threading
+import time
+
+# Seconds a resolved user and their settings are served from memory
+USER_CONTEXT_TTL = float(os.getenv("USER_CONTEXT_TTL", "30"))
+USER_CONTEXT_CACHE_SIZE = 1024
+
+class UserContext:
+    """A User and their UserSetting, or None when they have none yet, read in one query."""
+
+    def __init__(self, user, user_setting):
+        self.user = user
+        self.user_setting = user_setting
+
+class UserContextCache:
+    """
+    Short-lived cache of UserContext by email. Writes to a user or their
+    settings invalidate it explicitly, and every invalidation bumps a
+    generation so a lookup that raced one is never stored. The TTL bounds how
+    stale an entry can get from writes made by another process.
+    """
+
+    def __init__(self, ttl: float = USER_CONTEXT_TTL, max_entries: int = USER_CONTEXT_CACHE_SIZE):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.contexts: "OrderedDict[str, Tuple[float, UserContext]]" = OrderedDict()
+        self.generation = 0
+        self.lock = threading.Lock()
+
+    def get(self, email: str) -> Optional[UserContext]:
+        cached = self.contexts.get(email)
+        if cached is None or cached[0] < time.monotonic():
+            return None
+        return cached[1]
+
+    def put(self, email: str, context: UserContext, generation: int) -> None:
+        if self.ttl <= 0:
+            return
+        with self.lock:
+            if generation != self.generation:
+                return
+            self.contexts.pop(email, None)
+            self.contexts[email] = (time.monotonic() + self.ttl, context)
+            while len(self.contexts) > self.max_entries:
+                self.contexts.popitem(last=False)
+
+    def invalidate(self, email: Optional[str] = None, user_id: Optional[int] = None) -> None:
+        """Forget one user, by email or id, or everyone when neither is given."""
+        with self.lock:
+            self.generation += 1
+            if email is None and user_id is None:
+                self.contexts.clear()
+                return
+            for key in [key for key, (_, context) in self.contexts.items() if key == email or context.user.id == user_id]:
+                del self.contexts[key]
+
+_user_context_cache = None
+
+def get_user_context_cache() -> UserContextCache:
+    global _user_context_cache
+    if _user_context_cache is None:
+        _user_context_cache = UserContextCache()
+    return _user_context_cache
@@ -1,12 +1,17 @@
+from dataclasses import dataclass
 from datetime import datetime, timezone
+from typing import Optional
 from src.services.database.db_service import get_connection
+from src.services.database.row_mapper import row_mapper
+from src.services.database.user_context_cache import get_user_context_cache
 
+@dataclass(slots=True)
 class UserSetting:
-    def __init__(self, row, cursor):
-        if row is not None:
-            # Set each column as an attribute with its name from the cursor description
-            for idx, col in enumerate(cursor.description):
-                setattr(self, col[0], row[idx])
+    id: Optional[int] = None
+    user_id: Optional[int] = None
+    hard_drive_path_selection: Optional[str] = None
+    created_at: Optional[str] = None
+    updated_at: Optional[str] = None
 
 def get_user_setting(id: str):
     with get_connection() as conn:
@@ -26,7 +31,19 @@ def get_user_setting(id: str):
         if user_setting is None:
             return None
 
-        return UserSetting(user_setting, cursor)
+        return row_mapper(UserSetting, cursor.description)(user_setting)
+
+def get_drive_path_selections():
+    with get_connection() as conn:
+        cursor = conn.cursor()
+
+        cursor.execute("""
+                    SELECT DISTINCT us.hard_drive_path_selection
+                    FROM user_settings AS us
+                    WHERE us.hard_drive_path_selection IS NOT NULL
+                """)
+
+        return [row[0] for row in cursor.fetchall()]
 
 def create_user_setting(parameters):
     with get_connection() as conn:
@@ -41,6 +58,8 @@ def create_user_setting(parameters):
 
         conn.commit()
 
+    get_user_context_cache().invalidate(user_id=parameters["user_id"])
+
 def update_user_setting(parameters):
     with get_connection() as conn:
         cursor = conn.cursor()
@@ -54,4 +73,6 @@ def update_user_setting(parameters):
                 parameters
                 )
         
-        conn.commit()
\ No newline at end of file
+        conn.commit()
+
+    get_user_context_cache().invalidate(user_id=parameters["user_id"])
@@ -1,12 +1,18 @@
+from dataclasses import dataclass
 from datetime import datetime, timezone
+from typing import Optional
 from src.services.database.db_service import get_connection
+from src.services.database.row_mapper import row_mapper
+from src.services.database.user_context_cache import get_user_context_cache
 
+@dataclass(slots=True)
 class User:
-    def __init__(self, row, cursor):
-        if row is not None:
-            # Set each column as an attribute with its name from the cursor description
-            for idx, col in enumerate(cursor.description):
-                setattr(self, col[0], row[idx])
+    id: Optional[int] = None
+    email: Optional[str] = None
+    name: Optional[str] = None
+    is_admin: Optional[bool] = None
+    is_guest: Optional[bool] = None
+    created_at: Optional[str] = None
 
 def get_user_by_id(id: str):
     with get_connection() as conn:
@@ -26,7 +32,7 @@ def get_user_by_id(id: str):
         if user is None:
             return None
 
-        return User(user, cursor)
+        return row_mapper(User, cursor.description)(user)
 
 def get_user_by_email(email: str):
     with get_connection() as conn:
@@ -46,7 +52,18 @@ def get_user_by_email(email: str):
         if user is None:
             return None
 
-        return User(user, cursor)
+        return row_mapper(User, cursor.description)(user)
+
+def get_user_emails():
+    with get_connection() as conn:
+        cursor = conn.cursor()
+
+        cursor.execute("""
+                        SELECT u.email
+                        FROM users AS u
+                    """)
+
+        return [row[0] for row in cursor.fetchall()]
 
 def create_user(parameters):
     with get_connection() as conn:
@@ -73,4 +90,6 @@ def update_user(parameters):
                 parameters
                 )
         
-        conn.commit()
\ No newline at end of file
+        conn.commit()
+
+    get_user_context_cache().invalidate(email=parameters["email"])
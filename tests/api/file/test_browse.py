@@ -1,136 +1,166 @@
-from unittest.mock import patch, MagicMock
+import os
+import pytest
+from unittest.mock import patch
+
+@pytest.fixture
+def drive(tmp_path, files_db):
+    """A drive with category folders, mounted as the external drive."""
+    layout = {
+        "photos": ["photo1.jpg", "photo2.png"],
+        "videos": ["video1.mp4"],
+        "documents": ["doc1.pdf"],
+        "audio": [],
+        "zip": [],
+        "others": ["other.txt"],
+    }
+    for category, filenames in layout.items():
+        (tmp_path / category).mkdir()
+        for filename in filenames:
+            (tmp_path / category / filename).write_bytes(b"x" * 1024)
+            os.utime(tmp_path / category / filename, (1640995200, 1640995200))
+        os.utime(tmp_path / category, (1640995200, 1640995200))
+
+    with patch("src.api.file.browse.get_external_drive_path", return_value=str(tmp_path)):
+        yield tmp_path
 
 class TestFileBrowse:
-    def test_browse_all_files(self, test_client, bypass_auth):
-        with patch("src.api.file.browse.get_external_drive_path", return_value="/fake_drive/"), \
-             patch("src.api.file.browse.os.path.exists", return_value=True), \
-             patch("src.api.file.browse.os.path.isdir", return_value=False), \
-             patch("src.api.file.browse.os.listdir") as mock_listdir, \
-             patch("src.api.file.browse.os.stat") as mock_stat, \
-             patch("src.api.file.browse.mimetypes.guess_type", return_value=("image/jpeg", None)):
-            
-            # Mock file listing
-            mock_listdir.side_effect = [
-                ["photo1.jpg", "photo2.png"],  # photos folder
-                ["video1.mp4"],  # videos folder
-                ["doc1.pdf"],  # documents folder
-                [],  # audio folder (empty)
-                [],  # zip folder (empty)
-                ["other.txt"]  # others folder
-            ]
-            
-            # Mock file stats
-            mock_stat.return_value = MagicMock(st_size=1024, st_mtime=1640995200)  # 2022-01-01
-            
-            response = test_client.get("/file/browse/")
-            assert response.status_code == 200
-            
-            data = response.json()
-            assert "files" in data
-            assert "total_count" in data
-            assert data["total_count"] == 5  # 2 photos + 1 video + 1 doc + 1 other
-            
-            # Check that files have required fields
-            for file_info in data["files"]:
-                assert "name" in file_info
-                assert "size" in file_info
-                assert "type" in file_info
-                assert "modified" in file_info
-                assert "category" in file_info
-
-    def test_browse_by_category(self, test_client, bypass_auth):
-        with patch("src.api.file.browse.get_external_drive_path", return_value="/fake_drive/"), \
-             patch("src.api.file.browse.os.path.exists", return_value=True), \
-             patch("src.api.file.browse.os.path.isdir", return_value=False), \
-             patch("src.api.file.browse.os.listdir", return_value=["photo1.jpg", "photo2.png"]), \
-             patch("src.api.file.browse.os.stat") as mock_stat, \
-             patch("src.api.file.browse.mimetypes.guess_type", return_value=("image/jpeg", None)):
-            
-            mock_stat.return_value = MagicMock(st_size=1024, st_mtime=1640995200)
-            
-            response = test_client.get("/file/browse/?category=photos")
-            assert response.status_code == 200
-            
-            data = response.json()
-            assert data["total_count"] == 2
-            
-            # All files should be from photos category
-            for file_info in data["files"]:
-                assert file_info["category"] == "photos"
-
-    def test_browse_invalid_category(self, test_client, bypass_auth):
-        with patch("src.api.file.browse.get_external_drive_path", return_value="/fake_drive/"):
-            response = test_client.get("/file/browse/?category=invalid")
-            assert response.status_code == 200
-            
-            data = response.json()
-            assert data["total_count"] == 0
-            assert data["files"] == []
+    def test_browse_all_files(self, test_client, bypass_auth, drive):
+        response = test_client.get("/file/browse/")
+        assert response.status_code == 200
+
+        data = response.json()
+        assert "files" in data
+        assert "total_count" in data
+        assert data["total_count"] == 5  # 2 photos + 1 video + 1 doc + 1 other
+
+        # Check that files have required fields
+        for file_info in data["files"]:
+            assert file_info["size"] == 1024
+            assert "type" in file_info
+            assert "modified" in file_info
+            assert "category" in file_info
 
-    def test_browse_empty_directory(self, test_client, bypass_auth):
-        with patch("src.api.file.browse.get_external_drive_path", return_value="/fake_drive/"), \
-             patch("src.api.file.browse.os.path.exists", return_value=True), \
-             patch("src.api.file.browse.os.listdir", return_value=[]):
-            
+    def test_browse_by_category(self, test_client, bypass_auth, drive):
+        response = test_client.get("/file/browse/?category=photos")
+        assert response.status_code == 200
+
+        data = response.json()
+        assert data["total_count"] == 2
+        assert sorted(file_info["name"] for file_info in data["files"]) == ["photo1.jpg", "photo2.png"]
+        assert {file_info["type"] for file_info in data["files"]} == {"image/jpeg", "image/png"}
+
+        # All files should be from photos category
+        for file_info in data["files"]:
+            assert file_info["category"] == "photos"
+
+    def test_browse_filters_by_size_and_date(self, test_client, bypass_auth, drive):
+        (drive / "videos" / "big.mp4").write_bytes(b"x" * 4096)
+        os.utime(drive / "videos" / "big.mp4", (1688169600, 1688169600))  # 2023-07-01
+
+        response = test_client.get(
+            "/file/browse/?category=videos&min_size=2048&modified_after=2023-01-01T00:00:00&modified_before=2024-01-01T00:00:00"
+        )
+        assert response.status_code == 200
+
+        data = response.json()
+        assert [file_info["name"] for file_info in data["files"]] == ["big.mp4"]
+        assert data["files"][0]["category"] == "videos"
+
+    @pytest.mark.parametrize("sort,order,expected", [
+        ("name", "asc", ["a.jpg", "B.jpg", "c.jpg"]),
+        ("name", "desc", ["c.jpg", "B.jpg", "a.jpg"]),
+        ("size", "asc", ["c.jpg", "a.jpg", "B.jpg"]),
+        ("mtime", "desc", ["a.jpg", "B.jpg", "c.jpg"]),
+    ])
+    def test_browse_sorting(self, test_client, bypass_auth, drive, sort, order, expected):
+        for name, size, mtime in [("a.jpg", 2, 300), ("B.jpg", 3, 200), ("c.jpg", 1, 100)]:
+            (drive / "audio" / name).write_bytes(b"x" * size)
+            os.utime(drive / "audio" / name, (mtime, mtime))
+
+        response = test_client.get(f"/file/browse/?category=audio&sort={sort}&order={order}")
+        assert response.status_code == 200
+        assert [file_info["name"] for file_info in response.json()["files"]] == expected
+
+    def test_browse_reflects_changes_since_indexing(self, test_client, bypass_auth, drive):
+        assert test_client.get("/file/browse/?category=photos").json()["total_count"] == 2
+
+        (drive / "photos" / "photo1.jpg").rename(drive / "photos" / "renamed.jpg")
+        (drive / "photos" / "photo3.jpg").write_bytes(b"x")
+
+        data = test_client.get("/file/browse/?category=photos").json()
+        assert sorted(file_info["name"] for file_info in data["files"]) == ["photo2.png", "photo3.jpg", "renamed.jpg"]
+
+    def test_browse_serves_settled_folders_from_the_index(self, test_client, bypass_auth, drive):
+        assert test_client.get("/file/browse/?category=photos").json()["total_count"] == 2
+
+        with patch("src.services.api.file.directory_scanner.os.scandir") as mock_scandir:
             response = test_client.get("/file/browse/?category=photos")
-            assert response.status_code == 200
-            
-            data = response.json()
-            assert data["total_count"] == 0
-            assert data["files"] == []
+
+        mock_scandir.assert_not_called()
+        assert response.json()["total_count"] == 2
+
+    def test_browse_invalid_category(self, test_client, bypass_auth, drive):
+        response = test_client.get("/file/browse/?category=invalid")
+        assert response.status_code == 200
+
+        data = response.json()
+        assert data["total_count"] == 0
+        assert data["files"] == []
+
+    def test_browse_empty_directory(self, test_client, bypass_auth, drive):
+        response = test_client.get("/file/browse/?category=audio")
+        assert response.status_code == 200
+
+        data = response.json()
+        assert data["total_count"] == 0
+        assert data["files"] == []
 
     def test_browse_nonexistent_drive(self, test_client, bypass_auth):
         with patch("src.api.file.browse.get_external_drive_path", return_value=None):
             response = test_client.get("/file/browse/")
             assert response.status_code == 200
-            
-            data = response.json()
-            assert data["total_count"] == 0
-            assert data["files"] == []
 
-    def test_browse_nonexistent_folder(self, test_client, bypass_auth):
-        with patch("src.api.file.browse.get_external_drive_path", return_value="/fake_drive/"), \
-             patch("src.api.file.browse.os.path.exists", return_value=False):
-            
-            response = test_client.get("/file/browse/?category=photos")
-            assert response.status_code == 200
-            
             data = response.json()
             assert data["total_count"] == 0
             assert data["files"] == []
 
-    def test_browse_file_access_error(self, test_client, bypass_auth):
-        with patch("src.api.file.browse.get_external_drive_path", return_value="/fake_drive/"), \
-             patch("src.api.file.browse.os.path.exists", return_value=True), \
-             patch("src.api.file.browse.os.listdir", return_value=["photo1.jpg"]), \
-             patch("src.api.file.browse.os.stat", side_effect=OSError("Permission denied")):
-            
+    def test_browse_nonexistent_folder(self, test_client, bypass_auth, drive):
+        (drive / "photos" / "photo1.jpg").unlink()
+        (drive / "photos" / "photo2.png").unlink()
+        (drive / "photos").rmdir()
+
+        response = test_client.get("/file/browse/?category=photos")
+        assert response.status_code == 200
+
+        data = response.json()
+        assert data["total_count"] == 0
+        assert data["files"] == []
+
+    def test_browse_file_access_error(self, test_client, bypass_auth, drive):
+        # A dangling symlink cannot be stat'ed and is skipped
+        (drive / "photos" / "broken.jpg").symlink_to(drive / "missing.jpg")
+
+        response = test_client.get("/file/browse/?category=photos")
+        assert response.status_code == 200
+
+        data = response.json()
+        assert data["total_count"] == 2
+        assert "broken.jpg" not in [file_info["name"] for file_info in data["files"]]
+
+    def test_browse_folder_access_error(self, test_client, bypass_auth, drive):
+        with patch("src.services.api.file.directory_scanner.os.scandir", side_effect=PermissionError("Permission denied")):
             response = test_client.get("/file/browse/?category=photos")
-            assert response.status_code == 200
-            
-            data = response.json()
-            assert data["total_count"] == 0
-            assert data["files"] == []
 
-    def test_browse_filters_hidden_files(self, test_client, bypass_auth):
-        with patch("src.api.file.browse.get_external_drive_path", return_value="/fake_drive/"), \
-             patch("src.api.file.browse.os.path.exists", return_value=True), \
-             patch("src.api.file.browse.os.path.isdir", return_value=False), \
-             patch("src.api.file.browse.os.listdir", return_value=["photo1.jpg", "._photo1.jpg", ".hidden.txt", "normal.txt"]), \
-             patch("src.api.file.browse.os.stat") as mock_stat, \
-             patch("src.api.file.browse.mimetypes.guess_type", return_value=("text/plain", None)):
-            
-            mock_stat.return_value = MagicMock(st_size=1024, st_mtime=1640995200)
-            
-            response = test_client.get("/file/browse/?category=others")
-            assert response.status_code == 200
-            
-            data = response.json()
-            assert data["total_count"] == 2  # Only photo1.jpg and normal.txt
-            
-            # Check that hidden files are filtered out
-            file_names = [file_info["name"] for file_info in data["files"]]
-            assert "photo1.jpg" in file_names
-            assert "normal.txt" in file_names
-            assert "._photo1.jpg" not in file_names
-            assert ".hidden.txt" not in file_names
+        assert response.status_code == 200
+        assert response.json() == {"files": [], "total_count": 0}
+
+    def test_browse_filters_hidden_files_and_directories(self, test_client, bypass_auth, drive):
+        for filename in ["._photo1.jpg", ".hidden.txt", "normal.txt"]:
+            (drive / "others" / filename).write_bytes(b"x")
+        (drive / "others" / "nested").mkdir()
+
+        response = test_client.get("/file/browse/?category=others")
+        assert response.status_code == 200
+
+        data = response.json()
+        assert sorted(file_info["name"] for file_info in data["files"]) == ["normal.txt", "other.txt"]
@@ -0,0 +1,72 @@
+import hashlib
+import pytest
+from types import SimpleNamespace
+from unittest.mock import patch
+from src.services.database.user_context import UserContext
+
+def digest(name, content):
+    return {"name": name, "size": len(content), "hash": hashlib.sha256(content).hexdigest()}
+
+@pytest.fixture
+def drive(tmp_path):
+    """tmp_path as the user's drive, with an empty hash index."""
+    with patch('src.api.auth.dependencies.get_user_context', return_value=UserContext(SimpleNamespace(id=1), SimpleNamespace(hard_drive_path_selection=str(tmp_path)))), \
+         patch('src.services.api.file.hash_cache.get_file_hashes_by_paths', return_value=[]), \
+         patch('src.services.api.file.hash_cache.upsert_file_hashes'):
+        yield tmp_path
+
+class TestHave:
+    def test_only_missing_files_are_returned(self, test_client, bypass_auth, drive):
+        (drive / "same.jpg").write_bytes(b"same")
+        (drive / "edited.jpg").write_bytes(b"old!")
+        (drive / "resized.jpg").write_bytes(b"small")
+        files = [
+            digest("same.jpg", b"same"),
+            digest("edited.jpg", b"new!"),
+            digest("resized.jpg", b"much larger"),
+            digest("new.jpg", b"new"),
+        ]
+
+        with patch('src.services.api.file.hash_cache.hash_file', return_value=files[0]["hash"]) as mock_hash:
+            response = test_client.post("/file/have/", json={"file_path_location": str(drive), "files": files})
+
+        assert response.status_code == 200
+        assert [file["name"] for file in response.json()["missing"]] == ["edited.jpg", "resized.jpg", "new.jpg"]
+        assert response.json()["present_count"] == 1
+        # Files whose size differs are never read
+        assert mock_hash.call_count == 2
+
+    def test_uppercase_hash_matches(self, test_client, bypass_auth, drive):
+        (drive / "a.jpg").write_bytes(b"photo")
+        file = digest("a.jpg", b"photo")
+        file["hash"] = file["hash"].upper()
+
+        response = test_client.post("/file/have/", json={"file_path_location": "", "files": [file]})
+
+        assert response.json() == {"missing": [], "present_count": 1}
+
+    def test_folders_and_invalid_names_are_missing(self, test_client, bypass_auth, drive):
+        (drive / "folder").mkdir()
+        files = [digest("folder", b""), digest("..", b"")]
+
+        response = test_client.post("/file/have/", json={"file_path_location": str(drive), "files": files})
+
+        assert len(response.json()["missing"]) == 2
+
+    def test_location_outside_of_drive(self, test_client, bypass_auth, drive):
+        response = test_client.post("/file/have/", json={"file_path_location": "..", "files": []})
+
+        assert response.status_code == 403
+
+    def test_missing_location(self, test_client, bypass_auth, drive):
+        response = test_client.post("/file/have/", json={"file_path_location": "missing", "files": []})
+
+        assert response.status_code == 404
+
+    def test_invalid_hash(self, test_client, bypass_auth, drive):
+        response = test_client.post("/file/have/", json={
+            "file_path_location": "",
+            "files": [{"name": "a.jpg", "size": 1, "hash": "not-a-hash"}],
+        })
+
+        assert response.status_code == 422
@@ -1,4 +1,31 @@
+import asyncio
+import pytest
 from unittest.mock import patch, MagicMock
+from src.api.file.list_mounted_drives import drive_events
+from src.services.api.file.drive_inventory import DriveInventory
+
+@pytest.fixture(autouse=True)
+def drive_inventory():
+    """A fresh inventory per test, with no background thread, so each request samples the patched psutil."""
+    inventory = DriveInventory(interval=0)
+    with patch("src.services.api.file.drive_inventory._drive_inventory", inventory):
+        yield inventory
+
+def partition(device, mountpoint, fstype="ext4", opts="rw"):
+    mock_partition = MagicMock()
+    mock_partition.device = device
+    mock_partition.mountpoint = mountpoint
+    mock_partition.fstype = fstype
+    mock_partition.opts = opts
+    return mock_partition
+
+def usage(total, used):
+    mock_usage = MagicMock()
+    mock_usage.total = total
+    mock_usage.used = used
+    mock_usage.free = total - used
+    mock_usage.percent = round(used / total * 100, 1)
+    return mock_usage
 
 class TestListMountedDrives:
     def test_list_mounted_drives_success(self, test_client, bypass_auth):
@@ -28,8 +55,8 @@ class TestListMountedDrives:
         mock_usage2.free = 1000000000  # 1GB
         mock_usage2.percent = 50.0
         
-        with patch("src.api.file.list_mounted_drives.psutil.disk_partitions", return_value=[mock_partition1, mock_partition2]), \
-             patch("src.api.file.list_mounted_drives.psutil.disk_usage") as mock_disk_usage, \
+        with patch("psutil.disk_partitions", return_value=[mock_partition1, mock_partition2]), \
+             patch("psutil.disk_usage") as mock_disk_usage, \
              patch("src.api.file.list_mounted_drives.bytes_to_human_readable") as mock_bytes_to_human:
             
             # Configure mock return values
@@ -84,8 +111,8 @@ class TestListMountedDrives:
         mock_usage.free = 500000000
         mock_usage.percent = 50.0
         
-        with patch("src.api.file.list_mounted_drives.psutil.disk_partitions", return_value=[mock_partition_apfs, mock_partition_ext4]), \
-             patch("src.api.file.list_mounted_drives.psutil.disk_usage", return_value=mock_usage), \
+        with patch("psutil.disk_partitions", return_value=[mock_partition_apfs, mock_partition_ext4]), \
+             patch("psutil.disk_usage", return_value=mock_usage), \
              patch("src.api.file.list_mounted_drives.bytes_to_human_readable") as mock_bytes_to_human:
             
             mock_bytes_to_human.side_effect = ["1.00 GB", "500.00 MB", "500.00 MB"]
@@ -109,8 +136,8 @@ class TestListMountedDrives:
         mock_partition.fstype = "ext4"
         mock_partition.opts = "rw"
         
-        with patch("src.api.file.list_mounted_drives.psutil.disk_partitions", return_value=[mock_partition]), \
-             patch("src.api.file.list_mounted_drives.psutil.disk_usage", side_effect=PermissionError("Permission denied")):
+        with patch("psutil.disk_partitions", return_value=[mock_partition]), \
+             patch("psutil.disk_usage", side_effect=PermissionError("Permission denied")):
             
             response = test_client.get("/file/list_mounted_drives/")
             assert response.status_code == 200
@@ -126,8 +153,8 @@ class TestListMountedDrives:
         mock_partition.fstype = "ext4"
         mock_partition.opts = "rw"
         
-        with patch("src.api.file.list_mounted_drives.psutil.disk_partitions", return_value=[mock_partition]), \
-             patch("src.api.file.list_mounted_drives.psutil.disk_usage", side_effect=Exception("Some error")):
+        with patch("psutil.disk_partitions", return_value=[mock_partition]), \
+             patch("psutil.disk_usage", side_effect=Exception("Some error")):
             
             response = test_client.get("/file/list_mounted_drives/")
             assert response.status_code == 200
@@ -137,9 +164,57 @@ class TestListMountedDrives:
             assert data == []
 
     def test_list_mounted_drives_empty_partitions(self, test_client, bypass_auth):
-        with patch("src.api.file.list_mounted_drives.psutil.disk_partitions", return_value=[]):
+        with patch("psutil.disk_partitions", return_value=[]):
             response = test_client.get("/file/list_mounted_drives/")
             assert response.status_code == 200
             
             data = response.json()
             assert data == []
+
+    def test_list_mounted_drives__served_from_the_snapshot(self, test_client, bypass_auth, drive_inventory):
+        drive_inventory.interval = 3600
+
+        with patch("psutil.disk_partitions", return_value=[partition("/dev/sda1", "/mnt/drive1")]) as mock_partitions, \
+             patch("psutil.disk_usage", return_value=usage(1000, 500)):
+            first = test_client.get("/file/list_mounted_drives/").json()
+            second = test_client.get("/file/list_mounted_drives/").json()
+
+        assert first == second
+        assert mock_partitions.call_count == 1
+
+    def test_list_mounted_drives__filters_pseudo_filesystems(self, test_client, bypass_auth):
+        partitions = [
+            partition("proc", "/proc", "proc"),
+            partition("tmpfs", "/run", "tmpfs"),
+            partition("overlay", "/", "overlay"),
+            partition("/dev/sda1", "/media/pi/drive1", "exfat"),
+        ]
+        with patch("psutil.disk_partitions", return_value=partitions), \
+             patch("psutil.disk_usage", return_value=usage(1000, 500)) as mock_disk_usage:
+            data = test_client.get("/file/list_mounted_drives/").json()
+
+        assert [drive["mountpoint"] for drive in data] == ["/media/pi/drive1"]
+        mock_disk_usage.assert_called_once_with("/media/pi/drive1")
+
+    def test_events__current_list_then_changes(self, drive_inventory):
+        async def read_events():
+            with patch("psutil.disk_partitions", return_value=[partition("/dev/sda1", "/mnt/drive1")]), \
+                 patch("psutil.disk_usage", return_value=usage(1000, 500)):
+                events = drive_events(drive_inventory)
+                first = await anext(events)
+
+                # The same list is not sent again
+                await asyncio.to_thread(drive_inventory.sample)
+                with patch("psutil.disk_usage", return_value=usage(1000, 750)):
+                    await asyncio.to_thread(drive_inventory.sample)
+                second = await asyncio.wait_for(anext(events), timeout=5)
+                await events.aclose()
+            return first, second
+
+        first, second = asyncio.run(read_events())
+
+        assert first.startswith("id: 1\nevent: drives\ndata: ")
+        assert '"percent_used": "50.0%"' in first
+        assert second.startswith("id: 2\nevent: drives\ndata: ")
+        assert '"percent_used": "75.0%"' in second
+        assert drive_inventory.subscribers == set()
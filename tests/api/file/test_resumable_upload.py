@@ -0,0 +1,260 @@
+import base64
+import pytest
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import patch
+from src.services.database.user_context import UserContext
+
+CONTENT = bytes(range(256)) * 16
+
+def timestamp(age=timedelta(0)):
+    return (datetime.now(timezone.utc) - age).strftime("%Y-%m-%d %H:%M:%S")
+
+def encode_metadata(**metadata):
+    return ",".join(f"{key} {base64.b64encode(value.encode()).decode()}" for key, value in metadata.items())
+
+@pytest.fixture
+def session_store(tmp_path):
+    """In-memory stand-in for the upload_sessions table, with tmp_path as the user's drive."""
+    sessions = {}
+
+    def create(parameters):
+        sessions[parameters["id"]] = {**parameters, "upload_offset": 0, "updated_at": timestamp()}
+        return SimpleNamespace(**sessions[parameters["id"]])
+
+    def get(id):
+        return SimpleNamespace(**sessions[id]) if id in sessions else None
+
+    def get_expired(updated_before):
+        return [SimpleNamespace(**session) for session in sessions.values() if session["updated_at"] < updated_before]
+
+    def update(parameters):
+        if sessions[parameters["id"]]["upload_offset"] != parameters["expected_offset"]:
+            return False
+        sessions[parameters["id"]].update(upload_offset=parameters["upload_offset"], updated_at=timestamp())
+        return True
+
+    def delete(id):
+        sessions.pop(id, None)
+
+    with patch('src.api.file.resumable_upload.create_upload_session', side_effect=create), \
+         patch('src.api.file.resumable_upload.get_upload_session', side_effect=get), \
+         patch('src.api.file.resumable_upload.get_expired_upload_sessions', side_effect=get_expired), \
+         patch('src.api.file.resumable_upload.update_upload_offset', side_effect=update), \
+         patch('src.api.file.resumable_upload.delete_upload_session', side_effect=delete), \
+         patch('src.api.file.resumable_upload.get_user_context', return_value=UserContext(SimpleNamespace(id=1), SimpleNamespace(hard_drive_path_selection=str(tmp_path)))):
+        yield sessions
+
+def create_upload(test_client, tmp_path, length=len(CONTENT), filename="movie.mp4"):
+    return test_client.post("/file/resumable_upload/", headers={
+        "Tus-Resumable": "1.0.0",
+        "Upload-Length": str(length),
+        "Upload-Metadata": encode_metadata(filename=filename, file_path_location=str(tmp_path)),
+    })
+
+def patch_chunk(test_client, location, offset, body):
+    return test_client.patch(location, content=body, headers={
+        "Tus-Resumable": "1.0.0",
+        "Upload-Offset": str(offset),
+        "Content-Type": "application/offset+octet-stream",
+    })
+
+class TestResumableUpload:
+    def test_options_advertises_tus(self, test_client, bypass_auth):
+        response = test_client.options("/file/resumable_upload/")
+
+        assert response.status_code == 204
+        assert response.headers["tus-version"] == "1.0.0"
+        assert "creation" in response.headers["tus-extension"]
+        assert "expiration" in response.headers["tus-extension"]
+
+    def test_create_session(self, test_client, bypass_auth, session_store, tmp_path):
+        response = create_upload(test_client, tmp_path)
+
+        assert response.status_code == 201
+        upload_id = response.json()["upload_id"]
+        assert response.headers["location"] == f"/file/resumable_upload/{upload_id}"
+        assert response.headers["upload-offset"] == "0"
+        assert "upload-expires" in response.headers
+        assert session_store[upload_id]["owner_email"] == "test@gmail.com"
+        assert (tmp_path / ".uploads" / f"{upload_id}.part").exists()
+
+    def test_create_session_strips_directories_from_filename(self, test_client, bypass_auth, session_store, tmp_path):
+        response = create_upload(test_client, tmp_path, filename="../../etc/passwd")
+
+        assert response.status_code == 201
+        assert session_store[response.json()["upload_id"]]["filename"] == "passwd"
+
+    def test_create_session_requires_existing_directory(self, test_client, bypass_auth, session_store, tmp_path):
+        response = create_upload(test_client, tmp_path / "missing")
+
+        assert response.status_code == 400
+        assert response.json() == {"detail": "Upload directory not found"}
+
+    def test_create_session_outside_of_drive_is_forbidden(self, test_client, bypass_auth, session_store, tmp_path):
+        response = create_upload(test_client, tmp_path / "..")
+
+        assert response.status_code == 403
+        assert session_store == {}
+
+    def test_create_session_relative_to_drive(self, test_client, bypass_auth, session_store, tmp_path):
+        (tmp_path / "photos").mkdir()
+
+        response = create_upload(test_client, "photos")
+
+        assert response.status_code == 201
+        assert session_store[response.json()["upload_id"]]["file_path_location"] == str((tmp_path / "photos").resolve())
+
+    def test_create_session_requires_length(self, test_client, bypass_auth, session_store, tmp_path):
+        response = test_client.post("/file/resumable_upload/", headers={
+            "Upload-Metadata": encode_metadata(filename="a.jpg", file_path_location=str(tmp_path)),
+        })
+
+        assert response.status_code == 400
+
+    def test_upload_in_chunks_and_finalize(self, test_client, bypass_auth, session_store, tmp_path):
+        location = create_upload(test_client, tmp_path).headers["location"]
+
+        response = patch_chunk(test_client, location, 0, CONTENT[:1000])
+        assert response.status_code == 204
+        assert response.headers["upload-offset"] == "1000"
+
+        response = test_client.head(location)
+        assert response.status_code == 200
+        assert response.headers["upload-offset"] == "1000"
+        assert response.headers["upload-length"] == str(len(CONTENT))
+
+        response = patch_chunk(test_client, location, 1000, CONTENT[1000:])
+        assert response.status_code == 204
+        assert response.headers["upload-offset"] == str(len(CONTENT))
+
+        assert (tmp_path / "movie.mp4").read_bytes() == CONTENT
+        assert session_store == {}
+        assert list((tmp_path / ".uploads").iterdir()) == []
+
+    def test_status_as_json(self, test_client, bypass_auth, session_store, tmp_path):
+        location = create_upload(test_client, tmp_path).headers["location"]
+        patch_chunk(test_client, location, 0, CONTENT[:10])
+
+        response = test_client.get(location)
+        assert response.status_code == 200
+        assert response.json()["upload_offset"] == 10
+
+    def test_mismatched_offset_is_rejected(self, test_client, bypass_auth, session_store, tmp_path):
+        location = create_upload(test_client, tmp_path).headers["location"]
+        patch_chunk(test_client, location, 0, CONTENT[:100])
+
+        response = patch_chunk(test_client, location, 50, CONTENT[50:150])
+        assert response.status_code == 409
+        assert response.headers["upload-offset"] == "100"
+
+    def test_uncommitted_tail_is_overwritten(self, test_client, bypass_auth, session_store, tmp_path):
+        location = create_upload(test_client, tmp_path).headers["location"]
+        upload_id = location.rsplit("/", 1)[1]
+        patch_chunk(test_client, location, 0, CONTENT[:100])
+
+        # Simulate bytes written after the last committed offset, e.g. before a crash
+        with open(tmp_path / ".uploads" / f"{upload_id}.part", "ab") as part:
+            part.write(b"garbage")
+
+        patch_chunk(test_client, location, 100, CONTENT[100:])
+        assert (tmp_path / "movie.mp4").read_bytes() == CONTENT
+
+    def test_body_larger_than_length_is_rejected(self, test_client, bypass_auth, session_store, tmp_path):
+        location = create_upload(test_client, tmp_path, length=10).headers["location"]
+
+        response = patch_chunk(test_client, location, 0, CONTENT[:20])
+        assert response.status_code == 413
+
+    def test_wrong_content_type(self, test_client, bypass_auth, session_store, tmp_path):
+        location = create_upload(test_client, tmp_path).headers["location"]
+
+        response = test_client.patch(location, content=b"abc", headers={"Upload-Offset": "0"})
+        assert response.status_code == 415
+
+    def test_unsupported_tus_version(self, test_client, bypass_auth, session_store, tmp_path):
+        location = create_upload(test_client, tmp_path).headers["location"]
+
+        response = test_client.patch(location, content=b"abc", headers={
+            "Tus-Resumable": "0.2.2",
+            "Upload-Offset": "0",
+            "Content-Type": "application/offset+octet-stream",
+        })
+        assert response.status_code == 412
+
+    def test_other_users_session_is_not_found(self, test_client, bypass_auth, session_store, tmp_path):
+        upload_id = create_upload(test_client, tmp_path).json()["upload_id"]
+        session_store[upload_id]["owner_email"] = "someone@else.com"
+
+        response = test_client.head(f"/file/resumable_upload/{upload_id}")
+        assert response.status_code == 404
+
+    def test_terminate(self, test_client, bypass_auth, session_store, tmp_path):
+        location = create_upload(test_client, tmp_path).headers["location"]
+        patch_chunk(test_client, location, 0, CONTENT[:10])
+
+        response = test_client.delete(location)
+        assert response.status_code == 204
+        assert session_store == {}
+        assert list((tmp_path / ".uploads").iterdir()) == []
+
+    def test_concurrent_offset_change_is_rejected(self, test_client, bypass_auth, session_store, tmp_path):
+        location = create_upload(test_client, tmp_path).headers["location"]
+        upload_id = location.rsplit("/", 1)[1]
+
+        # Another process commits bytes between our read of the session and our update
+        async def stream_then_advance(self):
+            session_store[upload_id]["upload_offset"] = 10
+            yield CONTENT[:100]
+
+        with patch('starlette.requests.Request.stream', stream_then_advance):
+            response = patch_chunk(test_client, location, 0, CONTENT[:100])
+
+        assert response.status_code == 409
+        assert session_store[upload_id]["upload_offset"] == 10
+
+    def test_failed_write_is_not_committed(self, test_client, bypass_auth, session_store, tmp_path):
+        location = create_upload(test_client, tmp_path).headers["location"]
+        upload_id = location.rsplit("/", 1)[1]
+
+        with patch('src.api.file.resumable_upload.sync_and_close', side_effect=OSError("disk full")), \
+             pytest.raises(OSError):
+            patch_chunk(test_client, location, 0, CONTENT[:100])
+
+        assert session_store[upload_id]["upload_offset"] == 0
+
+    def test_finalize_keeps_existing_file(self, test_client, bypass_auth, session_store, tmp_path):
+        (tmp_path / "movie.mp4").write_bytes(b"original")
+        location = create_upload(test_client, tmp_path).headers["location"]
+
+        patch_chunk(test_client, location, 0, CONTENT)
+
+        assert (tmp_path / "movie.mp4").read_bytes() == b"original"
+        assert (tmp_path / "movie (1).mp4").read_bytes() == CONTENT
+
+    def test_expired_session_is_not_found(self, test_client, bypass_auth, session_store, tmp_path):
+        location = create_upload(test_client, tmp_path).headers["location"]
+        upload_id = location.rsplit("/", 1)[1]
+        session_store[upload_id]["updated_at"] = timestamp(timedelta(days=2))
+
+        response = patch_chunk(test_client, location, 0, CONTENT[:10])
+
+        assert response.status_code == 404
+        assert session_store == {}
+        assert not (tmp_path / ".uploads" / f"{upload_id}.part").exists()
+
+    def test_expired_sessions_are_swept_on_create(self, test_client, bypass_auth, session_store, tmp_path):
+        stale_id = create_upload(test_client, tmp_path).json()["upload_id"]
+        session_store[stale_id]["updated_at"] = timestamp(timedelta(days=2))
+
+        fresh_id = create_upload(test_client, tmp_path).json()["upload_id"]
+
+        assert list(session_store) == [fresh_id]
+        assert not (tmp_path / ".uploads" / f"{stale_id}.part").exists()
+
+    def test_empty_upload_is_finalized_on_creation(self, test_client, bypass_auth, session_store, tmp_path):
+        response = create_upload(test_client, tmp_path, length=0, filename="empty.txt")
+
+        assert response.status_code == 201
+        assert (tmp_path / "empty.txt").read_bytes() == b""
+        assert session_store == {}
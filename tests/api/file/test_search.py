@@ -0,0 +1,87 @@
+import pytest
+from types import SimpleNamespace
+from unittest.mock import patch
+from src.services.api.file.drive_indexer import index_drive
+from src.services.database.user_context import UserContext
+
+@pytest.fixture
+def drive(tmp_path, files_db):
+    """An indexed drive selection, with a second drive the user cannot see."""
+    root = tmp_path / "drive"
+    for relative_path in [
+        "photos/Summer_Holiday-2023.jpg",
+        "photos/holiday/beach.jpg",
+        "videos/holiday_clip.mp4",
+        "documents/tax-return.pdf",
+        "documents/Household.pdf",
+    ]:
+        (root / relative_path).parent.mkdir(parents=True, exist_ok=True)
+        (root / relative_path).write_bytes(b"x")
+    (tmp_path / "other" / "photos").mkdir(parents=True)
+    (tmp_path / "other" / "photos" / "holiday.jpg").write_bytes(b"x")
+
+    index_drive(str(root))
+    index_drive(str(tmp_path / "other"))
+    with patch('src.api.auth.dependencies.get_user_context', return_value=UserContext(SimpleNamespace(id=1), SimpleNamespace(hard_drive_path_selection=str(root)))):
+        yield root
+
+def names(response):
+    return [result["name"] for result in response.json()["results"]]
+
+class TestSearch:
+    def test_word_prefixes_rank_before_substrings(self, test_client, bypass_auth, drive):
+        response = test_client.get("/file/search/?q=hol")
+        assert response.status_code == 200
+
+        # "Household" only contains "hol"; every other name has a word starting with it, shortest first
+        assert names(response) == ["holiday", "holiday_clip.mp4", "Summer_Holiday-2023.jpg", "Household.pdf"]
+        assert response.json()["index_complete"] is True
+
+    def test_results_are_limited_to_the_drive_selection(self, test_client, bypass_auth, drive):
+        response = test_client.get("/file/search/?q=holiday&mode=words")
+
+        assert sorted(names(response)) == ["Summer_Holiday-2023.jpg", "holiday", "holiday_clip.mp4"]
+        result = next(result for result in response.json()["results"] if result["name"] == "holiday_clip.mp4")
+        assert result["relative_path"] == "videos/holiday_clip.mp4"
+        assert result["category"] == "videos"
+
+    def test_modes(self, test_client, bypass_auth, drive):
+        assert names(test_client.get("/file/search/?q=retur&mode=prefix")) == ["tax-return.pdf"]
+        assert names(test_client.get("/file/search/?q=retur&mode=words")) == []
+        assert names(test_client.get("/file/search/?q=eturn&mode=substring")) == ["tax-return.pdf"]
+        assert names(test_client.get("/file/search/?q=summer 2023")) == ["Summer_Holiday-2023.jpg"]
+
+    def test_type_and_category_filters(self, test_client, bypass_auth, drive):
+        assert names(test_client.get("/file/search/?q=holiday&type=folder")) == ["holiday"]
+        assert names(test_client.get("/file/search/?q=holiday&type=file&category=videos")) == ["holiday_clip.mp4"]
+
+    def test_pagination(self, test_client, bypass_auth, drive):
+        first = test_client.get("/file/search/?q=hol&limit=3").json()
+        assert first["next_offset"] == 3
+
+        second = test_client.get(f"/file/search/?q=hol&limit=3&offset={first['next_offset']}").json()
+        assert [result["name"] for result in second["results"]] == ["Household.pdf"]
+        assert second["next_offset"] is None
+
+    def test_broad_searches_are_truncated(self, test_client, bypass_auth, drive):
+        with patch('src.api.file.search.SEARCH_CANDIDATES', 1):
+            response = test_client.get("/file/search/?q=holiday&mode=prefix")
+
+        assert response.json()["truncated"] is True
+        assert len(names(response)) == 2
+
+    def test_query_syntax_is_not_interpreted(self, test_client, bypass_auth, drive):
+        response = test_client.get('/file/search/?q=" OR * NEAR(')
+        assert response.status_code == 200
+
+    def test_short_substring_is_rejected(self, test_client, bypass_auth, drive):
+        response = test_client.get("/file/search/?q=ho&mode=substring")
+        assert response.status_code == 400
+
+    def test_unindexed_drive_requests_a_scan(self, test_client, bypass_auth, files_db, tmp_path):
+        with patch('src.api.auth.dependencies.get_user_context', return_value=UserContext(SimpleNamespace(id=1), SimpleNamespace(hard_drive_path_selection=str(tmp_path)))), \
+             patch('src.api.file.search.get_drive_indexer') as mock_indexer:
+            response = test_client.get("/file/search/?q=holiday")
+
+        assert response.json() == {"results": [], "next_offset": None, "truncated": False, "index_complete": False}
+        mock_indexer.return_value.request_scan.assert_called_once()
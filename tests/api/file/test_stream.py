@@ -1,55 +1,42 @@
 from unittest.mock import patch, MagicMock
 from pathlib import Path
+from src.services.database.user_context import UserContext
 
-def dummy_iter(content: bytes):
-    return (chunk for chunk in [content])
+CONTENT = bytes(range(256)) * 4
+
+def mock_user():
+    user = MagicMock()
+    user.id = 1
+    return user
+
+def mock_user_setting(path):
+    user_setting = MagicMock()
+    user_setting.hard_drive_path_selection = str(path)
+    return user_setting
 
 
 class TestFileStream:
-    def test_stream_video_file(self, test_client, bypass_auth):
-        # Mock user and user settings
-        mock_user = MagicMock()
-        mock_user.id = 1
-        
-        mock_user_setting = MagicMock()
-        mock_user_setting.hard_drive_path_selection = "/Volumes/TestDrive"
-        
-        with patch('src.api.file.stream.get_user_by_email', return_value=mock_user), \
-             patch('src.api.file.stream.get_user_setting', return_value=mock_user_setting), \
-             patch('src.api.file.stream.iterfile', return_value=dummy_iter(b"\x00\x00\x00\x20ftypisom")), \
-             patch('pathlib.Path.exists', return_value=True), \
-             patch('pathlib.Path.resolve') as mock_resolve:
-            
-            # Mock the resolved path
-            mock_path = MagicMock()
-            mock_resolve.return_value = mock_path
-            
+    def test_stream_video_file(self, test_client, bypass_auth, tmp_path):
+        (tmp_path / "videos").mkdir()
+        (tmp_path / "videos" / "video.mp4").write_bytes(b"\x00\x00\x00\x20ftypisom")
+
+        with patch('src.api.auth.dependencies.get_user_context', return_value=UserContext(mock_user(), mock_user_setting(tmp_path))):
+
             response = test_client.get("/file/stream/?file_name=videos/video.mp4")
             assert response.status_code == 200
-            # assert response.headers["content-type"].startswith("video/")
+            assert response.headers["content-type"].startswith("video/")
+            assert response.headers["accept-ranges"] == "bytes"
             assert response.content == b"\x00\x00\x00\x20ftypisom"
 
-    def test_stream_photo_file(self, test_client, bypass_auth):
-        # Mock user and user settings
-        mock_user = MagicMock()
-        mock_user.id = 1
-        
-        mock_user_setting = MagicMock()
-        mock_user_setting.hard_drive_path_selection = "/Volumes/TestDrive"
-        
-        with patch('src.api.file.stream.get_user_by_email', return_value=mock_user), \
-             patch('src.api.file.stream.get_user_setting', return_value=mock_user_setting), \
-             patch('src.api.file.stream.iterfile', return_value=dummy_iter(b"\xff\xd8\xff\xe0")), \
-             patch('pathlib.Path.exists', return_value=True), \
-             patch('pathlib.Path.resolve') as mock_resolve:
-            
-            # Mock the resolved path
-            mock_path = MagicMock()
-            mock_resolve.return_value = mock_path
-            
+    def test_stream_photo_file(self, test_client, bypass_auth, tmp_path):
+        (tmp_path / "photos").mkdir()
+        (tmp_path / "photos" / "photo.jpg").write_bytes(b"\xff\xd8\xff\xe0")
+
+        with patch('src.api.auth.dependencies.get_user_context', return_value=UserContext(mock_user(), mock_user_setting(tmp_path))):
+
             response = test_client.get("/file/stream/?file_name=photos/photo.jpg")
             assert response.status_code == 200
-            # assert response.headers["content-type"].startswith("image/")
+            assert response.headers["content-type"].startswith("image/")
             assert response.content == b"\xff\xd8\xff\xe0"
 
     def test_file_not_found(self, test_client, bypass_auth):
@@ -60,8 +47,7 @@ class TestFileStream:
         mock_user_setting = MagicMock()
         mock_user_setting.hard_drive_path_selection = "/Volumes/TestDrive"
         
-        with patch('src.api.file.stream.get_user_by_email', return_value=mock_user), \
-             patch('src.api.file.stream.get_user_setting', return_value=mock_user_setting), \
+        with patch('src.api.auth.dependencies.get_user_context', return_value=UserContext(mock_user, mock_user_setting)), \
              patch.object(Path, 'exists', return_value=False):
             
             response = test_client.get("/file/stream/?file_name=photos/missing.jpg")
@@ -69,7 +55,7 @@ class TestFileStream:
             assert response.json() == {"detail": "File not found"}
 
     def test_user_not_found(self, test_client, bypass_auth):
-        with patch('src.api.file.stream.get_user_by_email', return_value=None):
+        with patch('src.api.auth.dependencies.get_user_context', return_value=None):
             response = test_client.get("/file/stream/?file_name=photos/photo.jpg")
             assert response.status_code == 404
             assert response.json() == {"detail": "User not found"}
@@ -79,9 +65,144 @@ class TestFileStream:
         mock_user = MagicMock()
         mock_user.id = 1
         
-        with patch('src.api.file.stream.get_user_by_email', return_value=mock_user), \
-             patch('src.api.file.stream.get_user_setting', return_value=None):
+        with patch('src.api.auth.dependencies.get_user_context', return_value=UserContext(mock_user, None)):
             
             response = test_client.get("/file/stream/?file_name=photos/photo.jpg")
             assert response.status_code == 404
-            assert response.json() == {"detail": "Default Path Section not found"}
\ No newline at end of file
+            assert response.json() == {"detail": "Default Path Section not found"}
+
+    def test_directory_is_not_streamed(self, test_client, bypass_auth, tmp_path):
+        (tmp_path / "photos").mkdir()
+
+        with patch('src.api.auth.dependencies.get_user_context', return_value=UserContext(mock_user(), mock_user_setting(tmp_path))):
+            response = test_client.get("/file/stream/?file_name=photos")
+
+        assert response.status_code == 404
+        assert response.json() == {"detail": "File not found"}
+
+
+class TestFileStreamRange:
+    def stream_with_headers(self, test_client, tmp_path, headers):
+        (tmp_path / "movie.mp4").write_bytes(CONTENT)
+
+        with patch('src.api.auth.dependencies.get_user_context', return_value=UserContext(mock_user(), mock_user_setting(tmp_path))):
+            return test_client.get("/file/stream/?file_name=movie.mp4", headers=headers)
+
+    def test_single_range(self, test_client, bypass_auth, tmp_path):
+        response = self.stream_with_headers(test_client, tmp_path, {"Range": "bytes=10-19"})
+
+        assert response.status_code == 206
+        assert response.headers["content-range"] == f"bytes 10-19/{len(CONTENT)}"
+        assert response.headers["content-length"] == "10"
+        assert response.content == CONTENT[10:20]
+
+    def test_open_ended_and_suffix_ranges(self, test_client, bypass_auth, tmp_path):
+        response = self.stream_with_headers(test_client, tmp_path, {"Range": "bytes=1000-"})
+        assert response.status_code == 206
+        assert response.content == CONTENT[1000:]
+
+        response = self.stream_with_headers(test_client, tmp_path, {"Range": "bytes=-5"})
+        assert response.status_code == 206
+        assert response.headers["content-range"] == f"bytes 1019-1023/{len(CONTENT)}"
+        assert response.content == CONTENT[-5:]
+
+    def test_multiple_ranges(self, test_client, bypass_auth, tmp_path):
+        response = self.stream_with_headers(test_client, tmp_path, {"Range": "bytes=0-3, 100-103"})
+
+        assert response.status_code == 206
+        assert response.headers["content-type"].startswith("multipart/byteranges; boundary=")
+        boundary = response.headers["content-type"].split("boundary=")[1]
+        assert int(response.headers["content-length"]) == len(response.content)
+
+        parts = response.content.split(f"--{boundary}".encode())
+        assert len(parts) == 4
+        assert b"Content-Range: bytes 0-3/1024\r\n\r\n" + CONTENT[0:4] + b"\r\n" == parts[1].split(b"Content-Type: video/mp4\r\n")[1]
+        assert parts[2].endswith(CONTENT[100:104] + b"\r\n")
+        assert parts[3] == b"--\r\n"
+
+    def test_unsatisfiable_range(self, test_client, bypass_auth, tmp_path):
+        response = self.stream_with_headers(test_client, tmp_path, {"Range": "bytes=5000-6000"})
+
+        assert response.status_code == 416
+        assert response.headers["content-range"] == f"bytes */{len(CONTENT)}"
+
+    def test_malformed_range_is_ignored(self, test_client, bypass_auth, tmp_path):
+        response = self.stream_with_headers(test_client, tmp_path, {"Range": "bytes=20-10"})
+
+        assert response.status_code == 200
+        assert response.content == CONTENT
+
+    def test_if_range_matching_date(self, test_client, bypass_auth, tmp_path):
+        full = self.stream_with_headers(test_client, tmp_path, {})
+        last_modified = full.headers["last-modified"]
+
+        response = self.stream_with_headers(test_client, tmp_path, {"Range": "bytes=0-9", "If-Range": last_modified})
+        assert response.status_code == 206
+        assert response.content == CONTENT[:10]
+
+    def test_if_range_stale_validator_sends_full_file(self, test_client, bypass_auth, tmp_path):
+        headers = {"Range": "bytes=0-9", "If-Range": "Wed, 21 Oct 2015 07:28:00 GMT"}
+        response = self.stream_with_headers(test_client, tmp_path, headers)
+
+        assert response.status_code == 200
+        assert response.content == CONTENT
+
+
+class TestFileStreamConditional:
+    def stream_with_headers(self, test_client, tmp_path, headers):
+        photo = tmp_path / "photo.jpg"
+        if not photo.exists():
+            photo.write_bytes(CONTENT)
+
+        with patch('src.api.auth.dependencies.get_user_context', return_value=UserContext(mock_user(), mock_user_setting(tmp_path))):
+            return test_client.get("/file/stream/?file_name=photo.jpg", headers=headers)
+
+    def test_validators_are_emitted(self, test_client, bypass_auth, tmp_path):
+        response = self.stream_with_headers(test_client, tmp_path, {})
+
+        assert response.status_code == 200
+        assert response.headers["etag"].startswith('"')
+        assert "last-modified" in response.headers
+        assert response.headers["cache-control"] == "private, no-cache"
+
+    def test_versioned_url_is_cacheable(self, test_client, bypass_auth, tmp_path):
+        etag = self.stream_with_headers(test_client, tmp_path, {}).headers["etag"]
+
+        with patch('src.api.auth.dependencies.get_user_context', return_value=UserContext(mock_user(), mock_user_setting(tmp_path))):
+            response = test_client.get(f"/file/stream/?file_name=photo.jpg&v={etag.strip(chr(34))}")
+            stale = test_client.get("/file/stream/?file_name=photo.jpg&v=old")
+
+        assert response.headers["cache-control"] == "private, max-age=31536000, immutable"
+        assert stale.headers["cache-control"] == "private, no-cache"
+
+    def test_if_none_match_returns_304_without_opening_file(self, test_client, bypass_auth, tmp_path):
+        etag = self.stream_with_headers(test_client, tmp_path, {}).headers["etag"]
+
+        with patch('src.services.api.file.file_delivery.open', create=True) as mock_open:
+            response = self.stream_with_headers(test_client, tmp_path, {"If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+        mock_open.assert_not_called()
+
+    def test_if_modified_since_returns_304(self, test_client, bypass_auth, tmp_path):
+        last_modified = self.stream_with_headers(test_client, tmp_path, {}).headers["last-modified"]
+
+        response = self.stream_with_headers(test_client, tmp_path, {"If-Modified-Since": last_modified})
+        assert response.status_code == 304
+
+    def test_changed_file_is_sent_again(self, test_client, bypass_auth, tmp_path):
+        etag = self.stream_with_headers(test_client, tmp_path, {}).headers["etag"]
+        (tmp_path / "photo.jpg").write_bytes(CONTENT + b"edited")
+
+        response = self.stream_with_headers(test_client, tmp_path, {"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.content == CONTENT + b"edited"
+
+    def test_if_range_with_current_etag(self, test_client, bypass_auth, tmp_path):
+        etag = self.stream_with_headers(test_client, tmp_path, {}).headers["etag"]
+
+        response = self.stream_with_headers(test_client, tmp_path, {"Range": "bytes=0-9", "If-Range": etag})
+        assert response.status_code == 206
+        assert response.content == CONTENT[:10]
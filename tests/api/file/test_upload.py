@@ -2,69 +2,128 @@ import pytest
 from tempfile import NamedTemporaryFile
 from unittest.mock import patch, MagicMock
 from pathlib import Path
+from types import SimpleNamespace
 
 class TestFileUpload:
-    def test_file_upload_success(self, test_client, bypass_auth):
+    def test_file_upload_success(self, test_client, bypass_auth, tmp_path):
         # Create a temporary file for testing
         with NamedTemporaryFile(suffix='.jpeg') as temp_file:
-            # Create form data that matches the upload endpoint
-            with patch("src.api.file.upload.open", MagicMock()) as mock_open, \
-                 patch("src.api.file.upload.shutil.copyfileobj", MagicMock()) as mock_copyfileobj:
-                
-                # Mock the open context manager
-                mock_file_obj = MagicMock()
-                mock_open.return_value.__enter__.return_value = mock_file_obj
-                
-                # Test data - match frontend format
-                files_data = [("files", (temp_file.name, temp_file, "image/jpeg"))]
-                form_data = {"file_path_location": "/test/upload/path"}
-                
-                response = test_client.post("/file/upload/", data=form_data, files=files_data)
+            temp_file.write(b"\xff\xd8\xff\xe0 photo")
+            temp_file.seek(0)
 
-                assert response.status_code == 200
-                # In test environment, file.filename returns the full path
-                expected_filename = temp_file.name
-                assert response.json() == {"uploaded_files": [expected_filename]}
-                
-                # Verify that open was called with the correct path
-                mock_open.assert_called()
-                # Verify that copyfileobj was called
-                mock_copyfileobj.assert_called()
-                
-    def test_file_upload_error_handling(self, test_client, bypass_auth):
+            # Test data - match frontend format
+            files_data = [("files", (temp_file.name, temp_file, "image/jpeg"))]
+            form_data = {"file_path_location": str(tmp_path)}
+
+            response = test_client.post("/file/upload/", data=form_data, files=files_data)
+
+            assert response.status_code == 200
+            # The client sends the full path, but only the base name is stored and reported
+            body = response.json()
+            assert body["uploaded_files"] == [Path(temp_file.name).name]
+            assert body["failed_files"] == []
+            assert body["files"] == [
+                {"filename": Path(temp_file.name).name, "size": 10, "status": "uploaded", "error": None, "deduplicated": False},
+            ]
+            assert body["deduplicated_files"] == []
+            assert body["bytes_saved"] == 0
+
+            # The file is stored under its base name, with no temp files left behind
+            assert (tmp_path / Path(temp_file.name).name).read_bytes() == b"\xff\xd8\xff\xe0 photo"
+            assert [path.name for path in tmp_path.iterdir()] == [Path(temp_file.name).name]
+
+    def test_file_upload_error_handling(self, test_client, bypass_auth, tmp_path):
         # Test error handling when file operations fail
         with NamedTemporaryFile(suffix='.jpeg') as temp_file:
-            with patch("src.api.file.upload.shutil.copyfileobj", side_effect=Exception("File system error")):
+            with patch("src.services.api.file.multipart_upload.os.replace", side_effect=Exception("File system error")):
                 files_data = [("files", (temp_file.name, temp_file, "image/jpeg"))]
-                form_data = {"file_path_location": "/test/path"}
-    
+                form_data = {"file_path_location": str(tmp_path)}
+
                 response = test_client.post("/file/upload/", data=form_data, files=files_data)
 
                 assert response.status_code == 200
-                assert response.json() == {"status": "error", "message": "Unexpected error occurred: File system error"}
+                assert response.json()["uploaded_files"] == []
+                assert response.json()["failed_files"] == [{"filename": Path(temp_file.name).name, "error": "File system error"}]
+                assert list(tmp_path.iterdir()) == []
 
-    def test_file_upload_multiple_files(self, test_client, bypass_auth):
+    def test_file_upload_multiple_files(self, test_client, bypass_auth, tmp_path):
         # Test uploading multiple files
         with NamedTemporaryFile(suffix='.jpg') as temp_file1, \
              NamedTemporaryFile(suffix='.png') as temp_file2:
-            
-            with patch("src.api.file.upload.open", MagicMock()) as mock_open, \
-                 patch("src.api.file.upload.shutil.copyfileobj", MagicMock()) as mock_copyfileobj:
-                
-                # Mock the open context manager
-                mock_file_obj = MagicMock()
-                mock_open.return_value.__enter__.return_value = mock_file_obj
-                
-                # Match frontend format - multiple files with same field name
-                files_data = [
-                    ("files", (temp_file1.name, temp_file1, "image/jpeg")),
-                    ("files", (temp_file2.name, temp_file2, "image/png"))
-                ]
-                form_data = {"file_path_location": "/test/path"}
-                
-                response = test_client.post("/file/upload/", data=form_data, files=files_data)
+            temp_file1.write(b"first")
+            temp_file1.seek(0)
+            temp_file2.write(b"second" * 500000)
+            temp_file2.seek(0)
 
-                assert response.status_code == 200
-                # In test environment, file.filename returns the full path
-                expected_filenames = [temp_file1.name, temp_file2.name]
-                assert response.json() == {"uploaded_files": expected_filenames}
\ No newline at end of file
+            # Match frontend format - multiple files with same field name
+            files_data = [
+                ("files", (temp_file1.name, temp_file1, "image/jpeg")),
+                ("files", (temp_file2.name, temp_file2, "image/png"))
+            ]
+            form_data = {"file_path_location": str(tmp_path)}
+
+            response = test_client.post("/file/upload/", data=form_data, files=files_data)
+
+            assert response.status_code == 200
+            expected_filenames = [Path(temp_file1.name).name, Path(temp_file2.name).name]
+            assert response.json()["uploaded_files"] == expected_filenames
+            assert response.json()["failed_files"] == []
+            assert (tmp_path / Path(temp_file1.name).name).read_bytes() == b"first"
+            assert (tmp_path / Path(temp_file2.name).name).read_bytes() == b"second" * 500000
+
+    def test_file_upload_location_as_query_parameter(self, test_client, bypass_auth, tmp_path):
+        files_data = [("files", ("photo.jpg", b"photo", "image/jpeg"))]
+
+        response = test_client.post(f"/file/upload/?file_path_location={tmp_path}", files=files_data)
+
+        assert response.status_code == 200
+        assert response.json()["uploaded_files"] == ["photo.jpg"]
+        assert (tmp_path / "photo.jpg").read_bytes() == b"photo"
+
+    def test_file_upload_without_location(self, test_client, bypass_auth):
+        files_data = [("files", ("photo.jpg", b"photo", "image/jpeg"))]
+
+        response = test_client.post("/file/upload/", files=files_data)
+
+        assert response.status_code == 200
+        assert response.json() == {
+            "status": "error",
+            "message": "Unexpected error occurred: file_path_location must be sent before the files",
+        }
+
+    def test_file_upload_without_files(self, test_client, bypass_auth, tmp_path):
+        response = test_client.post("/file/upload/", data={"file_path_location": str(tmp_path)}, files=[("unused", ("", b"", "text/plain"))])
+
+        assert response.status_code == 200
+        assert response.json() == {"status": "error", "message": "Unexpected error occurred: No files were sent"}
+
+    def test_file_upload_partial_failure(self, test_client, bypass_auth, tmp_path):
+        (tmp_path / "taken").mkdir()
+        files_data = [
+            ("files", ("photo.jpg", b"photo", "image/jpeg")),
+            ("files", ("taken", b"cannot replace a folder", "text/plain")),
+        ]
+
+        response = test_client.post("/file/upload/", data={"file_path_location": str(tmp_path)}, files=files_data)
+
+        assert response.status_code == 200
+        assert response.json()["uploaded_files"] == ["photo.jpg"]
+        assert [failed["filename"] for failed in response.json()["failed_files"]] == ["taken"]
+        assert (tmp_path / "photo.jpg").read_bytes() == b"photo"
+
+    def test_file_upload_reports_deduplicated_files(self, test_client, bypass_auth, tmp_path):
+        existing = tmp_path / "original.jpg"
+        existing.write_bytes(b"photo")
+        file_stat = existing.stat()
+        record = SimpleNamespace(path=str(existing), size=5, inode=file_stat.st_ino, mtime_ns=file_stat.st_mtime_ns)
+        files_data = [("files", ("copy.jpg", b"photo", "image/jpeg"))]
+
+        with patch("src.services.api.file.multipart_upload.DEDUP_MODE", "hardlink"), \
+             patch("src.services.api.file.multipart_upload.get_file_hashes_by_content", return_value=[record]), \
+             patch("src.services.api.file.multipart_upload.upsert_file_hash") as mock_upsert:
+            response = test_client.post("/file/upload/", data={"file_path_location": str(tmp_path)}, files=files_data)
+
+        assert response.json()["deduplicated_files"] == ["copy.jpg"]
+        assert response.json()["bytes_saved"] == 5
+        assert (tmp_path / "copy.jpg").stat().st_ino == file_stat.st_ino
+        assert mock_upsert.call_args[0][0]["path"] == str(tmp_path / "copy.jpg")
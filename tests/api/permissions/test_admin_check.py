@@ -1,4 +1,6 @@
 from unittest.mock import patch, MagicMock
+from src.api.auth.dependencies import get_current_user
+from src.services.database.user_context import UserContext
 
 class TestAdminCheckAPI:
     def test_admin_check__admin_user_success(self, test_client, bypass_auth):
@@ -7,7 +9,7 @@ class TestAdminCheckAPI:
         mock_admin_user = MagicMock()
         mock_admin_user.is_admin = True
         
-        with patch('src.api.permissions.admin_check.get_user_by_email', return_value=mock_admin_user):
+        with patch('src.api.auth.dependencies.get_user_context', return_value=UserContext(mock_admin_user, None)):
             
             response = test_client.get("/permissions/admin_check/")
             
@@ -21,7 +23,7 @@ class TestAdminCheckAPI:
         mock_user = MagicMock()
         mock_user.is_admin = False
         
-        with patch('src.api.permissions.admin_check.get_user_by_email', return_value=mock_user):
+        with patch('src.api.auth.dependencies.get_user_context', return_value=UserContext(mock_user, None)):
             
             response = test_client.get("/permissions/admin_check/")
             
@@ -32,7 +34,7 @@ class TestAdminCheckAPI:
     def test_admin_check__user_not_found_error(self, test_client, bypass_auth):
         """Test admin check handles user not found gracefully"""
         # Mock user not found
-        with patch('src.api.permissions.admin_check.get_user_by_email', return_value=None):
+        with patch('src.api.auth.dependencies.get_user_context', return_value=None):
             
             response = test_client.get("/permissions/admin_check/")
             
@@ -44,10 +46,10 @@ class TestAdminCheckAPI:
     def test_admin_check__user_no_email_error(self, test_client, bypass_auth):
         """Test admin check handles missing email in current_user"""
         # Mock current user without email
-        with patch('src.api.permissions.admin_check.get_current_user', return_value={}), \
-             patch('src.api.permissions.admin_check.get_user_by_email', return_value=None):
+        with patch.dict(test_client.app.dependency_overrides, {get_current_user: lambda: {}}), \
+             patch('src.api.auth.dependencies.get_user_context', return_value=None):
             
             response = test_client.get("/permissions/admin_check/")
             
-            # This will likely cause an error since get_user_by_email(None) will be called
+            # No email resolves to no user
             assert response.status_code in [200, 500]
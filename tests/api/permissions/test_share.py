@@ -1,4 +1,5 @@
 from unittest.mock import patch, MagicMock
+from src.services.database.user_context import UserContext
 
 class TestShareAPI:
     def test_share__create_new_user_success(self, test_client, bypass_auth):
@@ -17,9 +18,11 @@ class TestShareAPI:
             "hard_drive_path_selection": "/Volumes/Drive1"
         }
         
-        with patch('src.api.permissions.share.get_user_by_email') as mock_get_user_by_email, \
+        with patch('src.api.auth.dependencies.get_user_context', return_value=UserContext(mock_admin_user, None)), \
+             patch('src.api.permissions.share.get_user_by_email') as mock_get_user_by_email, \
              patch('src.api.permissions.share.create_user', return_value=mock_new_user) as mock_create_user, \
-             patch('src.api.permissions.share.create_user_setting') as mock_create_setting:
+             patch('src.api.permissions.share.create_user_setting') as mock_create_setting, \
+             patch('src.api.permissions.share.reload_allowed_emails') as mock_reload_allowed_emails:
             
             # Mock admin user lookup
             mock_get_user_by_email.side_effect = lambda email: mock_admin_user if email == "test@gmail.com" else None
@@ -44,6 +47,9 @@ class TestShareAPI:
                 "hard_drive_path_selection": "/Volumes/Drive1"
             })
 
+            # Verify the new user can sign in without a restart
+            mock_reload_allowed_emails.assert_awaited_once()
+
     def test_share__update_existing_user_success(self, test_client, bypass_auth):
         """Test sharing with an existing user"""
         # Mock admin user
@@ -61,7 +67,8 @@ class TestShareAPI:
             "hard_drive_path_selection": "/Volumes/Drive2"
         }
         
-        with patch('src.api.permissions.share.get_user_by_email') as mock_get_user_by_email, \
+        with patch('src.api.auth.dependencies.get_user_context', return_value=UserContext(mock_admin_user, None)), \
+             patch('src.api.permissions.share.get_user_by_email') as mock_get_user_by_email, \
              patch('src.api.permissions.share.update_user') as mock_update_user, \
              patch('src.api.permissions.share.get_user_setting', return_value=None), \
              patch('src.api.permissions.share.create_user_setting') as mock_create_setting:
@@ -111,7 +118,8 @@ class TestShareAPI:
             "hard_drive_path_selection": "/Volumes/Drive3"
         }
         
-        with patch('src.api.permissions.share.get_user_by_email') as mock_get_user_by_email, \
+        with patch('src.api.auth.dependencies.get_user_context', return_value=UserContext(mock_admin_user, None)), \
+             patch('src.api.permissions.share.get_user_by_email') as mock_get_user_by_email, \
              patch('src.api.permissions.share.update_user') as mock_update_user, \
              patch('src.api.permissions.share.get_user_setting', return_value=mock_user_setting), \
              patch('src.api.permissions.share.update_user_setting') as mock_update_setting:
@@ -146,8 +154,7 @@ class TestShareAPI:
             "hard_drive_path_selection": "/Volumes/Drive1"
         }
         
-        with patch('src.api.permissions.share.get_current_user', return_value={"email": "user@test.com"}), \
-             patch('src.api.permissions.share.get_user_by_email', return_value=mock_user):
+        with patch('src.api.auth.dependencies.get_user_context', return_value=UserContext(mock_user, None)):
             
             response = test_client.put("/permissions/share/", json=payload)
             
@@ -161,8 +168,7 @@ class TestShareAPI:
         mock_admin_user = MagicMock()
         mock_admin_user.is_admin = True
         
-        with patch('src.api.permissions.share.get_current_user', return_value={"email": "admin@test.com"}), \
-             patch('src.api.permissions.share.get_user_by_email', return_value=mock_admin_user):
+        with patch('src.api.auth.dependencies.get_user_context', return_value=UserContext(mock_admin_user, None)):
             
             # Missing required fields
             response = test_client.put("/permissions/share/", json={})
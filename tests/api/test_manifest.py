@@ -0,0 +1,18 @@
+from src.api.manifest import ROUTES, discover_routes
+from src.main import app
+
+class TestRouteManifest:
+    def test_manifest_matches_tree(self):
+        # Regenerate with `python -m src.api.manifest` when this fails
+        assert list(ROUTES) == discover_routes()
+
+    def test_every_route_is_served(self):
+        paths = list(app.openapi()["paths"])
+
+        for _, prefix, _ in ROUTES:
+            assert any(path.startswith(prefix + "/") for path in paths), prefix
+
+    def test_private_routes_require_authentication(self, test_client):
+        response = test_client.get("/file/list_mounted_drives/")
+
+        assert response.status_code == 401
@@ -2,7 +2,9 @@ import pytest
 from fastapi.testclient import TestClient
 from src.main import app
 from unittest.mock import patch
+import importlib
 import os
+import sqlite3
 
 @pytest.fixture(scope="module")
 def test_client():
@@ -62,4 +64,21 @@ def set_test_env_vars():
     
     os.environ.pop("JWT_SECRET_KEY", None)
     os.environ.pop("JWT_ALGORITHM", None)
-    os.environ.pop("ACCESS_TOKEN_EXPIRE_MINUTES", None)
\ No newline at end of file
+    os.environ.pop("ACCESS_TOKEN_EXPIRE_MINUTES", None)
+
+@pytest.fixture
+def files_db(tmp_path):
+    """Point the files index at a fresh, migrated database."""
+    db_path = str(tmp_path / "files.db")
+    with sqlite3.connect(db_path) as conn:
+        for migration in ["003_file_hashes", "004_files", "005_file_index_checkpoints", "006_files_search"]:
+            importlib.import_module(f"src.database.migrations.{migration}").up(conn)
+
+    def get_connection():
+        conn = sqlite3.connect(db_path)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    with patch("src.services.database.files.get_connection", side_effect=get_connection), \
+            patch("src.services.database.db_service.get_connection", side_effect=lambda db_path=None: get_connection()):
+        yield get_connection
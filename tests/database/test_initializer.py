@@ -0,0 +1,90 @@
+import importlib
+import sqlite3
+import pytest
+from unittest.mock import MagicMock, patch
+from src.database.initializer import MIGRATIONS, SCHEMA_VERSION, DatabaseInitializer, discover_migrations, execute_script
+from src.services.database.db_service import close_connections, get_connection, transaction
+
+@pytest.fixture
+def db_path(tmp_path):
+    """Point the migration runner at a fresh database file."""
+    db_path = str(tmp_path / "migrations.db")
+    with patch("src.database.initializer.get_connection", side_effect=lambda: get_connection(db_path)), \
+            patch("src.database.initializer.transaction", side_effect=lambda: transaction(db_path)):
+        yield db_path
+    close_connections()
+
+def read(db_path, sql):
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute(sql).fetchall()
+
+def tables(db_path):
+    return {row[0] for row in read(db_path, "SELECT name FROM sqlite_master WHERE type = 'table'")}
+
+class TestDatabaseInitializer:
+    def test_manifest_matches_migration_files(self):
+        # Regenerate with `python -m src.database.initializer` when this fails
+        assert list(MIGRATIONS) == discover_migrations()
+
+    def test_run_migrations__fresh_database(self, db_path):
+        DatabaseInitializer()
+
+        assert {"users", "user_settings", "upload_sessions", "file_hashes", "files", "files_words"} <= tables(db_path)
+        assert [row[0] for row in read(db_path, "SELECT name FROM migrations ORDER BY name")] == list(MIGRATIONS)
+        assert read(db_path, "PRAGMA user_version") == [(SCHEMA_VERSION,)]
+
+    def test_run_migrations__nothing_pending_reads_only_the_version(self, db_path):
+        DatabaseInitializer()
+
+        with patch("src.database.initializer.transaction") as mock_transaction:
+            DatabaseInitializer()
+
+        mock_transaction.assert_not_called()
+
+    def test_run_migrations__applies_only_pending(self, db_path):
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("CREATE TABLE migrations (name TEXT PRIMARY KEY)")
+            conn.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, email TEXT)")
+            conn.execute("INSERT INTO migrations (name) VALUES ('001_initial_schema')")
+
+        DatabaseInitializer()
+
+        assert "user_settings" not in tables(db_path)
+        assert "upload_sessions" in tables(db_path)
+        assert read(db_path, "PRAGMA user_version") == [(SCHEMA_VERSION,)]
+
+    def test_run_migrations__failure_rolls_back_every_pending_migration(self, db_path):
+        import_module = importlib.import_module
+        broken = MagicMock()
+        broken.up.side_effect = sqlite3.OperationalError("near \",\": syntax error")
+
+        def import_migration(name):
+            return broken if name.endswith(MIGRATIONS[-1]) else import_module(name)
+
+        with patch("src.database.initializer.importlib.import_module", side_effect=import_migration):
+            with pytest.raises(sqlite3.OperationalError):
+                DatabaseInitializer()
+
+        assert tables(db_path) <= {"migrations"}
+        assert read(db_path, "PRAGMA user_version") == [(0,)]
+
+        DatabaseInitializer()
+        assert read(db_path, "PRAGMA user_version") == [(SCHEMA_VERSION,)]
+
+    def test_execute_script__keeps_the_transaction_open(self, tmp_path):
+        conn = sqlite3.connect(str(tmp_path / "script.db"), isolation_level=None)
+        conn.execute("BEGIN")
+        execute_script(conn, """
+            CREATE TABLE items (name TEXT);
+            -- A trigger body holds several statements
+            CREATE TRIGGER items_insert AFTER INSERT ON items BEGIN
+                SELECT 1;
+                SELECT 2;
+            END;
+            INSERT INTO items (name) VALUES ('a;b');
+        """)
+
+        assert conn.in_transaction
+        conn.rollback()
+        assert conn.execute("SELECT name FROM sqlite_master").fetchall() == []
+        conn.close()
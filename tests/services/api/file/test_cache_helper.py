@@ -0,0 +1,71 @@
+from types import SimpleNamespace
+from src.services.api.file.cache_helper import (
+    DEFAULT_CACHE_CONTROL,
+    cache_control_for,
+    etag_version,
+    is_not_modified,
+    make_etag,
+    parse_entity_tags,
+    validator_headers,
+)
+from src.services.api.file.range_helper import http_date
+
+MTIME = 1700000000.5
+
+def make_stat(ino=0x1234, size=2048, mtime_ns=1700000000500000000):
+    return SimpleNamespace(st_ino=ino, st_size=size, st_mtime_ns=mtime_ns)
+
+class TestMakeEtag:
+    def test_etag_from_inode_size_and_mtime(self):
+        assert make_etag(make_stat()) == f'"1234-800-{1700000000500000000:x}"'
+
+    def test_etag_changes_with_any_component(self):
+        base = make_etag(make_stat())
+        assert make_etag(make_stat(ino=1)) != base
+        assert make_etag(make_stat(size=1)) != base
+        assert make_etag(make_stat(mtime_ns=1)) != base
+
+class TestCacheControlFor:
+    def test_unversioned_responses_revalidate(self):
+        for mime_type in ["image/jpeg", "video/mp4", "audio/mpeg", "application/pdf"]:
+            assert cache_control_for(mime_type) == DEFAULT_CACHE_CONTROL
+
+    def test_versioned_media_is_cacheable(self):
+        for mime_type in ["image/jpeg", "video/mp4", "audio/mpeg"]:
+            assert "immutable" in cache_control_for(mime_type, versioned=True)
+
+    def test_versioned_other_files_revalidate(self):
+        assert cache_control_for("application/pdf", versioned=True) == DEFAULT_CACHE_CONTROL
+
+    def test_etag_version(self):
+        assert etag_version('"1-2-3"') == "1-2-3"
+
+class TestIsNotModified:
+    etag = '"abc"'
+
+    def test_no_conditional_headers(self):
+        assert is_not_modified({}, self.etag, MTIME) is False
+
+    def test_if_none_match(self):
+        assert is_not_modified({"if-none-match": '"abc"'}, self.etag, MTIME) is True
+        assert is_not_modified({"if-none-match": '"x", W/"abc"'}, self.etag, MTIME) is True
+        assert is_not_modified({"if-none-match": "*"}, self.etag, MTIME) is True
+        assert is_not_modified({"if-none-match": '"other"'}, self.etag, MTIME) is False
+
+    def test_if_modified_since(self):
+        assert is_not_modified({"if-modified-since": http_date(MTIME)}, self.etag, MTIME) is True
+        assert is_not_modified({"if-modified-since": http_date(MTIME + 60)}, self.etag, MTIME) is True
+        assert is_not_modified({"if-modified-since": http_date(MTIME - 60)}, self.etag, MTIME) is False
+        assert is_not_modified({"if-modified-since": "garbage"}, self.etag, MTIME) is False
+
+    def test_if_none_match_takes_precedence(self):
+        headers = {"if-none-match": '"other"', "if-modified-since": http_date(MTIME)}
+        assert is_not_modified(headers, self.etag, MTIME) is False
+
+class TestHelpers:
+    def test_parse_entity_tags(self):
+        assert parse_entity_tags(' "a" ,W/"b",, ') == ['"a"', 'W/"b"']
+
+    def test_validator_headers(self):
+        headers = validator_headers('"abc"', "date", "image/png")
+        assert headers == {"ETag": '"abc"', "Last-Modified": "date", "Cache-Control": "private, no-cache"}
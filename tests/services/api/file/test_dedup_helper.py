@@ -0,0 +1,79 @@
+import os
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+from src.services.api.file.dedup_helper import (
+    deduplicate_file,
+    find_original,
+    hash_record,
+    link_duplicate,
+    new_hasher,
+    record_matches,
+)
+
+def record_for(path: Path, hash: str = "abc"):
+    return SimpleNamespace(**hash_record(path, hash, path.stat()))
+
+class TestHashRecords:
+    def test_hash_record(self, tmp_path):
+        (tmp_path / "a.jpg").write_bytes(b"photo")
+        record = hash_record(tmp_path / "a.jpg", "abc", (tmp_path / "a.jpg").stat())
+
+        assert record["path"] == str(tmp_path / "a.jpg")
+        assert record["size"] == 5
+        assert record["hash"] == "abc"
+
+    def test_modified_file_no_longer_matches(self, tmp_path):
+        (tmp_path / "a.jpg").write_bytes(b"photo")
+        record = record_for(tmp_path / "a.jpg")
+        os.utime(tmp_path / "a.jpg", ns=(0, 0))
+
+        assert not record_matches((tmp_path / "a.jpg").stat(), record)
+
+    def test_sha256(self):
+        hasher = new_hasher()
+        hasher.update(b"abc")
+        assert hasher.hexdigest() == "ba7816bf8f01cfea414140de5dae2223b00361a396177a9cb410ff61f20015ad"
+
+class TestFindOriginal:
+    def test_skips_destination_and_stale_records(self, tmp_path):
+        for name in ["a.jpg", "b.jpg", "c.jpg"]:
+            (tmp_path / name).write_bytes(b"photo")
+        stale = record_for(tmp_path / "b.jpg")
+        stale.mtime_ns -= 1
+        missing = SimpleNamespace(path=str(tmp_path / "gone.jpg"), size=5, inode=1, mtime_ns=1)
+
+        records = [record_for(tmp_path / "a.jpg"), missing, stale, record_for(tmp_path / "c.jpg")]
+        assert find_original(tmp_path / "a.jpg", records) == tmp_path / "c.jpg"
+
+    def test_no_match(self, tmp_path):
+        assert find_original(tmp_path / "a.jpg", []) is None
+
+class TestLinkDuplicate:
+    def test_hardlink_replaces_destination(self, tmp_path):
+        (tmp_path / "a.jpg").write_bytes(b"photo")
+        (tmp_path / "b.jpg").write_bytes(b"photo")
+
+        assert link_duplicate(tmp_path / "a.jpg", tmp_path / "b.jpg", "hardlink")
+        assert (tmp_path / "a.jpg").stat().st_ino == (tmp_path / "b.jpg").stat().st_ino
+        assert sorted(path.name for path in tmp_path.iterdir()) == ["a.jpg", "b.jpg"]
+
+    def test_unsupported_link_leaves_destination(self, tmp_path):
+        (tmp_path / "a.jpg").write_bytes(b"photo")
+        (tmp_path / "b.jpg").write_bytes(b"photo")
+
+        with patch("src.services.api.file.dedup_helper.os.link", side_effect=OSError("not supported")):
+            assert not link_duplicate(tmp_path / "a.jpg", tmp_path / "b.jpg", "hardlink")
+
+        assert (tmp_path / "a.jpg").stat().st_ino != (tmp_path / "b.jpg").stat().st_ino
+        assert sorted(path.name for path in tmp_path.iterdir()) == ["a.jpg", "b.jpg"]
+
+    def test_reflink_falls_back_to_copy(self, tmp_path):
+        (tmp_path / "a.jpg").write_bytes(b"photo")
+        (tmp_path / "b.jpg").write_bytes(b"photo")
+
+        with patch("src.services.api.file.dedup_helper.reflink", side_effect=OSError("not supported")):
+            assert not deduplicate_file(tmp_path / "b.jpg", [record_for(tmp_path / "a.jpg")], "reflink")
+
+        assert (tmp_path / "b.jpg").read_bytes() == b"photo"
+        assert sorted(path.name for path in tmp_path.iterdir()) == ["a.jpg", "b.jpg"]
@@ -0,0 +1,88 @@
+import os
+import pytest
+from unittest.mock import patch
+from src.services.api.file import directory_scanner
+from src.services.api.file.directory_scanner import scan_directory
+
+real_scandir = os.scandir
+
+class CountingEntry:
+    """DirEntry proxy that counts stat calls."""
+
+    def __init__(self, entry, calls):
+        self.entry = entry
+        self.calls = calls
+        self.name = entry.name
+        self.path = entry.path
+
+    def stat(self):
+        self.calls.append(self.name)
+        return self.entry.stat()
+
+class CountingScandir:
+    def __init__(self, calls):
+        self.calls = calls
+
+    def __call__(self, path):
+        iterator = real_scandir(path)
+        calls = self.calls
+
+        class Wrapper:
+            def __enter__(self):
+                return (CountingEntry(entry, calls) for entry in iterator)
+
+            def __exit__(self, *exc_info):
+                iterator.close()
+
+        return Wrapper()
+
+class TestScanDirectory:
+    def test_entries(self, tmp_path):
+        (tmp_path / "a.jpg").write_bytes(b"abc")
+        (tmp_path / "folder").mkdir()
+
+        entries = sorted(scan_directory(tmp_path), key=lambda entry: entry["name"])
+
+        assert [(entry["name"], entry["is_dir"]) for entry in entries] == [("a.jpg", False), ("folder", True)]
+        assert entries[0]["size"] == 3
+        assert entries[0]["path"] == str(tmp_path / "a.jpg")
+        assert entries[0]["mtime"] == (tmp_path / "a.jpg").stat().st_mtime
+
+    def test_one_stat_per_visible_entry(self, tmp_path):
+        for name in ["a.jpg", "b.jpg", ".hidden", "._a.jpg"]:
+            (tmp_path / name).write_bytes(b"")
+        (tmp_path / "folder").mkdir()
+
+        calls = []
+        with patch.object(directory_scanner.os, "scandir", CountingScandir(calls)):
+            entries = scan_directory(tmp_path)
+
+        assert len(entries) == 3
+        assert sorted(calls) == ["a.jpg", "b.jpg", "folder"]
+
+    def test_symlinks_are_followed_and_broken_ones_skipped(self, tmp_path):
+        (tmp_path / "target").mkdir()
+        (tmp_path / "link").symlink_to(tmp_path / "target")
+        (tmp_path / "broken").symlink_to(tmp_path / "missing")
+
+        entries = {entry["name"]: entry for entry in scan_directory(tmp_path)}
+
+        assert sorted(entries) == ["link", "target"]
+        assert entries["link"]["is_dir"]
+
+    def test_windows_hidden_attribute(self, tmp_path):
+        (tmp_path / "desktop.ini").write_bytes(b"")
+
+        class HiddenStat:
+            st_file_attributes = directory_scanner.FILE_ATTRIBUTE_HIDDEN
+            st_mode = 0o100644
+            st_size = 0
+            st_mtime = 0.0
+
+        with patch.object(CountingEntry, "stat", lambda self: HiddenStat()), \
+             patch.object(directory_scanner.os, "scandir", CountingScandir([])):
+            assert scan_directory(tmp_path) == []
+
+    def test_missing_directory(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            scan_directory(tmp_path / "missing")
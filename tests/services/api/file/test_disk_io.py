@@ -0,0 +1,63 @@
+import asyncio
+import time
+import pytest
+from src.services.api.file.disk_io import read_file_range, run_disk_io, stat_file
+
+CONTENT = bytes(range(256)) * 4
+
+class TestStatFile:
+    def test_regular_file(self, tmp_path):
+        (tmp_path / "photo.jpg").write_bytes(CONTENT)
+
+        file_path, file_stat = stat_file(str(tmp_path), "photo.jpg")
+        assert file_path == (tmp_path / "photo.jpg").resolve()
+        assert file_stat.st_size == len(CONTENT)
+
+    def test_missing_file(self, tmp_path):
+        _, file_stat = stat_file(str(tmp_path), "missing/photo.jpg")
+        assert file_stat is None
+
+    def test_directory_is_not_a_file(self, tmp_path):
+        (tmp_path / "photos").mkdir()
+
+        _, file_stat = stat_file(str(tmp_path), "photos")
+        assert file_stat is None
+
+class TestReadFileRange:
+    @pytest.mark.asyncio
+    async def test_reads_range_in_chunks(self, tmp_path):
+        path = tmp_path / "video.mp4"
+        path.write_bytes(CONTENT)
+
+        with open(path, "rb") as file_like:
+            chunks = [chunk async for chunk in read_file_range(file_like, 10, 109, chunk_size=32)]
+
+        assert [len(chunk) for chunk in chunks] == [32, 32, 32, 4]
+        assert b"".join(chunks) == CONTENT[10:110]
+
+    @pytest.mark.asyncio
+    async def test_abandoned_read_ahead_completes_before_close(self, tmp_path):
+        path = tmp_path / "video.mp4"
+        path.write_bytes(CONTENT)
+
+        with open(path, "rb") as file_like:
+            chunks = read_file_range(file_like, 0, len(CONTENT) - 1, chunk_size=16)
+            assert await chunks.__anext__() == CONTENT[:16]
+            await chunks.aclose()
+
+class TestRunDiskIo:
+    @pytest.mark.asyncio
+    async def test_slow_disk_does_not_block_event_loop(self):
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        ticker_task = asyncio.create_task(ticker())
+        await run_disk_io(time.sleep, 0.2)
+        ticker_task.cancel()
+
+        assert ticks >= 5
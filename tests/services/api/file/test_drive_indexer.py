@@ -0,0 +1,253 @@
+import os
+import time
+import pytest
+from unittest.mock import patch
+from src.services.api.file.drive_indexer import (
+    DriveIndexer,
+    category_for,
+    ensure_indexed,
+    index_drive,
+)
+from src.services.api.file import drive_indexer
+from src.services.database.files import get_index_checkpoint, get_index_scan, get_indexed_file, query_files
+
+def settle(root):
+    """Backdate every folder's mtime past the settle window, as if the drive had been idle."""
+    for directory, _, _ in os.walk(root):
+        os.utime(directory, (time.time() - 60, time.time() - 60))
+
+@pytest.fixture
+def drive(tmp_path, files_db):
+    root = tmp_path / "drive"
+    for relative_path in ["photos/a.jpg", "photos/trip/b.jpg", "videos/c.mp4", "loose/d.mp4", "e.pdf"]:
+        (root / relative_path).parent.mkdir(parents=True, exist_ok=True)
+        (root / relative_path).write_bytes(b"x" * 10)
+    return root
+
+def indexed_paths(root):
+    return {os.path.relpath(indexed_file.path, root) for indexed_file in query_files()}
+
+class TestCategoryFor:
+    def test_category_folder_wins(self):
+        assert category_for("/drive", "/drive/photos/trip/clip.mp4", "video/mp4") == "photos"
+
+    def test_mime_type_outside_category_folders(self):
+        assert category_for("/drive", "/drive/loose/clip.mp4", "video/mp4") == "videos"
+        assert category_for("/drive", "/drive/photos", None) is None
+
+class TestIndexDrive:
+    def test_indexes_every_entry(self, drive):
+        report = index_drive(str(drive))
+
+        assert report["files"] == 5
+        assert report["directories"] == 5
+        assert report["skipped_directories"] == 0
+        assert report["removed"] == 0
+        assert indexed_paths(drive) == {
+            ".", "photos", "photos/a.jpg", "photos/trip", "photos/trip/b.jpg",
+            "videos", "videos/c.mp4", "loose", "loose/d.mp4", "e.pdf",
+        }
+
+        clip = get_indexed_file(str(drive / "loose" / "d.mp4"))
+        assert clip.size == 10
+        assert clip.mime_type == "video/mp4"
+        assert clip.category == "videos"
+        assert clip.inode == os.stat(drive / "loose" / "d.mp4").st_ino
+        assert clip.owner == os.stat(drive / "loose" / "d.mp4").st_uid
+
+        index_scan = get_index_scan(str(drive))
+        assert index_scan.completed_ns >= index_scan.started_ns
+        assert index_scan.file_count == 5
+
+    def test_reconciliation_drops_removed_entries(self, drive):
+        index_drive(str(drive))
+        (drive / "photos" / "trip" / "b.jpg").unlink()
+        (drive / "photos" / "trip").rmdir()
+        (drive / "e.pdf").unlink()
+
+        report = index_drive(str(drive))
+
+        assert report["removed"] == 3
+        assert "photos/trip" not in indexed_paths(drive)
+        assert "e.pdf" not in indexed_paths(drive)
+
+    def test_symlinked_folders_are_not_followed(self, drive):
+        (drive / "photos" / "loop").symlink_to(drive)
+
+        report = index_drive(str(drive))
+
+        assert report["files"] == 5
+        assert "photos/loop" in indexed_paths(drive)
+        assert not any(path.startswith("photos/loop/") for path in indexed_paths(drive))
+
+class TestIncrementalIndexDrive:
+    def test_unchanged_folders_are_not_listed(self, drive):
+        settle(drive)
+        index_drive(str(drive))
+
+        with patch("src.services.api.file.drive_indexer.iter_directory") as mock_iter_directory:
+            report = index_drive(str(drive))
+
+        mock_iter_directory.assert_not_called()
+        assert report["skipped_directories"] == 5
+        assert report["files"] == 5
+        assert report["removed"] == 0
+        assert len(indexed_paths(drive)) == 10
+
+    def test_only_changed_folders_are_listed(self, drive):
+        settle(drive)
+        index_drive(str(drive))
+        (drive / "photos" / "trip" / "new.jpg").write_bytes(b"x")
+        (drive / "videos" / "c.mp4").unlink()
+
+        report = index_drive(str(drive))
+
+        assert report["skipped_directories"] == 3
+        assert report["removed"] == 1
+        assert "photos/trip/new.jpg" in indexed_paths(drive)
+        assert "videos/c.mp4" not in indexed_paths(drive)
+
+    def test_full_pass_lists_everything(self, drive):
+        settle(drive)
+        index_drive(str(drive))
+
+        assert index_drive(str(drive), incremental=False)["skipped_directories"] == 0
+
+    def test_moved_folders_keep_their_subtree(self, drive):
+        (drive / "photos" / "trip" / "deep").mkdir()
+        (drive / "photos" / "trip" / "deep" / "f.jpg").write_bytes(b"x")
+        settle(drive)
+        index_drive(str(drive))
+        inode = os.stat(drive / "photos" / "trip" / "deep" / "f.jpg").st_ino
+
+        (drive / "photos" / "trip").rename(drive / "videos" / "holiday")
+        report = index_drive(str(drive))
+
+        assert report["renamed"] == 1
+        assert report["removed"] == 0
+        assert not any(path.startswith("photos/trip") for path in indexed_paths(drive))
+        moved = get_indexed_file(str(drive / "videos" / "holiday" / "deep" / "f.jpg"))
+        assert moved.inode == inode
+        assert moved.parent == str(drive / "videos" / "holiday" / "deep")
+        assert get_indexed_file(str(drive / "videos" / "holiday" / "b.jpg")).category == "videos"
+
+    def test_renamed_folders_are_not_listed_again(self, drive):
+        settle(drive)
+        index_drive(str(drive))
+
+        (drive / "photos" / "trip").rename(drive / "photos" / "holiday")
+        report = index_drive(str(drive))
+
+        assert report["renamed"] == 1
+        # Everything but photos, whose entries changed
+        assert report["skipped_directories"] == 4
+        assert "photos/holiday/b.jpg" in indexed_paths(drive)
+
+    def test_renamed_files_are_matched_by_inode(self, drive):
+        settle(drive)
+        index_drive(str(drive))
+        (drive / "e.pdf").rename(drive / "report.pdf")
+        os.link(drive / "videos" / "c.mp4", drive / "videos" / "copy.mp4")
+
+        report = index_drive(str(drive))
+
+        # The hard link leaves its original in place, so only the rename is one
+        assert report["renamed"] == 1
+        assert {"report.pdf", "videos/c.mp4", "videos/copy.mp4"} <= indexed_paths(drive)
+        assert "e.pdf" not in indexed_paths(drive)
+
+    def test_interrupted_scan_resumes_from_its_checkpoint(self, drive):
+        iter_directory = drive_indexer.iter_directory
+        listed = []
+
+        def crashing_iter_directory(directory):
+            listed.append(directory)
+            if len(listed) == 3:
+                raise KeyboardInterrupt()
+            return iter_directory(directory)
+
+        with patch("src.services.api.file.drive_indexer.INDEX_BATCH_SIZE", 1), \
+                patch("src.services.api.file.drive_indexer.iter_directory", side_effect=crashing_iter_directory):
+            with pytest.raises(KeyboardInterrupt):
+                index_drive(str(drive))
+
+        checkpoint = get_index_checkpoint(str(drive.resolve()))
+        assert checkpoint.pending
+        started_ns = checkpoint.started_ns
+
+        report = index_drive(str(drive))
+
+        assert report["resumed"]
+        assert get_index_scan(str(drive.resolve())).started_ns == started_ns
+        assert get_index_checkpoint(str(drive.resolve())) is None
+        assert len(indexed_paths(drive)) == 10
+
+    def test_missing_drive_leaves_the_index_alone(self, drive, tmp_path):
+        index_drive(str(drive))
+
+        with pytest.raises(FileNotFoundError):
+            index_drive(str(tmp_path / "missing"))
+
+        assert len(indexed_paths(drive)) == 10
+
+class TestEnsureIndexed:
+    def settle(self, path):
+        os.utime(path, (time.time() - 60, time.time() - 60))
+
+    def test_stale_folders_are_rescanned(self, drive):
+        photos = str(drive / "photos")
+        self.settle(photos)
+        ensure_indexed(str(drive), [photos])
+        assert {"photos", "photos/a.jpg", "photos/trip"} <= indexed_paths(drive)
+
+        (drive / "photos" / "new.jpg").write_bytes(b"x")
+        ensure_indexed(str(drive), [photos])
+
+        assert "photos/new.jpg" in indexed_paths(drive)
+
+    def test_settled_folders_are_not_rescanned(self, drive):
+        photos = str(drive / "photos")
+        self.settle(photos)
+        ensure_indexed(str(drive), [photos])
+
+        with patch("src.services.api.file.drive_indexer.refresh_directory") as mock_refresh:
+            ensure_indexed(str(drive), [photos])
+
+        mock_refresh.assert_not_called()
+
+    def test_vanished_folders_are_dropped(self, drive):
+        index_drive(str(drive))
+        for path in [drive / "photos" / "trip" / "b.jpg", drive / "photos" / "trip", drive / "photos" / "a.jpg", drive / "photos"]:
+            path.unlink() if path.is_file() else path.rmdir()
+
+        ensure_indexed(str(drive), [str(drive / "photos")])
+
+        assert not any(path.startswith("photos") for path in indexed_paths(drive))
+
+class TestDriveIndexer:
+    def test_scan_all_reports_each_root(self, drive, tmp_path):
+        indexer = DriveIndexer(roots=lambda: [str(drive), str(tmp_path / "missing")])
+
+        with patch("builtins.print") as mock_print:
+            indexer.scan_all()
+
+        assert indexer.reports[str(drive)]["files"] == 5
+        assert str(tmp_path / "missing") not in indexer.reports
+        assert "DriveIndexer.scan_all" in mock_print.call_args[0][0]
+
+    def test_background_thread(self, drive):
+        indexer = DriveIndexer(interval=3600, roots=lambda: [str(drive)])
+        indexer.start()
+        try:
+            deadline = time.monotonic() + 5
+            while str(drive) not in indexer.reports and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert indexer.reports[str(drive)]["files"] == 5
+        finally:
+            indexer.stop()
+        assert not indexer.thread.is_alive()
+
+    def test_disabled_with_zero_interval(self):
+        indexer = DriveIndexer(interval=0, roots=lambda: [])
+        indexer.start()
+        assert indexer.thread is None
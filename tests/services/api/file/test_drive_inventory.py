@@ -0,0 +1,109 @@
+import asyncio
+import threading
+import time
+from unittest.mock import MagicMock, patch
+from src.services.api.file.drive_inventory import DriveInventory
+
+def partition(mountpoint, fstype="ext4"):
+    mock_partition = MagicMock()
+    mock_partition.device = f"/dev/{mountpoint.rsplit('/', 1)[-1]}"
+    mock_partition.mountpoint = mountpoint
+    mock_partition.fstype = fstype
+    mock_partition.opts = "rw"
+    return mock_partition
+
+def usage(used):
+    mock_usage = MagicMock()
+    mock_usage.total = 1000
+    mock_usage.used = used
+    mock_usage.free = 1000 - used
+    mock_usage.percent = used / 10
+    return mock_usage
+
+class TestDriveInventory:
+    def test_sample__hung_mount_times_out(self):
+        inventory = DriveInventory(interval=0, timeout=0.1)
+        released = threading.Event()
+
+        def disk_usage(mountpoint):
+            if mountpoint == "/mnt/stale":
+                released.wait(5)
+            return usage(500)
+
+        try:
+            with patch("psutil.disk_partitions", return_value=[partition("/mnt/stale", "nfs"), partition("/mnt/drive1")]), \
+                 patch("psutil.disk_usage", side_effect=disk_usage) as mock_disk_usage, \
+                 patch("builtins.print"):
+                started = time.monotonic()
+                snapshot = inventory.sample()
+                assert time.monotonic() - started < 2
+                assert [drive.mountpoint for drive in snapshot.drives] == ["/mnt/drive1"]
+
+                # Not probed again while its first call still hangs
+                inventory.sample()
+                assert [call.args[0] for call in mock_disk_usage.call_args_list].count("/mnt/stale") == 1
+
+                released.set()
+                inventory.hung["/mnt/stale"].result(timeout=5)
+                snapshot = inventory.sample()
+                assert [drive.mountpoint for drive in snapshot.drives] == ["/mnt/stale", "/mnt/drive1"]
+        finally:
+            released.set()
+
+    def test_sample__version_changes_only_with_the_drives(self):
+        inventory = DriveInventory(interval=0)
+
+        with patch("psutil.disk_partitions", return_value=[partition("/mnt/drive1")]), \
+             patch("psutil.disk_usage", return_value=usage(500)):
+            assert inventory.sample().version == 1
+            assert inventory.sample().version == 1
+            with patch("psutil.disk_usage", return_value=usage(600)):
+                assert inventory.sample().version == 2
+
+    def test_is_stale(self):
+        inventory = DriveInventory(interval=30)
+        assert inventory.is_stale(inventory.snapshot) is True
+
+        with patch("psutil.disk_partitions", return_value=[]):
+            snapshot = inventory.sample()
+        assert inventory.is_stale(snapshot) is False
+
+        with patch("src.services.api.file.drive_inventory.time.monotonic", return_value=snapshot.sampled_at + 30):
+            assert inventory.is_stale(snapshot) is True
+
+    def test_subscribers_are_woken_on_change(self):
+        inventory = DriveInventory(interval=0)
+
+        async def wait_for_change():
+            _, changed = subscription = inventory.subscribe()
+            with patch("psutil.disk_partitions", return_value=[partition("/mnt/drive1")]), \
+                 patch("psutil.disk_usage", return_value=usage(500)):
+                await asyncio.to_thread(inventory.sample)
+            await asyncio.wait_for(changed.wait(), timeout=5)
+            inventory.unsubscribe(subscription)
+            return inventory.snapshot.version
+
+        assert asyncio.run(wait_for_change()) == 1
+        assert inventory.subscribers == set()
+
+    def test_background_thread(self):
+        inventory = DriveInventory(interval=3600)
+
+        with patch("psutil.disk_partitions", return_value=[partition("/mnt/drive1")]), \
+             patch("psutil.disk_usage", return_value=usage(500)):
+            inventory.start()
+            try:
+                deadline = time.monotonic() + 5
+                while inventory.snapshot is None and time.monotonic() < deadline:
+                    time.sleep(0.01)
+                assert inventory.is_stale(inventory.snapshot) is False
+            finally:
+                inventory.stop()
+
+        assert [drive.mountpoint for drive in inventory.snapshot.drives] == ["/mnt/drive1"]
+        assert not inventory.thread.is_alive()
+
+    def test_disabled_with_zero_interval(self):
+        inventory = DriveInventory(interval=0)
+        inventory.start()
+        assert inventory.thread is None
@@ -0,0 +1,85 @@
+import pytest
+from src.services.api.file.file_delivery import FileRangeResponse, PATHSEND, ZEROCOPYSEND, segments_length
+
+CONTENT = bytes(range(256)) * 8
+
+async def deliver(response, extensions=None):
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == ZEROCOPYSEND:
+            # Emulate the server's sendfile by reading from the supplied descriptor
+            file_like = message["file"]
+            file_like.seek(message["offset"])
+            message = {**message, "data": file_like.read(message["count"])}
+        messages.append(message)
+
+    scope = {"type": "http", "method": "GET", "extensions": extensions or {}}
+    await response(scope, receive, send)
+    return messages
+
+def body_of(messages):
+    body = b""
+    for message in messages:
+        body += message.get("body", b"") or message.get("data", b"")
+    return body
+
+@pytest.fixture
+def video(tmp_path):
+    path = tmp_path / "video.mp4"
+    path.write_bytes(CONTENT)
+    return path
+
+class TestFileRangeResponse:
+    @pytest.mark.asyncio
+    async def test_whole_file_uses_pathsend_when_available(self, video):
+        response = FileRangeResponse(video, len(CONTENT), media_type="video/mp4")
+        messages = await deliver(response, {PATHSEND: {}})
+
+        assert messages[0]["status"] == 200
+        assert (b"content-length", str(len(CONTENT)).encode()) in messages[0]["headers"]
+        assert messages[1] == {"type": PATHSEND, "path": str(video)}
+        assert len(messages) == 2
+
+    @pytest.mark.asyncio
+    async def test_ranges_use_zerocopysend_when_available(self, video):
+        response = FileRangeResponse(video, len(CONTENT), [(10, 19)], media_type="video/mp4")
+        messages = await deliver(response, {PATHSEND: {}, ZEROCOPYSEND: {}})
+
+        assert messages[0]["status"] == 206
+        assert (b"content-range", f"bytes 10-19/{len(CONTENT)}".encode()) in messages[0]["headers"]
+        assert messages[1]["type"] == ZEROCOPYSEND
+        assert (messages[1]["offset"], messages[1]["count"]) == (10, 10)
+        assert body_of(messages) == CONTENT[10:20]
+        assert messages[-1] == {"type": "http.response.body", "body": b"", "more_body": False}
+
+    @pytest.mark.asyncio
+    async def test_buffered_fallback(self, video):
+        response = FileRangeResponse(video, len(CONTENT), [(100, 2047)], media_type="video/mp4")
+        messages = await deliver(response)
+
+        assert all(message["type"] != ZEROCOPYSEND for message in messages)
+        assert body_of(messages) == CONTENT[100:2048]
+
+    @pytest.mark.asyncio
+    async def test_multipart_length_matches_body(self, video):
+        response = FileRangeResponse(video, len(CONTENT), [(0, 3), (500, 510)], media_type="video/mp4")
+        messages = await deliver(response, {ZEROCOPYSEND: {}})
+
+        headers = dict(messages[0]["headers"])
+        body = body_of(messages)
+        assert headers[b"content-type"].startswith(b"multipart/byteranges; boundary=")
+        assert int(headers[b"content-length"]) == len(body) == segments_length(response.segments)
+        assert CONTENT[500:511] in body
+
+    @pytest.mark.asyncio
+    async def test_empty_file(self, tmp_path):
+        path = tmp_path / "empty.txt"
+        path.write_bytes(b"")
+
+        messages = await deliver(FileRangeResponse(path, 0, media_type="text/plain"))
+        assert (b"content-length", b"0") in messages[0]["headers"]
+        assert body_of(messages) == b""
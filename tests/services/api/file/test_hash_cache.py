@@ -0,0 +1,55 @@
+import hashlib
+import os
+import pytest
+from types import SimpleNamespace
+from unittest.mock import patch
+from src.services.api.file.hash_cache import cached_file_hashes, hash_file
+
+@pytest.fixture
+def hash_index():
+    """In-memory stand-in for the file_hashes table."""
+    records = {}
+
+    def by_paths(paths):
+        return [SimpleNamespace(**records[path]) for path in paths if path in records]
+
+    def upsert(parameters_list):
+        records.update((parameters["path"], parameters) for parameters in parameters_list)
+
+    with patch('src.services.api.file.hash_cache.get_file_hashes_by_paths', side_effect=by_paths), \
+         patch('src.services.api.file.hash_cache.upsert_file_hashes', side_effect=upsert):
+        yield records
+
+class TestHashCache:
+    def test_hash_file(self, tmp_path):
+        (tmp_path / "a.jpg").write_bytes(b"photo" * 500000)
+        assert hash_file(tmp_path / "a.jpg") == hashlib.sha256(b"photo" * 500000).hexdigest()
+
+    @pytest.mark.asyncio
+    async def test_hashes_are_cached_by_inode_and_mtime(self, tmp_path, hash_index):
+        path = tmp_path / "a.jpg"
+        path.write_bytes(b"photo")
+
+        with patch('src.services.api.file.hash_cache.hash_file', wraps=hash_file) as mock_hash:
+            first = await cached_file_hashes([(path, path.stat())])
+            second = await cached_file_hashes([(path, path.stat())])
+
+        assert first == second == {str(path): hashlib.sha256(b"photo").hexdigest()}
+        assert mock_hash.call_count == 1
+        assert hash_index[str(path)]["inode"] == path.stat().st_ino
+
+    @pytest.mark.asyncio
+    async def test_changed_file_is_rehashed(self, tmp_path, hash_index):
+        path = tmp_path / "a.jpg"
+        path.write_bytes(b"photo")
+        await cached_file_hashes([(path, path.stat())])
+
+        path.write_bytes(b"edit!")
+        os.utime(path, ns=(1, 1))
+
+        assert await cached_file_hashes([(path, path.stat())]) == {str(path): hashlib.sha256(b"edit!").hexdigest()}
+
+    @pytest.mark.asyncio
+    async def test_nothing_to_hash(self, hash_index):
+        assert await cached_file_hashes([]) == {}
+        assert hash_index == {}
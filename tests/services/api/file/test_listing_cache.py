@@ -0,0 +1,181 @@
+import os
+import struct
+import sys
+import time
+import pytest
+from unittest.mock import patch
+from src.services.api.file import listing_cache
+from src.services.api.file.listing_cache import (
+    IN_CREATE,
+    IN_Q_OVERFLOW,
+    InotifyWatcher,
+    ListingCache,
+    parse_events,
+)
+
+class StubWatcher:
+    def __init__(self, on_change):
+        self.on_change = on_change
+        self.watched = set()
+
+    def watch(self, path):
+        self.watched.add(path)
+        return True
+
+    def unwatch(self, path):
+        self.watched.discard(path)
+
+def settled(directory):
+    """Backdate a folder's mtime past the settle window."""
+    os.utime(directory, (time.time() - 60, time.time() - 60))
+
+def make_folder(path, names):
+    path.mkdir(exist_ok=True)
+    for name in names:
+        (path / name).write_bytes(b"x")
+    settled(path)
+    return path
+
+class TestParseEvents:
+    def test_events_with_padded_names(self):
+        data = struct.pack("iIII", 1, IN_CREATE, 0, 16) + b"photo.jpg".ljust(16, b"\0")
+        data += struct.pack("iIII", -1, IN_Q_OVERFLOW, 0, 0)
+
+        assert parse_events(data) == [(1, IN_CREATE, "photo.jpg"), (-1, IN_Q_OVERFLOW, "")]
+
+class TestListingCacheWithWatcher:
+    def test_hit_until_invalidated(self, tmp_path):
+        folder = make_folder(tmp_path / "photos", ["b.jpg", "a.jpg"])
+        cache = ListingCache(watcher_factory=StubWatcher)
+
+        entries, keys = cache.get(folder)
+        assert [entry["name"] for entry in entries] == ["a.jpg", "b.jpg"]
+
+        with patch("src.services.api.file.listing_cache.scan_directory") as mock_scan:
+            assert cache.get(folder)[0] is entries
+            mock_scan.assert_not_called()
+
+        (folder / "c.jpg").write_bytes(b"x")
+        cache.watcher.on_change(str(folder))
+        assert [entry["name"] for entry in cache.get(folder)[0]] == ["a.jpg", "b.jpg", "c.jpg"]
+
+    def test_keyed_by_sort_and_filter(self, tmp_path):
+        folder = make_folder(tmp_path / "photos", ["a.jpg", "b.txt"])
+        cache = ListingCache(watcher_factory=StubWatcher)
+
+        assert [entry["name"] for entry in cache.get(folder, extensions=["txt"])[0]] == ["b.txt"]
+        assert len(cache.get(folder, sort="size")[0]) == 2
+        assert len(cache.listings) == 2
+
+        cache.invalidate(str(folder))
+        assert len(cache.listings) == 0
+        assert cache.entry_count == 0
+
+    def test_change_during_scan_is_not_stored(self, tmp_path):
+        folder = make_folder(tmp_path / "photos", ["a.jpg"])
+        cache = ListingCache(watcher_factory=StubWatcher)
+        scan_directory = listing_cache.scan_directory
+
+        def racing_scan(directory):
+            entries = scan_directory(directory)
+            cache.invalidate(str(folder))
+            return entries
+
+        with patch("src.services.api.file.listing_cache.scan_directory", side_effect=racing_scan):
+            cache.get(folder)
+
+        assert cache.listings == {}
+
+    def test_overflow_forgets_everything(self, tmp_path):
+        cache = ListingCache(watcher_factory=StubWatcher)
+        cache.get(make_folder(tmp_path / "a", ["1.jpg"]))
+        cache.get(make_folder(tmp_path / "b", ["2.jpg"]))
+
+        cache.watcher.on_change(None)
+
+        assert cache.listings == {}
+        assert cache.entry_count == 0
+
+    def test_lru_eviction_by_count(self, tmp_path):
+        cache = ListingCache(max_listings=2, watcher_factory=StubWatcher)
+        folders = [make_folder(tmp_path / name, ["1.jpg"]) for name in ["a", "b", "c"]]
+
+        cache.get(folders[0])
+        cache.get(folders[1])
+        cache.get(folders[0])
+        cache.get(folders[2])
+
+        assert [key[0] for key in cache.listings] == [str(folders[0]), str(folders[2])]
+        assert cache.watcher.watched == {str(folders[0]), str(folders[2])}
+
+    def test_eviction_by_entries(self, tmp_path):
+        cache = ListingCache(max_entries=5, watcher_factory=StubWatcher)
+        small = make_folder(tmp_path / "small", ["1.jpg", "2.jpg"])
+        large = make_folder(tmp_path / "large", [f"{index}.jpg" for index in range(4)])
+        huge = make_folder(tmp_path / "huge", [f"{index}.jpg" for index in range(6)])
+
+        cache.get(small)
+        cache.get(large)
+        assert [key[0] for key in cache.listings] == [str(large)]
+        assert cache.entry_count == 4
+
+        # A listing larger than the whole cache is served but never stored
+        assert len(cache.get(huge)[0]) == 6
+        assert str(huge) not in cache.watcher.watched
+        assert cache.entry_count == 4
+
+class TestListingCacheWithoutWatcher:
+    def test_mtime_validation(self, tmp_path):
+        folder = make_folder(tmp_path / "photos", ["a.jpg"])
+        cache = ListingCache(watcher_factory=lambda on_change: None)
+
+        entries, _ = cache.get(folder)
+        assert cache.get(folder)[0] is entries
+
+        (folder / "b.jpg").write_bytes(b"x")
+        assert [entry["name"] for entry in cache.get(folder)[0]] == ["a.jpg", "b.jpg"]
+
+    def test_recently_changed_folder_is_not_cached(self, tmp_path):
+        folder = tmp_path / "photos"
+        folder.mkdir()
+        cache = ListingCache(watcher_factory=lambda on_change: None)
+
+        cache.get(folder)
+
+        assert cache.listings == {}
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux only")
+class TestInotifyWatcher:
+    def wait_for(self, condition):
+        deadline = time.monotonic() + 2
+        while not condition() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return condition()
+
+    def test_visible_changes_invalidate(self, tmp_path):
+        folder = make_folder(tmp_path / "photos", ["a.jpg"])
+        cache = ListingCache()
+        cache.get(folder)
+        assert cache.listings
+
+        (folder / "b.jpg").write_bytes(b"x")
+
+        assert self.wait_for(lambda: not cache.listings)
+        assert [entry["name"] for entry in cache.get(folder)[0]] == ["a.jpg", "b.jpg"]
+
+    def test_hidden_files_are_ignored_until_renamed(self, tmp_path):
+        folder = make_folder(tmp_path / "photos", ["a.jpg"])
+        changes = []
+        watcher = InotifyWatcher.create(changes.append)
+        assert watcher.watch(str(folder))
+
+        (folder / ".b.jpg.part").write_bytes(b"x")
+        time.sleep(0.1)
+        assert changes == []
+
+        os.replace(folder / ".b.jpg.part", folder / "b.jpg")
+        assert self.wait_for(lambda: changes)
+        assert set(changes) == {str(folder)}
+
+        watcher.unwatch(str(folder))
+        assert not watcher.is_watched(str(folder))
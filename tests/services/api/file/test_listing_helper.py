@@ -0,0 +1,101 @@
+import pytest
+from src.services.api.file.listing_helper import (
+    decode_cursor,
+    encode_cursor,
+    matches_filter,
+    page_of,
+    paginate,
+    parse_extensions,
+    sort_entries,
+    sort_key,
+)
+
+def entry(name, is_dir=False, size=0, mtime=0.0):
+    return {"name": name, "is_dir": is_dir, "size": size, "mtime": mtime}
+
+ENTRIES = [
+    entry("b.jpg", size=300, mtime=3.0),
+    entry("A.png", size=100, mtime=1.0),
+    entry("photos", is_dir=True, size=4096, mtime=2.0),
+    entry("c.txt", size=100, mtime=1.0),
+]
+
+def names(entries):
+    return [entry["name"] for entry in entries]
+
+class TestSortKey:
+    def test_name_is_case_insensitive(self):
+        assert names(sorted(ENTRIES, key=lambda e: sort_key(e, "name"))) == ["A.png", "b.jpg", "c.txt", "photos"]
+
+    def test_ties_break_on_name(self):
+        assert names(sorted(ENTRIES, key=lambda e: sort_key(e, "mtime"))) == ["A.png", "c.txt", "photos", "b.jpg"]
+
+    def test_folders_sort_first_by_size_and_type(self):
+        assert names(sorted(ENTRIES, key=lambda e: sort_key(e, "size")))[0] == "photos"
+        assert names(sorted(ENTRIES, key=lambda e: sort_key(e, "type"))) == ["photos", "A.png", "b.jpg", "c.txt"]
+
+class TestCursor:
+    def test_round_trip(self):
+        cursor = encode_cursor("mtime", "desc", (1.5, "a", "a"))
+        assert decode_cursor(cursor, "mtime", "desc") == (1.5, "a", "a")
+
+    def test_cursor_from_another_order_is_rejected(self):
+        cursor = encode_cursor("name", "asc", ("a", "a"))
+        with pytest.raises(ValueError):
+            decode_cursor(cursor, "size", "asc")
+
+    @pytest.mark.parametrize("cursor", ["not base64!", "bm90IGpzb24=", "W10="])
+    def test_malformed_cursor(self, cursor):
+        with pytest.raises(ValueError):
+            decode_cursor(cursor, "name", "asc")
+
+class TestPaginate:
+    @pytest.mark.parametrize("sort", ["name", "mtime", "size", "type"])
+    @pytest.mark.parametrize("order", ["asc", "desc"])
+    def test_pages_cover_every_entry_once_in_order(self, sort, order):
+        expected = names(sorted(ENTRIES, key=lambda e: sort_key(e, sort), reverse=order == "desc"))
+
+        seen, cursor = [], None
+        while True:
+            page, cursor = paginate(ENTRIES, sort, order, limit=3, cursor=cursor)
+            seen += names(page)
+            if cursor is None:
+                break
+
+        assert seen == expected
+
+    def test_without_limit_everything_is_returned(self):
+        page, cursor = paginate(ENTRIES)
+        assert len(page) == 4
+        assert cursor is None
+
+    def test_last_full_page_has_no_cursor(self):
+        _, cursor = paginate(ENTRIES, limit=4)
+        assert cursor is None
+
+    def test_cursor_with_wrong_key_types(self):
+        cursor = encode_cursor("name", "asc", (1, 2))
+        with pytest.raises(ValueError):
+            paginate(ENTRIES, cursor=cursor)
+
+    def test_pages_from_a_sorted_listing(self):
+        entries, keys = sort_entries(ENTRIES, "size")
+        assert [key for key in keys] == sorted(keys)
+
+        first, cursor = page_of(entries, keys, "size", "desc", limit=2)
+        second, _ = page_of(entries, keys, "size", "desc", limit=2, cursor=cursor)
+        assert first + second == list(reversed(entries))
+
+class TestFilters:
+    def test_type_filter(self):
+        assert names(e for e in ENTRIES if matches_filter(e, "folder", None)) == ["photos"]
+        assert len([e for e in ENTRIES if matches_filter(e, "file", None)]) == 3
+
+    def test_extension_filter(self):
+        extensions = parse_extensions("JPG, .png")
+        assert extensions == ["jpg", "png"]
+        assert names(e for e in ENTRIES if matches_filter(e, None, extensions)) == ["b.jpg", "A.png"]
+
+    def test_no_extension(self):
+        assert parse_extensions("") is None
+        assert not matches_filter(entry("README"), None, ["md"])
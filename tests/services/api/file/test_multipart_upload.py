@@ -0,0 +1,290 @@
+import asyncio
+import os
+import pytest
+from types import SimpleNamespace
+from unittest.mock import patch
+from src.services.api.file import multipart_upload
+from src.services.api.file.multipart_upload import (
+    FilePartWriter,
+    MultipartUploadError,
+    MultipartUploadReceiver,
+)
+
+BOUNDARY = "testboundary"
+CONTENT_TYPE = f"multipart/form-data; boundary={BOUNDARY}"
+
+def build_body(location, files):
+    parts = []
+    if location is not None:
+        parts.append(
+            f'--{BOUNDARY}\r\nContent-Disposition: form-data; name="file_path_location"\r\n\r\n{location}\r\n'.encode()
+        )
+    for filename, content in files:
+        parts.append(
+            f'--{BOUNDARY}\r\nContent-Disposition: form-data; name="files"; filename="{filename}"\r\n'
+            f'Content-Type: application/octet-stream\r\n\r\n'.encode() + content + b"\r\n"
+        )
+    return b"".join(parts) + f"--{BOUNDARY}--\r\n".encode()
+
+async def chunked(body, size):
+    for index in range(0, len(body), size):
+        yield body[index:index + size]
+
+class TestMultipartUploadReceiver:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("chunk_size", [1, 7, 4096, 1 << 20])
+    async def test_files_are_written_for_any_chunking(self, tmp_path, chunk_size):
+        files = [("a.jpg", b"first file"), ("b.bin", bytes(range(256)) * 100)]
+        body = build_body(str(tmp_path), files)
+
+        receiver = MultipartUploadReceiver(CONTENT_TYPE, len(body))
+        uploaded = await receiver.receive(chunked(body, chunk_size))
+
+        assert [result["filename"] for result in uploaded] == ["a.jpg", "b.bin"]
+        assert [result["size"] for result in uploaded] == [10, 25600]
+        assert all(result["status"] == "uploaded" and result["error"] is None for result in uploaded)
+        assert (tmp_path / "a.jpg").read_bytes() == b"first file"
+        assert (tmp_path / "b.bin").read_bytes() == bytes(range(256)) * 100
+        assert sorted(path.name for path in tmp_path.iterdir()) == ["a.jpg", "b.bin"]
+
+    @pytest.mark.asyncio
+    async def test_location_given_up_front(self, tmp_path):
+        body = build_body(None, [("a.jpg", b"abc")])
+
+        receiver = MultipartUploadReceiver(CONTENT_TYPE, file_path_location=str(tmp_path))
+        assert await receiver.receive(chunked(body, 10)) == [
+            {"filename": "a.jpg", "size": 3, "status": "uploaded", "error": None, "deduplicated": False},
+        ]
+
+    @pytest.mark.asyncio
+    async def test_files_before_location_are_rejected(self, tmp_path):
+        body = build_body(None, [("a.jpg", b"abc")])
+
+        with pytest.raises(MultipartUploadError):
+            await MultipartUploadReceiver(CONTENT_TYPE).receive(chunked(body, 10))
+
+    def test_missing_boundary(self):
+        with pytest.raises(MultipartUploadError):
+            MultipartUploadReceiver("multipart/form-data")
+
+    @pytest.mark.asyncio
+    async def test_oversized_field_is_rejected(self, tmp_path):
+        body = build_body("x" * (multipart_upload.MAX_FIELD_SIZE + 1), [])
+
+        with pytest.raises(MultipartUploadError):
+            await MultipartUploadReceiver(CONTENT_TYPE).receive(chunked(body, 4096))
+
+    @pytest.mark.asyncio
+    async def test_failed_file_leaves_no_temp_file(self, tmp_path):
+        body = build_body(str(tmp_path), [("a.jpg", b"abc" * 1000)])
+
+        async def broken_stream():
+            yield body[:len(body) // 2]
+            raise ConnectionError("client went away")
+
+        with pytest.raises(ConnectionError):
+            await MultipartUploadReceiver(CONTENT_TYPE).receive(broken_stream())
+        assert list(tmp_path.iterdir()) == []
+
+    @pytest.mark.asyncio
+    async def test_truncated_body_is_rejected(self, tmp_path):
+        body = build_body(str(tmp_path), [("a.jpg", b"abc" * 1000)])
+
+        with pytest.raises(MultipartUploadError, match="middle of a file"):
+            await MultipartUploadReceiver(CONTENT_TYPE).receive(chunked(body[:len(body) // 2], 100))
+        assert list(tmp_path.iterdir()) == []
+
+    @pytest.mark.asyncio
+    async def test_body_without_files_is_rejected(self, tmp_path):
+        body = build_body(str(tmp_path), [])
+
+        with pytest.raises(MultipartUploadError, match="No files"):
+            await MultipartUploadReceiver(CONTENT_TYPE).receive(chunked(body, 100))
+
+    @pytest.mark.asyncio
+    async def test_stored_name_is_reported(self, tmp_path):
+        body = build_body(str(tmp_path), [("../../a.jpg", b"abc")])
+
+        results = await MultipartUploadReceiver(CONTENT_TYPE).receive(chunked(body, 100))
+        assert [result["filename"] for result in results] == ["a.jpg"]
+
+    @pytest.mark.asyncio
+    async def test_only_first_file_reserves_rest_of_body(self, tmp_path):
+        files = [("a.jpg", b"a" * 100), ("b.jpg", b"b" * 100), ("c.jpg", b"c" * 100)]
+        body = build_body(str(tmp_path), files)
+        receiver = MultipartUploadReceiver(CONTENT_TYPE, len(body))
+
+        reserved = []
+        original_open = FilePartWriter.open
+        async def record_open(writer):
+            reserved.append(writer.preallocate)
+            await original_open(writer)
+
+        with patch.object(multipart_upload, "PREALLOCATE", True), \
+             patch.object(FilePartWriter, "open", record_open):
+            await receiver.receive(chunked(body, 64))
+
+        assert 0 < reserved[0] <= len(body)
+        assert reserved[1:] == [0, 0]
+
+    def test_part_content_length_is_reserved(self):
+        receiver = MultipartUploadReceiver(CONTENT_TYPE, 10_000)
+        receiver.file_parts = 2
+
+        with patch.object(multipart_upload, "PREALLOCATE", True):
+            assert receiver.preallocate_size(4096) == 4096
+            assert receiver.preallocate_size(None) == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_file_does_not_abort_the_batch(self, tmp_path):
+        files = [("a.jpg", b"first"), ("..", b"bad name"), ("c.jpg", b"third")]
+        body = build_body(str(tmp_path), files)
+
+        original_finish = FilePartWriter._finish
+        def failing_finish(writer):
+            if writer.filename == "a.jpg":
+                raise OSError("disk full")
+            original_finish(writer)
+
+        with patch.object(FilePartWriter, "_finish", failing_finish):
+            results = await MultipartUploadReceiver(CONTENT_TYPE).receive(chunked(body, 16))
+
+        assert [(result["filename"], result["status"]) for result in results] == [
+            ("a.jpg", "failed"), ("..", "failed"), ("c.jpg", "uploaded"),
+        ]
+        assert results[0]["error"] == "disk full"
+        assert sorted(path.name for path in tmp_path.iterdir()) == ["c.jpg"]
+
+    @pytest.mark.asyncio
+    async def test_files_in_flight_are_bounded(self, tmp_path):
+        files = [(f"{index}.jpg", bytes([index]) * 5000) for index in range(10)]
+        body = build_body(str(tmp_path), files)
+
+        in_flight = 0
+        peak = 0
+        original_open = FilePartWriter.open
+        original_close = FilePartWriter.close
+        async def tracked_open(writer):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await original_open(writer)
+        async def tracked_close(writer):
+            nonlocal in_flight
+            await asyncio.sleep(0.01)
+            await original_close(writer)
+            in_flight -= 1
+
+        with patch.object(multipart_upload, "UPLOAD_WORKERS", 2), \
+             patch.object(FilePartWriter, "open", tracked_open), \
+             patch.object(FilePartWriter, "close", tracked_close):
+            results = await MultipartUploadReceiver(CONTENT_TYPE).receive(chunked(body, 1024))
+
+        assert peak == 2
+        assert all(result["status"] == "uploaded" for result in results)
+        assert all((tmp_path / filename).read_bytes() == content for filename, content in files)
+
+    @pytest.mark.asyncio
+    async def test_parser_waits_for_a_slow_writer(self, tmp_path):
+        body = build_body(str(tmp_path), [("a.jpg", b"x" * 64 * 100)])
+        release = asyncio.Event()
+        consumed = 0
+
+        async def counting_stream():
+            nonlocal consumed
+            for chunk in [body[index:index + 64] for index in range(0, len(body), 64)]:
+                consumed += 1
+                yield chunk
+
+        original_write = FilePartWriter.write
+        async def blocked_write(writer, data):
+            await release.wait()
+            await original_write(writer, data)
+
+        with patch.object(multipart_upload, "QUEUE_DEPTH", 2), \
+             patch.object(FilePartWriter, "write", blocked_write):
+            receiving = asyncio.create_task(MultipartUploadReceiver(CONTENT_TYPE).receive(counting_stream()))
+            await asyncio.sleep(0.05)
+
+            # One chunk held by the writer, two queued, one more waiting on put()
+            assert consumed < 10
+            release.set()
+            results = await receiving
+
+        assert results[0]["size"] == 6400
+
+@pytest.fixture
+def hash_index():
+    """In-memory stand-in for the file_hashes table."""
+    records = {}
+
+    def by_content(hash, size):
+        return [SimpleNamespace(**record) for record in records.values() if (record["hash"], record["size"]) == (hash, size)]
+
+    def upsert(parameters):
+        records[parameters["path"]] = parameters
+
+    with patch('src.services.api.file.multipart_upload.get_file_hashes_by_content', side_effect=by_content), \
+         patch('src.services.api.file.multipart_upload.upsert_file_hash', side_effect=upsert):
+        yield records
+
+class TestDeduplication:
+    @pytest.mark.asyncio
+    async def test_duplicate_is_hardlinked(self, tmp_path, hash_index):
+        body = build_body(str(tmp_path), [("a.jpg", b"same photo"), ("b.jpg", b"same photo"), ("c.jpg", b"other")])
+
+        with patch.object(multipart_upload, "DEDUP_MODE", "hardlink"), \
+             patch.object(multipart_upload, "UPLOAD_WORKERS", 1):
+            results = await MultipartUploadReceiver(CONTENT_TYPE).receive(chunked(body, 16))
+
+        assert [result["deduplicated"] for result in results] == [False, True, False]
+        assert (tmp_path / "b.jpg").read_bytes() == b"same photo"
+        assert os.stat(tmp_path / "a.jpg").st_ino == os.stat(tmp_path / "b.jpg").st_ino
+        assert sorted(path.name for path in tmp_path.iterdir()) == ["a.jpg", "b.jpg", "c.jpg"]
+        assert len(hash_index) == 3
+
+    @pytest.mark.asyncio
+    async def test_dedup_off_does_not_hash(self, tmp_path, hash_index):
+        writer = FilePartWriter(tmp_path, "a.jpg", dedup_mode="off")
+        await writer.open()
+        await writer.write(b"abc")
+        await writer.close()
+
+        assert writer.hash is None
+        assert hash_index == {}
+
+class TestFilePartWriter:
+    @pytest.mark.asyncio
+    async def test_writes_are_buffer_aligned(self, tmp_path):
+        writer = FilePartWriter(tmp_path, "movie.mp4")
+        await writer.open()
+
+        write_sizes = []
+        original_write = writer.file_like.write
+        def record_write(data):
+            write_sizes.append(len(data))
+            return original_write(data)
+        writer.file_like.write = record_write
+
+        with patch.object(multipart_upload, "WRITE_BUFFER_SIZE", 1024):
+            for _ in range(10):
+                await writer.write(b"x" * 700)
+            await writer.close()
+
+        assert write_sizes[:-1] and all(size % 1024 == 0 for size in write_sizes[:-1])
+        assert sum(write_sizes) == 7000
+        assert (tmp_path / "movie.mp4").stat().st_size == 7000
+
+    @pytest.mark.asyncio
+    async def test_preallocation_is_truncated_to_written_size(self, tmp_path):
+        writer = FilePartWriter(tmp_path, "movie.mp4", preallocate=1 << 20)
+        await writer.open()
+        await writer.write(b"tiny")
+        await writer.close()
+
+        assert (tmp_path / "movie.mp4").read_bytes() == b"tiny"
+
+    def test_unsafe_filename_is_stripped(self, tmp_path):
+        writer = FilePartWriter(tmp_path, "../../evil.sh")
+        assert writer.destination == tmp_path / "evil.sh"
+        assert writer.filename == "../../evil.sh"
@@ -0,0 +1,94 @@
+import pytest
+from src.services.api.file.range_helper import (
+    MAX_RANGES,
+    RangeNotSatisfiable,
+    coalesce_ranges,
+    content_range,
+    http_date,
+    if_range_matches,
+    parse_range_header,
+)
+
+class TestParseRangeHeader:
+    def test_single_range(self):
+        assert parse_range_header("bytes=0-99", 1000) == [(0, 99)]
+
+    def test_open_ended_range(self):
+        assert parse_range_header("bytes=900-", 1000) == [(900, 999)]
+
+    def test_suffix_range(self):
+        assert parse_range_header("bytes=-100", 1000) == [(900, 999)]
+        assert parse_range_header("bytes=-5000", 1000) == [(0, 999)]
+
+    def test_end_is_clamped_to_file_size(self):
+        assert parse_range_header("bytes=500-5000", 1000) == [(500, 999)]
+
+    def test_multiple_ranges(self):
+        assert parse_range_header("bytes=0-9, 20-29,-5", 1000) == [(0, 9), (20, 29), (995, 999)]
+
+    def test_unsatisfiable_ranges_are_dropped(self):
+        assert parse_range_header("bytes=0-9,2000-3000", 1000) == [(0, 9)]
+
+    def test_all_ranges_unsatisfiable(self):
+        with pytest.raises(RangeNotSatisfiable):
+            parse_range_header("bytes=1000-", 1000)
+        with pytest.raises(RangeNotSatisfiable):
+            parse_range_header("bytes=-10", 0)
+
+    @pytest.mark.parametrize("header", ["items=0-9", "bytes=", "bytes=abc", "bytes=9-0", "bytes=-", "bytes=0-9;x"])
+    def test_malformed_headers_are_ignored(self, header):
+        assert parse_range_header(header, 1000) is None
+
+    def test_too_many_ranges_are_coalesced(self):
+        header = "bytes=" + ",".join(f"{i}-{i}" for i in range(MAX_RANGES + 10))
+        assert parse_range_header(header, 1000) == [(0, MAX_RANGES + 9)]
+
+    def test_too_many_disjoint_ranges_are_ignored(self):
+        header = "bytes=" + ",".join(f"{i * 2}-{i * 2}" for i in range(MAX_RANGES + 1))
+        assert parse_range_header(header, 1000) is None
+
+class TestCoalesceRanges:
+    def test_overlapping_and_adjacent(self):
+        assert coalesce_ranges([(10, 20), (0, 5), (6, 8), (15, 30), (40, 50)]) == [(0, 8), (10, 30), (40, 50)]
+
+class TestIfRangeMatches:
+    def test_missing_header_matches(self):
+        assert if_range_matches(None, 0) is True
+
+    def test_matching_date(self):
+        assert if_range_matches(http_date(1700000000.75), 1700000000.75) is True
+
+    def test_different_date(self):
+        assert if_range_matches(http_date(1700000000), 1700000001) is False
+
+    def test_entity_tag_does_not_match(self):
+        assert if_range_matches('"abc"', 0) is False
+        assert if_range_matches('W/"abc"', 0) is False
+
+    def test_invalid_date(self):
+        assert if_range_matches("not a date", 0) is False
+
+class TestContentRange:
+    def test_content_range(self):
+        assert content_range(0, 9, 100) == "bytes 0-9/100"
+
+class TestIfRangeEntityTags:
+    def test_matching_strong_etag(self):
+        assert if_range_matches('"abc"', 0, '"abc"') is True
+
+    def test_weak_etag_never_matches(self):
+        assert if_range_matches('W/"abc"', 0, '"abc"') is False
+
+    def test_different_etag(self):
+        assert if_range_matches('"old"', 0, '"abc"') is False
+
+class TestRangeAmplification:
+    def test_overlapping_ranges_are_always_merged(self):
+        header = "bytes=" + ",".join(["0-"] * MAX_RANGES)
+        assert parse_range_header(header, 1000) == [(0, 999)]
+
+    def test_overlapping_ranges_are_merged_and_sorted(self):
+        assert parse_range_header("bytes=50-99,0-60,200-210", 1000) == [(0, 99), (200, 210)]
+
+    def test_header_without_range_specs_is_ignored(self):
+        assert parse_range_header("bytes=,,", 1000) is None
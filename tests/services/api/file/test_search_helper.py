@@ -0,0 +1,21 @@
+from src.services.api.file.search_helper import match_queries, quote, substring_query, words_query
+
+class TestSearchHelper:
+    def test_quote_escapes_fts_syntax(self):
+        assert quote('say "hi"') == '"say ""hi"""'
+
+    def test_words_query(self):
+        assert words_query("Summer holiday-2023", prefix=True) == '"Summer"* AND "holiday"* AND "2023"*'
+        assert words_query("tax return", prefix=False) == '"tax" AND "return"'
+        assert words_query("--", prefix=True) is None
+
+    def test_substring_query_needs_three_characters(self):
+        assert substring_query(" ab ") is None
+        assert substring_query("abc") == '"abc"'
+
+    def test_match_queries_by_mode(self):
+        assert match_queries("hol") == ['"hol"*', '"hol"']
+        assert match_queries("ho") == ['"ho"*', None]
+        assert match_queries("hol", "words") == ['"hol"', None]
+        assert match_queries("hol", "prefix") == ['"hol"*', None]
+        assert match_queries("hol", "substring") == [None, '"hol"']
@@ -0,0 +1,97 @@
+import base64
+import pytest
+from pathlib import Path
+from src.services.api.file.upload_helper import (
+    create_staging_file,
+    discard_staging_file,
+    finalize_upload,
+    open_staging_file,
+    parse_upload_metadata,
+    resolve_upload_directory,
+    safe_filename,
+    staging_path,
+    sync_and_close,
+)
+
+class TestSafeFilename:
+    def test_plain_name(self):
+        assert safe_filename("photo.jpg") == "photo.jpg"
+
+    def test_directories_are_stripped(self):
+        assert safe_filename("../../photo.jpg") == "photo.jpg"
+        assert safe_filename("/tmp/photo.jpg") == "photo.jpg"
+        assert safe_filename("C:\\Users\\me\\photo.jpg") == "photo.jpg"
+
+    @pytest.mark.parametrize("filename", ["", ".", "..", "dir/.."])
+    def test_invalid_names(self, filename):
+        with pytest.raises(ValueError):
+            safe_filename(filename)
+
+class TestStagingFiles:
+    def test_staging_path_is_hidden_inside_destination(self):
+        assert staging_path("/drive/photos", "abc") == Path("/drive/photos/.uploads/abc.part")
+
+    def test_write_and_finalize(self, tmp_path):
+        temp_path = staging_path(str(tmp_path), "abc")
+        create_staging_file(temp_path)
+
+        file_like = open_staging_file(str(temp_path), 0)
+        file_like.write(b"hello world")
+        sync_and_close(file_like)
+
+        file_like = open_staging_file(str(temp_path), 5)
+        file_like.write(b"!")
+        sync_and_close(file_like)
+
+        finalize_upload(str(temp_path), tmp_path / "hello.txt")
+        assert (tmp_path / "hello.txt").read_bytes() == b"hello!"
+        assert not temp_path.exists()
+
+    def test_finalize_does_not_overwrite(self, tmp_path):
+        (tmp_path / "hello.txt").write_bytes(b"original")
+        (tmp_path / "hello (1).txt").write_bytes(b"second")
+        temp_path = staging_path(str(tmp_path), "abc")
+        create_staging_file(temp_path)
+        temp_path.write_bytes(b"new")
+
+        destination = finalize_upload(str(temp_path), tmp_path / "hello.txt")
+
+        assert destination == tmp_path / "hello (2).txt"
+        assert destination.read_bytes() == b"new"
+        assert (tmp_path / "hello.txt").read_bytes() == b"original"
+        assert not temp_path.exists()
+
+    def test_discard_missing_file(self, tmp_path):
+        discard_staging_file(str(tmp_path / "missing.part"))
+
+class TestResolveUploadDirectory:
+    def test_absolute_and_relative_locations(self, tmp_path):
+        (tmp_path / "photos").mkdir()
+
+        assert resolve_upload_directory(str(tmp_path), str(tmp_path / "photos")) == (tmp_path / "photos").resolve()
+        assert resolve_upload_directory(str(tmp_path), "photos") == (tmp_path / "photos").resolve()
+        assert resolve_upload_directory(str(tmp_path), str(tmp_path)) == tmp_path.resolve()
+
+    @pytest.mark.parametrize("location", ["..", "photos/../..", "/etc"])
+    def test_outside_of_root_is_rejected(self, tmp_path, location):
+        with pytest.raises(ValueError):
+            resolve_upload_directory(str(tmp_path / "drive"), location)
+
+    def test_symlink_escape_is_rejected(self, tmp_path):
+        (tmp_path / "drive").mkdir()
+        (tmp_path / "drive" / "escape").symlink_to(tmp_path)
+
+        with pytest.raises(ValueError):
+            resolve_upload_directory(str(tmp_path / "drive"), "escape")
+
+class TestParseUploadMetadata:
+    def test_pairs(self):
+        encoded = base64.b64encode(b"photo.jpg").decode()
+        assert parse_upload_metadata(f"filename {encoded}, is_private") == {"filename": "photo.jpg", "is_private": ""}
+
+    def test_empty_header(self):
+        assert parse_upload_metadata("") == {}
+
+    def test_invalid_base64(self):
+        with pytest.raises(ValueError):
+            parse_upload_metadata("filename not-base64!")
@@ -19,11 +19,11 @@ class TestFilePathHelper:
         mock_partition.mountpoint = "D:\\"
         mock_partition.opts = "removable"
         with patch("src.services.api.file_path_helper.platform.system", return_value="Windows"), \
-             patch("src.services.api.file_path_helper.psutil.disk_partitions", return_value=[mock_partition]):
+             patch("psutil.disk_partitions", return_value=[mock_partition]):
             assert get_external_drive_path() == "D:\\"
 
         with patch("src.services.api.file_path_helper.platform.system", return_value="Windows"), \
-             patch("src.services.api.file_path_helper.psutil.disk_partitions", return_value=[]):
+             patch("psutil.disk_partitions", return_value=[]):
             assert get_external_drive_path() is None
             
     def test_get_external_drive_path__unsupported_os(self):
@@ -1,12 +1,19 @@
 import pytest
 import os
+import threading
 from unittest.mock import patch
-from src.services.auth.allow_email_helper import is_email_allowed
+import src.services.auth.allow_email_helper as helper
+from src.services.auth.allow_email_helper import get_allow_list, is_email_allowed, reload_allowed_emails
 
 class TestAllowEmailHelper:
     def setup_method(self, method):
-        import src.services.auth.allow_email_helper as helper
-        helper._cached_allowed_emails_set = None
+        helper._allow_list = None
+        self.user_emails = patch('src.services.auth.allow_email_helper.get_user_emails', return_value=[])
+        self.mock_get_user_emails = self.user_emails.start()
+
+    def teardown_method(self, method):
+        self.user_emails.stop()
+        helper._allow_list = None
 
     def test_is_email_allowed__true(self):
         with patch.dict(os.environ, {'ALLOWED_EMAILS': "[\"user1@gmail.com\",\"user2@gmail.com\"]"}):
@@ -46,9 +53,52 @@ class TestAllowEmailHelper:
             with patch('os.getenv', return_value=None):
                 assert is_email_allowed('user@gmail.com') is True
 
+        assert self.mock_get_user_emails.call_count == 1
+
     def test_is_email_allowed__edge_cases(self):
         with patch.dict(os.environ, {'ALLOWED_EMAILS': '["test@example.com", "user@domain.org"]'}):
             # Test various email formats
             assert is_email_allowed('TEST@EXAMPLE.COM') is True
             assert is_email_allowed('test@example.com') is True
-            assert is_email_allowed('different@domain.com') is False
\ No newline at end of file
+            assert is_email_allowed('different@domain.com') is False
+
+    def test_is_email_allowed__users_table(self):
+        self.mock_get_user_emails.return_value = ["Guest@Example.com"]
+
+        with patch.dict(os.environ, {'ALLOWED_EMAILS': '["owner@example.com"]'}):
+            assert is_email_allowed('owner@example.com') is True
+            assert is_email_allowed('guest@example.com') is True
+            assert is_email_allowed('stranger@example.com') is False
+
+    def test_reload_allowed_emails__applies_without_restart(self):
+        with patch.dict(os.environ, {'ALLOWED_EMAILS': '["owner@example.com"]'}):
+            assert is_email_allowed('guest@example.com') is False
+            version = get_allow_list().version
+
+            self.mock_get_user_emails.return_value = ["guest@example.com"]
+            allow_list = reload_allowed_emails()
+
+            assert allow_list.version == version + 1
+            assert get_allow_list() is allow_list
+            assert is_email_allowed('guest@example.com') is True
+
+    def test_reload_allowed_emails__failure_keeps_current_list(self):
+        with patch.dict(os.environ, {'ALLOWED_EMAILS': '["owner@example.com"]'}):
+            allow_list = reload_allowed_emails()
+
+            self.mock_get_user_emails.side_effect = Exception("database is locked")
+            with pytest.raises(Exception):
+                reload_allowed_emails()
+
+            assert get_allow_list() is allow_list
+            assert is_email_allowed('owner@example.com') is True
+
+    def test_reload_allowed_emails__concurrent_reloads_end_on_the_latest(self):
+        with patch.dict(os.environ, {'ALLOWED_EMAILS': '["owner@example.com"]'}):
+            threads = [threading.Thread(target=reload_allowed_emails) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            assert get_allow_list().version == helper._version
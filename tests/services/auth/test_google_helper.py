@@ -1,7 +1,14 @@
 import pytest
+import json
 import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
 from unittest.mock import patch, MagicMock
-from src.services.auth.google_helper import verify_google_token
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwk, jwt
+from src.services.auth.google_helper import GoogleCerts, cache_lifetime, decode_google_id_token, verify_google_token
 
 class TestGoogleHelper:
     def test_verify_google_token__success(self):
@@ -13,7 +20,7 @@ class TestGoogleHelper:
             "email_verified": True
         }
         
-        with patch('src.services.auth.google_helper.id_token.verify_oauth2_token', return_value=mock_idinfo), \
+        with patch('src.services.auth.google_helper.decode_google_id_token', return_value=mock_idinfo), \
              patch.dict(os.environ, {'GOOGLE_CLIENT_ID': 'test-client-id'}):
             
             result = verify_google_token("valid_token")
@@ -28,7 +35,7 @@ class TestGoogleHelper:
             "email_verified": False
         }
         
-        with patch('src.services.auth.google_helper.id_token.verify_oauth2_token', return_value=mock_idinfo), \
+        with patch('src.services.auth.google_helper.decode_google_id_token', return_value=mock_idinfo), \
              patch.dict(os.environ, {'GOOGLE_CLIENT_ID': 'test-client-id'}):
             
             result = verify_google_token("valid_token")
@@ -36,7 +43,7 @@ class TestGoogleHelper:
 
     def test_verify_google_token__invalid_token(self):
         """Test verification with invalid token."""
-        with patch('src.services.auth.google_helper.id_token.verify_oauth2_token', side_effect=ValueError("Invalid token")), \
+        with patch('src.services.auth.google_helper.decode_google_id_token', side_effect=ValueError("Invalid token")), \
              patch.dict(os.environ, {'GOOGLE_CLIENT_ID': 'test-client-id'}):
             
             result = verify_google_token("invalid_token")
@@ -50,7 +57,7 @@ class TestGoogleHelper:
             # Missing email field
         }
         
-        with patch('src.services.auth.google_helper.id_token.verify_oauth2_token', return_value=mock_idinfo), \
+        with patch('src.services.auth.google_helper.decode_google_id_token', return_value=mock_idinfo), \
              patch.dict(os.environ, {'GOOGLE_CLIENT_ID': 'test-client-id'}):
             
             result = verify_google_token("valid_token")
@@ -64,8 +71,147 @@ class TestGoogleHelper:
 
     def test_verify_google_token__general_exception(self):
         """Test handling of general exceptions."""
-        with patch('src.services.auth.google_helper.id_token.verify_oauth2_token', side_effect=Exception("General error")), \
+        with patch('src.services.auth.google_helper.decode_google_id_token', side_effect=Exception("General error")), \
              patch.dict(os.environ, {'GOOGLE_CLIENT_ID': 'test-client-id'}):
             
             result = verify_google_token("valid_token")
             assert result is None
+
+@pytest.fixture(scope="module")
+def signing_key():
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_pem = private_key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    ).decode()
+    public_jwk = jwk.construct(private_pem, "RS256").public_key().to_dict()
+    public_jwk.update({"kid": "test-key", "use": "sig", "alg": "RS256"})
+    return private_pem, public_jwk
+
+@pytest.fixture
+def jwks_server(signing_key):
+    """A local stand-in for Google's certificates endpoint, counting its fetches."""
+    state = {"fetches": 0, "keys": [signing_key[1]], "cache_control": "public, max-age=3600"}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            state["fetches"] += 1
+            body = json.dumps({"keys": state["keys"]}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Cache-Control", state["cache_control"])
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    state["url"] = f"http://127.0.0.1:{server.server_port}/certs"
+    yield state
+    server.shutdown()
+    server.server_close()
+
+def id_token(private_pem, kid="test-key", **claims):
+    now = int(time.time())
+    payload = {
+        "iss": "https://accounts.google.com",
+        "aud": "test-client-id",
+        "sub": "google_user_id_123",
+        "email": "test@gmail.com",
+        "email_verified": True,
+        "iat": now,
+        "exp": now + 3600,
+        **claims,
+    }
+    return jwt.encode(payload, private_pem, algorithm="RS256", headers={"kid": kid})
+
+class TestGoogleCerts:
+    def test_decode__valid_token(self, signing_key, jwks_server):
+        certs = GoogleCerts(jwks_server["url"])
+
+        claims = decode_google_id_token(id_token(signing_key[0]), "test-client-id", certs)
+
+        assert claims["email"] == "test@gmail.com"
+
+    def test_decode__certificates_are_cached(self, signing_key, jwks_server):
+        certs = GoogleCerts(jwks_server["url"])
+
+        for _ in range(3):
+            decode_google_id_token(id_token(signing_key[0]), "test-client-id", certs)
+
+        assert jwks_server["fetches"] == 1
+
+    def test_decode__expired_certificates_are_fetched_again(self, signing_key, jwks_server):
+        jwks_server["cache_control"] = "public, max-age=0"
+        certs = GoogleCerts(jwks_server["url"])
+
+        decode_google_id_token(id_token(signing_key[0]), "test-client-id", certs)
+        with patch('src.services.auth.google_helper.time.monotonic', return_value=time.monotonic() + 120):
+            decode_google_id_token(id_token(signing_key[0]), "test-client-id", certs)
+
+        assert jwks_server["fetches"] == 2
+
+    @pytest.mark.parametrize("claims", [
+        {"aud": "other-client-id"},
+        {"iss": "https://evil.example.com"},
+        {"exp": int(time.time()) - 3600},
+    ])
+    def test_decode__invalid_claims(self, signing_key, jwks_server, claims):
+        certs = GoogleCerts(jwks_server["url"])
+
+        with pytest.raises(ValueError):
+            decode_google_id_token(id_token(signing_key[0], **claims), "test-client-id", certs)
+
+    def test_decode__wrong_signature(self, jwks_server):
+        other_key = rsa.generate_private_key(public_exponent=65537, key_size=2048).private_bytes(
+            serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+        ).decode()
+        certs = GoogleCerts(jwks_server["url"])
+
+        with pytest.raises(ValueError):
+            decode_google_id_token(id_token(other_key), "test-client-id", certs)
+
+    def test_decode__unknown_key_refetches_at_most_once_a_minute(self, signing_key, jwks_server):
+        certs = GoogleCerts(jwks_server["url"])
+        certs.refresh()
+
+        for _ in range(3):
+            with pytest.raises(ValueError):
+                decode_google_id_token(id_token(signing_key[0], kid="rotated-key"), "test-client-id", certs)
+
+        assert jwks_server["fetches"] == 2
+
+    def test_decode__stale_keys_are_used_while_google_is_unreachable(self, signing_key, jwks_server):
+        jwks_server["cache_control"] = "public, max-age=0"
+        certs = GoogleCerts(jwks_server["url"])
+        certs.refresh()
+        certs.url = "http://127.0.0.1:9/certs"
+
+        claims = decode_google_id_token(id_token(signing_key[0]), "test-client-id", certs)
+
+        assert claims["sub"] == "google_user_id_123"
+
+    def test_background_refresh(self, jwks_server):
+        certs = GoogleCerts(jwks_server["url"])
+
+        certs.start()
+        try:
+            deadline = time.monotonic() + 5
+            while not certs.keys and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            certs.stop()
+
+        assert "test-key" in certs.keys
+        assert not certs.thread.is_alive()
+
+    @pytest.mark.parametrize("headers, lifetime", [
+        ({"Cache-Control": "public, max-age=19845, must-revalidate, no-transform"}, 19845),
+        ({"Cache-Control": "public, max-age=100", "Age": "40"}, 60),
+        ({}, 3600),
+    ])
+    def test_cache_lifetime(self, headers, lifetime):
+        assert cache_lifetime(headers) == lifetime
@@ -1,8 +1,9 @@
 import pytest
 import os
+from jose import JWTError
 from datetime import timedelta
 from unittest.mock import patch
-from src.services.auth.jwt_helper import create_access_token, verify_token, get_password_hash, verify_password
+from src.services.auth.jwt_helper import VerifiedTokenCache, create_access_token, reload_jwt_settings, verify_token, get_password_hash, get_pwd_context, verify_password
 
 class TestJwtHelper:
     def test_create_access_token__success(self):
@@ -43,10 +44,69 @@ class TestJwtHelper:
         payload = verify_token(token)
         assert payload is None
 
+    def test_verify_token__cached(self):
+        token = create_access_token({"sub": "cached@example.com"})
+        assert verify_token(token)["sub"] == "cached@example.com"
+
+        with patch('jose.jwt.decode') as mock_decode:
+            payload = verify_token(token)
+
+        assert payload["sub"] == "cached@example.com"
+        mock_decode.assert_not_called()
+
+    def test_verified_token_cache__entries_expire_with_the_token(self):
+        cache = VerifiedTokenCache()
+        cache.put(b"a", {"exp": 1000})
+
+        with patch('src.services.auth.jwt_helper.time.time', return_value=999):
+            assert cache.get(b"a") == {"exp": 1000}
+        with patch('src.services.auth.jwt_helper.time.time', return_value=1000):
+            assert cache.get(b"a") is None
+
+    def test_verify_token__invalid_tokens_are_not_cached(self):
+        with patch('jose.jwt.decode', side_effect=JWTError) as mock_decode:
+            verify_token("invalid.token.here")
+            verify_token("invalid.token.here")
+
+        assert mock_decode.call_count == 2
+
+    def test_reload_jwt_settings__rotated_key_rejects_old_tokens(self):
+        token = create_access_token({"sub": "rotated@example.com"})
+        assert verify_token(token) is not None
+
+        try:
+            with patch.dict(os.environ, {"JWT_SECRET_KEY": "rotated-secret-key"}):
+                reload_jwt_settings()
+                assert verify_token(token) is None
+                assert verify_token(create_access_token({"sub": "rotated@example.com"})) is not None
+        finally:
+            reload_jwt_settings()
+
+    def test_reload_jwt_settings__missing_key(self):
+        try:
+            with patch.dict(os.environ, {"JWT_SECRET_KEY": ""}):
+                with pytest.raises(ValueError):
+                    reload_jwt_settings()
+        finally:
+            reload_jwt_settings()
+
+    def test_verified_token_cache__bounded(self):
+        cache = VerifiedTokenCache(max_entries=2)
+        for digest in [b"a", b"b", b"c"]:
+            cache.put(digest, {"exp": 10 ** 10})
+
+        assert [cache.get(digest) is not None for digest in [b"a", b"b", b"c"]] == [False, True, True]
+
+    def test_verified_token_cache__tokens_without_exp_are_not_cached(self):
+        cache = VerifiedTokenCache()
+        cache.put(b"a", {"sub": "test@example.com"})
+
+        assert cache.get(b"a") is None
+
     def test_get_password__hash(self):
         password = "testpass123"
         
-        with patch('src.services.auth.jwt_helper.pwd_context.hash', return_value="hashed_password"):
+        with patch.object(get_pwd_context(), 'hash', return_value="hashed_password"):
             hashed = get_password_hash(password)
             
             assert isinstance(hashed, str)
@@ -57,12 +117,12 @@ class TestJwtHelper:
         password = "testpass123"
         hashed = "hashed_password"
         
-        with patch('src.services.auth.jwt_helper.pwd_context.verify', return_value=True):
+        with patch.object(get_pwd_context(), 'verify', return_value=True):
             assert verify_password(password, hashed) is True
 
     def test_verify_password__failure(self):
         wrong_password = "wrongpass"
         hashed = "hashed_password"
         
-        with patch('src.services.auth.jwt_helper.pwd_context.verify', return_value=False):
+        with patch.object(get_pwd_context(), 'verify', return_value=False):
             assert verify_password(wrong_password, hashed) is False
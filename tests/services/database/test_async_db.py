@@ -0,0 +1,40 @@
+import asyncio
+import threading
+import time
+import pytest
+from unittest.mock import patch
+from src.services.database import async_db
+from src.services.database.db_service import run_db
+
+class TestAsyncDb:
+    @pytest.mark.asyncio
+    async def test_run_db__runs_on_the_database_pool(self):
+        thread_name = await run_db(lambda: threading.current_thread().name)
+
+        assert thread_name.startswith("db")
+
+    @pytest.mark.asyncio
+    async def test_run_db__passes_arguments(self):
+        assert await run_db(lambda a, b=0: a + b, 1, b=2) == 3
+
+    @pytest.mark.asyncio
+    async def test_run_db__calls_overlap(self):
+        started = time.perf_counter()
+        await asyncio.gather(*[run_db(time.sleep, 0.1) for _ in range(4)])
+
+        assert time.perf_counter() - started < 0.3
+
+    @pytest.mark.asyncio
+    async def test_get_user_by_email(self):
+        with patch('src.services.database.users.get_user_by_email', return_value="user") as mock_get_user:
+            assert await async_db.get_user_by_email("user@test.com") == "user"
+
+        mock_get_user.assert_called_once_with("user@test.com")
+
+    @pytest.mark.asyncio
+    async def test_update_user_setting(self):
+        parameters = {"user_id": 1, "hard_drive_path_selection": "/drive"}
+        with patch('src.services.database.user_settings.update_user_setting') as mock_update:
+            await async_db.update_user_setting(parameters)
+
+        mock_update.assert_called_once_with(parameters)
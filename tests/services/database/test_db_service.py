@@ -0,0 +1,66 @@
+import sqlite3
+import threading
+import pytest
+from src.services.database.db_service import close_connections, get_connection, transaction
+
+@pytest.fixture
+def db_path(tmp_path):
+    yield str(tmp_path / "pool.db")
+    close_connections()
+
+class TestDbService:
+    def test_get_connection__reused_within_a_thread(self, db_path):
+        assert get_connection(db_path) is get_connection(db_path)
+
+    def test_get_connection__one_per_thread(self, db_path):
+        conn = get_connection(db_path)
+        other = []
+        thread = threading.Thread(target=lambda: other.append(get_connection(db_path)))
+        thread.start()
+        thread.join()
+
+        assert other[0] is not conn
+
+    def test_get_connection__pragmas(self, db_path):
+        conn = get_connection(db_path)
+
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1
+        assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 5000
+        assert conn.execute("PRAGMA cache_size").fetchone()[0] < 0
+
+    def test_get_connection__reopened_after_close(self, db_path):
+        conn = get_connection(db_path)
+        conn.close()
+
+        reopened = get_connection(db_path)
+
+        assert reopened is not conn
+        assert reopened.execute("SELECT 1").fetchone()[0] == 1
+
+    def test_get_connection__stays_open_after_with_block(self, db_path):
+        with get_connection(db_path) as conn:
+            conn.execute("CREATE TABLE items (name TEXT)")
+            conn.execute("INSERT INTO items VALUES ('a')")
+
+        assert not conn.in_transaction
+        assert get_connection(db_path).execute("SELECT count(*) FROM items").fetchone()[0] == 1
+
+    def test_transaction__rolled_back_on_error(self, db_path):
+        with get_connection(db_path) as conn:
+            conn.execute("CREATE TABLE items (name TEXT)")
+
+        with pytest.raises(RuntimeError):
+            with transaction(db_path) as conn:
+                conn.execute("INSERT INTO items VALUES ('a')")
+                raise RuntimeError("boom")
+
+        assert get_connection(db_path).execute("SELECT count(*) FROM items").fetchone()[0] == 0
+
+    def test_close_connections(self, db_path):
+        conn = get_connection(db_path)
+
+        close_connections()
+
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
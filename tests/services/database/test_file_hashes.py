@@ -0,0 +1,111 @@
+from unittest.mock import patch, MagicMock
+from src.services.database.file_hashes import (
+    delete_file_hash,
+    get_file_hash,
+    get_file_hashes_by_content,
+    get_file_hashes_by_paths,
+    upsert_file_hash,
+    upsert_file_hashes,
+)
+
+COLUMNS = ["path", "hash", "size", "inode", "mtime_ns", "created_at", "updated_at"]
+
+def mock_connection(mock_get_conn, mock_cursor):
+    mock_conn = MagicMock()
+    mock_conn.cursor.return_value = mock_cursor
+    mock_get_conn.return_value.__enter__.return_value = mock_conn
+    return mock_conn
+
+class TestFileHashesService:
+    def test_get_file_hash__success(self):
+        mock_cursor = MagicMock()
+        mock_cursor.description = [(name, None, None, None, None, None, None) for name in COLUMNS]
+        mock_cursor.fetchone.return_value = ("/drive/a.jpg", "abc", 5, 42, 1000, "2024-01-01 10:00:00", "2024-01-01 10:00:00")
+
+        with patch('src.services.database.file_hashes.get_connection') as mock_get_conn:
+            mock_connection(mock_get_conn, mock_cursor)
+
+            file_hash = get_file_hash("/drive/a.jpg")
+
+            assert file_hash.hash == "abc"
+            assert file_hash.inode == 42
+            assert mock_cursor.execute.call_args[0][1] == {"path": "/drive/a.jpg"}
+
+    def test_get_file_hash__not_found(self):
+        mock_cursor = MagicMock()
+        mock_cursor.fetchone.return_value = None
+
+        with patch('src.services.database.file_hashes.get_connection') as mock_get_conn:
+            mock_connection(mock_get_conn, mock_cursor)
+
+            assert get_file_hash("/drive/missing.jpg") is None
+
+    def test_get_file_hashes_by_content__success(self):
+        mock_cursor = MagicMock()
+        mock_cursor.description = [("path", None, None, None, None, None, None)]
+        mock_cursor.fetchall.return_value = [("/drive/a.jpg",), ("/drive/b.jpg",)]
+
+        with patch('src.services.database.file_hashes.get_connection') as mock_get_conn:
+            mock_connection(mock_get_conn, mock_cursor)
+
+            file_hashes = get_file_hashes_by_content("abc", 5)
+
+            sql_query, query_params = mock_cursor.execute.call_args[0]
+            assert "fh.hash = :hash AND fh.size = :size" in sql_query
+            assert query_params == {"hash": "abc", "size": 5}
+            assert [file_hash.path for file_hash in file_hashes] == ["/drive/a.jpg", "/drive/b.jpg"]
+
+    def test_upsert_file_hash__success(self):
+        mock_cursor = MagicMock()
+
+        with patch('src.services.database.file_hashes.get_connection') as mock_get_conn:
+            mock_conn = mock_connection(mock_get_conn, mock_cursor)
+
+            upsert_file_hash({"path": "/drive/a.jpg", "hash": "abc", "size": 5, "inode": 42, "mtime_ns": 1000})
+
+            sql_query, query_params = mock_cursor.executemany.call_args[0]
+            assert "ON CONFLICT (path) DO UPDATE" in sql_query
+            assert "updated_at" in query_params[0]
+            assert mock_conn.commit.call_count == 1
+
+    def test_upsert_file_hashes__batch(self):
+        mock_cursor = MagicMock()
+
+        with patch('src.services.database.file_hashes.get_connection') as mock_get_conn:
+            mock_conn = mock_connection(mock_get_conn, mock_cursor)
+
+            upsert_file_hashes([
+                {"path": "/drive/a.jpg", "hash": "abc", "size": 5, "inode": 42, "mtime_ns": 1000},
+                {"path": "/drive/b.jpg", "hash": "def", "size": 6, "inode": 43, "mtime_ns": 1000},
+            ])
+
+            assert [parameters["path"] for parameters in mock_cursor.executemany.call_args[0][1]] == ["/drive/a.jpg", "/drive/b.jpg"]
+            assert mock_conn.commit.call_count == 1
+
+    def test_get_file_hashes_by_paths__batches(self):
+        mock_cursor = MagicMock()
+        mock_cursor.description = [("path", None, None, None, None, None, None)]
+        mock_cursor.fetchall.side_effect = [[("/drive/0.jpg",)], []]
+
+        with patch('src.services.database.file_hashes.get_connection') as mock_get_conn:
+            mock_connection(mock_get_conn, mock_cursor)
+
+            file_hashes = get_file_hashes_by_paths([f"/drive/{index}.jpg" for index in range(600)])
+
+            assert mock_cursor.execute.call_count == 2
+            assert len(mock_cursor.execute.call_args_list[0][0][1]) == 500
+            assert len(mock_cursor.execute.call_args_list[1][0][1]) == 100
+            assert [file_hash.path for file_hash in file_hashes] == ["/drive/0.jpg"]
+
+    def test_delete_file_hash__success(self):
+        mock_cursor = MagicMock()
+
+        with patch('src.services.database.file_hashes.get_connection') as mock_get_conn:
+            mock_conn = mock_connection(mock_get_conn, mock_cursor)
+
+            delete_file_hash("/drive/a.jpg")
+
+            sql_query, query_params = mock_cursor.execute.call_args[0]
+            assert "DELETE FROM file_hashes" in sql_query
+            assert query_params == {"path": "/drive/a.jpg"}
+            assert mock_conn.commit.call_count == 1
@@ -0,0 +1,214 @@
+import os
+from unittest.mock import patch
+import sqlite3
+from src.services.database.files import (
+    delete_stale_children,
+    delete_stale_files,
+    finish_index_scan,
+    get_child_directories,
+    get_children,
+    get_files_by_inode,
+    get_index_checkpoint,
+    get_index_scan,
+    get_indexed_file,
+    query_files,
+    save_index_batch,
+    search_files,
+    start_index_scan,
+    subtree_bounds,
+    upsert_files,
+)
+from src.services.database.file_hashes import upsert_file_hashes
+
+def record(path, is_dir=False, size=0, mtime_ns=0, category=None, indexed_ns=1):
+    return {
+        "path": path,
+        "parent": os.path.dirname(path),
+        "name": os.path.basename(path),
+        "is_dir": is_dir,
+        "size": size,
+        "mtime_ns": mtime_ns,
+        "mime_type": None if is_dir else "application/octet-stream",
+        "category": category,
+        "inode": 1,
+        "owner": 1000,
+        "indexed_ns": indexed_ns,
+    }
+
+def patch_file_hashes(files_db):
+    return patch("src.services.database.file_hashes.get_connection", side_effect=files_db)
+
+def paths(indexed_files):
+    return [indexed_file.path for indexed_file in indexed_files]
+
+class TestFilesService:
+    def test_upsert_and_get(self, files_db):
+        upsert_files([record("/drive/a.jpg", size=5)])
+        upsert_files([record("/drive/a.jpg", size=7, indexed_ns=2)])
+
+        indexed_file = get_indexed_file("/drive/a.jpg")
+        assert indexed_file.size == 7
+        assert indexed_file.parent == "/drive"
+        assert indexed_file.indexed_ns == 2
+        assert get_indexed_file("/drive/missing.jpg") is None
+
+    def test_query_filters_and_sorts(self, files_db):
+        upsert_files([
+            record("/drive/videos/a.mp4", size=10, mtime_ns=300, category="videos"),
+            record("/drive/videos/B.mp4", size=30, mtime_ns=200, category="videos"),
+            record("/drive/videos/c.mp4", size=20, mtime_ns=100, category="videos"),
+            record("/drive/videos/trip", is_dir=True, category="videos"),
+            record("/drive/photos/d.jpg", size=40, category="photos"),
+        ])
+
+        assert paths(query_files(parents=["/drive/videos"], is_dir=False)) == [
+            "/drive/videos/a.mp4", "/drive/videos/B.mp4", "/drive/videos/c.mp4",
+        ]
+        assert paths(query_files(category="videos", is_dir=False, min_size=15, sort="size", order="desc")) == [
+            "/drive/videos/B.mp4", "/drive/videos/c.mp4",
+        ]
+        assert paths(query_files(category="videos", modified_after_ns=150, modified_before_ns=300)) == [
+            "/drive/videos/B.mp4",
+        ]
+        assert paths(query_files(parents=["/drive/videos"], sort="type", limit=2)) == [
+            "/drive/videos/trip", "/drive/videos/a.mp4",
+        ]
+
+    def test_delete_stale_children_drops_vanished_subtrees(self, files_db):
+        upsert_files([
+            record("/drive/photos", is_dir=True),
+            record("/drive/photos/kept.jpg", indexed_ns=5),
+            record("/drive/photos/gone.jpg"),
+            record("/drive/photos/trip", is_dir=True),
+            record("/drive/photos/trip/beach.jpg", indexed_ns=5),
+            record("/drive/photos-old/other.jpg"),
+        ])
+
+        delete_stale_children("/drive/photos", 5)
+
+        assert set(paths(query_files())) == {"/drive/photos", "/drive/photos/kept.jpg", "/drive/photos-old/other.jpg"}
+
+    def test_delete_stale_files_is_scoped_to_the_root(self, files_db):
+        upsert_files([
+            record("/drive", is_dir=True, indexed_ns=5),
+            record("/drive/a.jpg"),
+            record("/drive/b.jpg", indexed_ns=5),
+            record("/drive2/c.jpg"),
+        ])
+
+        assert delete_stale_files("/drive", 5) == 1
+        assert set(paths(query_files())) == {"/drive", "/drive/b.jpg", "/drive2/c.jpg"}
+
+    def test_subtree_bounds(self):
+        lower, upper = subtree_bounds("/drive")
+        assert lower < "/drive/a" < upper
+        assert not lower < "/drive-2/a" < upper
+
+    def test_search_follows_renames(self, files_db):
+        upsert_files([record("/drive/old", is_dir=True), record("/drive/old/beach.jpg"), record("/drive/summer.jpg")])
+
+        assert paths(search_files("/drive", words_query='"old"')[0]) == ["/drive/old"]
+
+        save_index_batch("/drive", [("/drive/old", "/drive/holiday")], [], [], {
+            "started_ns": 9, "pending": [], "file_count": 0,
+            "directory_count": 0, "skipped_count": 0, "renamed_count": 1,
+        })
+
+        assert search_files("/drive", words_query='"old"') == ([], False)
+        assert paths(search_files("/drive", words_query='"holi"*')[0]) == ["/drive/holiday"]
+        assert paths(search_files("/drive", substring_query='"eac"')[0]) == ["/drive/holiday/beach.jpg"]
+        assert search_files("/other", words_query='"summer"') == ([], False)
+        assert search_files("/drive") == ([], False)
+
+        delete_stale_files("/drive", 10)
+        assert search_files("/drive", substring_query='"summer"') == ([], False)
+
+    def test_search_ranks_and_truncates(self, files_db):
+        upsert_files([record(f"/drive/{name}") for name in ["beach-long-name.jpg", "beach.jpg", "seabeach.jpg", "b.jpg"]])
+
+        indexed_files, truncated = search_files("/drive", '"beach"*', '"beach"')
+        assert paths(indexed_files) == ["/drive/beach.jpg", "/drive/beach-long-name.jpg", "/drive/seabeach.jpg"]
+        assert not truncated
+
+        indexed_files, truncated = search_files("/drive", '"beach"*', None, candidates=1)
+        assert len(indexed_files) == 2
+        assert truncated
+
+    def test_children_and_inode_lookup(self, files_db):
+        upsert_files([record("/drive/a.jpg"), record("/drive/trip", is_dir=True), record("/drive/trip/b.jpg")])
+
+        assert sorted(paths(get_children("/drive"))) == ["/drive/a.jpg", "/drive/trip"]
+        directories, file_count = get_child_directories("/drive")
+        assert paths(directories) == ["/drive/trip"]
+        assert file_count == 1
+        assert len(get_files_by_inode(1)) == 3
+        assert get_files_by_inode(2) == []
+
+    def test_save_index_batch(self, files_db):
+        upsert_files([
+            record("/drive/old", is_dir=True),
+            record("/drive/old/a.jpg"),
+            record("/drive/old/deep", is_dir=True),
+            record("/drive/old/deep/b.jpg"),
+            record("/drive/kept/c.jpg"),
+        ])
+        with patch_file_hashes(files_db):
+            upsert_file_hashes([{"path": "/drive/old/a.jpg", "hash": "abc", "size": 0, "inode": 1, "mtime_ns": 0}])
+
+        save_index_batch(
+            "/drive",
+            [("/drive/old", "/drive/new")],
+            [record("/drive/d.jpg", indexed_ns=9)],
+            ["/drive/kept"],
+            {"started_ns": 9, "pending": [["/drive/new", 0, 1]], "file_count": 1,
+             "directory_count": 1, "skipped_count": 0, "renamed_count": 1},
+        )
+
+        assert get_indexed_file("/drive/old") is None
+        moved = get_indexed_file("/drive/new/deep/b.jpg")
+        assert moved.parent == "/drive/new/deep"
+        assert get_indexed_file("/drive/new").name == "new"
+        assert get_indexed_file("/drive/kept/c.jpg").indexed_ns == 9
+        assert get_indexed_file("/drive/d.jpg") is not None
+        with files_db() as conn:
+            assert conn.execute("SELECT path FROM file_hashes").fetchall()[0][0] == "/drive/new/a.jpg"
+
+        checkpoint = get_index_checkpoint("/drive")
+        assert checkpoint.pending == [["/drive/new", 0, 1]]
+        assert checkpoint.renamed_count == 1
+
+    def test_save_index_batch_is_atomic(self, files_db):
+        broken = record("/drive/a.jpg")
+        del broken["size"]
+
+        try:
+            save_index_batch("/drive", [], [record("/drive/b.jpg"), broken], [], {
+                "started_ns": 9, "pending": [], "file_count": 0,
+                "directory_count": 0, "skipped_count": 0, "renamed_count": 0,
+            })
+        except sqlite3.ProgrammingError:
+            pass
+
+        assert get_indexed_file("/drive/b.jpg") is None
+        assert get_index_checkpoint("/drive") is None
+
+    def test_index_scans(self, files_db):
+        assert get_index_scan("/drive") is None
+        upsert_files([record("/drive", is_dir=True, indexed_ns=10), record("/drive/gone.jpg", indexed_ns=1)])
+
+        start_index_scan("/drive", 10)
+        save_index_batch("/drive", [], [], [], {
+            "started_ns": 10, "pending": [], "file_count": 0,
+            "directory_count": 1, "skipped_count": 1, "renamed_count": 0,
+        })
+        removed_count = finish_index_scan({
+            "root": "/drive", "started_ns": 10, "completed_ns": 20, "file_count": 3,
+            "directory_count": 1, "skipped_count": 1, "renamed_count": 0,
+        })
+
+        assert removed_count == 1
+        index_scan = get_index_scan("/drive")
+        assert index_scan.completed_ns == 20
+        assert index_scan.file_count == 3
+        assert index_scan.skipped_count == 1
+        assert get_index_checkpoint("/drive") is None
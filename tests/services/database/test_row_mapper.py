@@ -0,0 +1,37 @@
+from dataclasses import dataclass
+from typing import Optional
+import pytest
+from src.services.database.row_mapper import row_mapper
+
+@dataclass(slots=True)
+class Entry:
+    path: str
+    size: Optional[int] = None
+    name: Optional[str] = None
+
+def description(*columns):
+    return [(column, None, None, None, None, None, None) for column in columns]
+
+class TestRowMapper:
+    def test_columns_in_any_order(self):
+        entry = row_mapper(Entry, description("name", "size", "path"))(("a.jpg", 3, "/drive/a.jpg"))
+
+        assert entry == Entry(path="/drive/a.jpg", size=3, name="a.jpg")
+
+    def test_missing_columns_take_defaults_and_extra_columns_are_ignored(self):
+        entry = row_mapper(Entry, description("tier", "path"))((0, "/drive"))
+
+        assert entry == Entry(path="/drive")
+
+    def test_prefix(self):
+        entry = row_mapper(Entry, description("path", "setting_path"), "setting_")(("/user", "/setting"))
+
+        assert entry.path == "/setting"
+
+    def test_required_field_without_column(self):
+        with pytest.raises(ValueError):
+            row_mapper(Entry, description("size"))
+
+    def test_compiled_once_per_shape(self):
+        assert row_mapper(Entry, description("path")) is row_mapper(Entry, description("path"))
+        assert row_mapper(Entry, description("path")) is not row_mapper(Entry, description("path", "size"))
@@ -0,0 +1,126 @@
+from unittest.mock import patch, MagicMock
+from src.services.database.upload_sessions import (
+    create_upload_session,
+    delete_upload_session,
+    get_expired_upload_sessions,
+    get_upload_session,
+    update_upload_offset,
+)
+
+class TestUploadSessionsService:
+    def test_get_upload_session__success(self):
+        mock_row = ("abc", "test@example.com", "/Volumes/Drive1", "movie.mp4", 100, 10, "/Volumes/Drive1/.uploads/abc.part", "2024-01-01 10:00:00", "2024-01-01 10:00:00")
+        mock_cursor = MagicMock()
+        mock_cursor.description = [(name, None, None, None, None, None, None) for name in [
+            "id", "owner_email", "file_path_location", "filename", "upload_length",
+            "upload_offset", "temp_path", "created_at", "updated_at",
+        ]]
+        mock_cursor.fetchone.return_value = mock_row
+
+        with patch('src.services.database.upload_sessions.get_connection') as mock_get_conn:
+            mock_conn = MagicMock()
+            mock_conn.cursor.return_value = mock_cursor
+            mock_get_conn.return_value.__enter__.return_value = mock_conn
+
+            upload_session = get_upload_session("abc")
+
+            assert upload_session.id == "abc"
+            assert upload_session.upload_length == 100
+            assert upload_session.upload_offset == 10
+            mock_cursor.execute.assert_called_once()
+
+    def test_get_upload_session__not_found(self):
+        mock_cursor = MagicMock()
+        mock_cursor.fetchone.return_value = None
+
+        with patch('src.services.database.upload_sessions.get_connection') as mock_get_conn:
+            mock_conn = MagicMock()
+            mock_conn.cursor.return_value = mock_cursor
+            mock_get_conn.return_value.__enter__.return_value = mock_conn
+
+            assert get_upload_session("missing") is None
+
+    def test_create_upload_session__success(self):
+        mock_cursor = MagicMock()
+        parameters = {
+            "id": "abc",
+            "owner_email": "test@example.com",
+            "file_path_location": "/Volumes/Drive1",
+            "filename": "movie.mp4",
+            "upload_length": 100,
+            "temp_path": "/Volumes/Drive1/.uploads/abc.part",
+        }
+
+        with patch('src.services.database.upload_sessions.get_connection') as mock_get_conn, \
+             patch('src.services.database.upload_sessions.get_upload_session') as mock_get:
+            mock_conn = MagicMock()
+            mock_conn.cursor.return_value = mock_cursor
+            mock_get_conn.return_value.__enter__.return_value = mock_conn
+
+            result = create_upload_session(parameters)
+
+            assert result == mock_get.return_value
+            assert "INSERT INTO upload_sessions" in mock_cursor.execute.call_args[0][0]
+            assert mock_conn.commit.call_count == 1
+            mock_get.assert_called_once_with("abc")
+
+    def test_get_expired_upload_sessions__success(self):
+        mock_cursor = MagicMock()
+        mock_cursor.description = [("id", None, None, None, None, None, None)]
+        mock_cursor.fetchall.return_value = [("abc",), ("def",)]
+
+        with patch('src.services.database.upload_sessions.get_connection') as mock_get_conn:
+            mock_conn = MagicMock()
+            mock_conn.cursor.return_value = mock_cursor
+            mock_get_conn.return_value.__enter__.return_value = mock_conn
+
+            upload_sessions = get_expired_upload_sessions("2024-01-01 10:00:00")
+
+            sql_query, query_params = mock_cursor.execute.call_args[0]
+            assert "updated_at < :updated_before" in sql_query
+            assert query_params == {"updated_before": "2024-01-01 10:00:00"}
+            assert [upload_session.id for upload_session in upload_sessions] == ["abc", "def"]
+
+    def test_update_upload_offset__success(self):
+        mock_cursor = MagicMock()
+        mock_cursor.rowcount = 1
+
+        with patch('src.services.database.upload_sessions.get_connection') as mock_get_conn:
+            mock_conn = MagicMock()
+            mock_conn.cursor.return_value = mock_cursor
+            mock_get_conn.return_value.__enter__.return_value = mock_conn
+
+            assert update_upload_offset({"id": "abc", "expected_offset": 0, "upload_offset": 50}) is True
+
+            sql_query, query_params = mock_cursor.execute.call_args[0]
+            assert "SET upload_offset = :upload_offset" in sql_query
+            assert "upload_offset = :expected_offset" in sql_query
+            assert query_params["upload_offset"] == 50
+            assert "updated_at" in query_params
+            assert mock_conn.commit.call_count == 1
+
+    def test_update_upload_offset__stale_offset(self):
+        mock_cursor = MagicMock()
+        mock_cursor.rowcount = 0
+
+        with patch('src.services.database.upload_sessions.get_connection') as mock_get_conn:
+            mock_conn = MagicMock()
+            mock_conn.cursor.return_value = mock_cursor
+            mock_get_conn.return_value.__enter__.return_value = mock_conn
+
+            assert update_upload_offset({"id": "abc", "expected_offset": 10, "upload_offset": 50}) is False
+
+    def test_delete_upload_session__success(self):
+        mock_cursor = MagicMock()
+
+        with patch('src.services.database.upload_sessions.get_connection') as mock_get_conn:
+            mock_conn = MagicMock()
+            mock_conn.cursor.return_value = mock_cursor
+            mock_get_conn.return_value.__enter__.return_value = mock_conn
+
+            delete_upload_session("abc")
+
+            sql_query, query_params = mock_cursor.execute.call_args[0]
+            assert "DELETE FROM upload_sessions" in sql_query
+            assert query_params == {"id": "abc"}
+            assert mock_conn.commit.call_count == 1
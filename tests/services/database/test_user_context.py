@@ -0,0 +1,81 @@
+import importlib
+import sqlite3
+import pytest
+from unittest.mock import patch
+from src.services.database.user_context import get_user_context, load_user_context
+from src.services.database.user_context_cache import UserContextCache
+from src.services.database.user_settings import create_user_setting, update_user_setting
+from src.services.database.users import update_user
+
+@pytest.fixture
+def users_db(tmp_path):
+    """A migrated database with one user, first.last@example.com, and a fresh context cache."""
+    db_path = str(tmp_path / "users.db")
+    with sqlite3.connect(db_path) as conn:
+        importlib.import_module("src.database.migrations.001_initial_schema").up(conn)
+
+    def get_connection():
+        conn = sqlite3.connect(db_path)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    cache = UserContextCache(ttl=60)
+    with patch.dict("os.environ", {"FIRST_USER_EMAIL": "first.last@example.com"}), \
+            patch("src.services.database.user_context.get_connection", side_effect=get_connection) as mock_get_conn, \
+            patch("src.services.database.users.get_connection", side_effect=get_connection), \
+            patch("src.services.database.user_settings.get_connection", side_effect=get_connection), \
+            patch("src.services.database.user_context_cache._user_context_cache", cache):
+        yield mock_get_conn
+
+EMAIL = "first.last@example.com"
+
+class TestUserContext:
+    def test_load_user_context__without_settings(self, users_db):
+        context = load_user_context(EMAIL)
+
+        assert context.user.email == EMAIL
+        assert context.user.is_admin == 1
+        assert context.user_setting is None
+
+    def test_load_user_context__with_settings(self, users_db):
+        user_id = load_user_context(EMAIL).user.id
+        create_user_setting({"user_id": user_id, "hard_drive_path_selection": "/drive"})
+
+        context = load_user_context(EMAIL)
+
+        assert context.user_setting.user_id == user_id
+        assert context.user_setting.hard_drive_path_selection == "/drive"
+        assert context.user_setting.updated_at is not None
+        assert not hasattr(context.user, "hard_drive_path_selection")
+
+    def test_load_user_context__unknown_email(self, users_db):
+        assert load_user_context("nobody@example.com") is None
+
+    def test_get_user_context__cache_hit_skips_database(self, users_db):
+        first = get_user_context(EMAIL)
+        second = get_user_context(EMAIL)
+
+        assert second is first
+        assert users_db.call_count == 1
+
+    def test_get_user_context__missing_users_are_not_cached(self, users_db):
+        get_user_context("nobody@example.com")
+        get_user_context("nobody@example.com")
+
+        assert users_db.call_count == 2
+
+    def test_setting_writes_invalidate(self, users_db):
+        user_id = get_user_context(EMAIL).user.id
+
+        create_user_setting({"user_id": user_id, "hard_drive_path_selection": "/drive"})
+        assert get_user_context(EMAIL).user_setting.hard_drive_path_selection == "/drive"
+
+        update_user_setting({"user_id": user_id, "hard_drive_path_selection": "/other"})
+        assert get_user_context(EMAIL).user_setting.hard_drive_path_selection == "/other"
+
+    def test_user_writes_invalidate(self, users_db):
+        assert get_user_context(EMAIL).user.is_admin == 1
+
+        update_user({"email": EMAIL, "name": "First Last", "is_admin": 0, "is_guest": 1})
+
+        assert get_user_context(EMAIL).user.is_admin == 0
@@ -0,0 +1,29 @@
+from unittest.mock import patch
+from src.services.database.user_context_cache import UserContextCache
+
+EMAIL = "first.last@example.com"
+
+class TestUserContextCache:
+    def test_entries_expire(self):
+        cache = UserContextCache(ttl=60)
+        cache.put(EMAIL, "context", cache.generation)
+        assert cache.get(EMAIL) == "context"
+
+        with patch("src.services.database.user_context_cache.time.monotonic", return_value=10 ** 9):
+            assert cache.get(EMAIL) is None
+
+    def test_lookup_racing_an_invalidation_is_not_stored(self):
+        cache = UserContextCache(ttl=60)
+        generation = cache.generation
+
+        cache.invalidate(user_id=1)
+        cache.put(EMAIL, "stale", generation)
+
+        assert cache.get(EMAIL) is None
+
+    def test_oldest_entries_are_evicted(self):
+        cache = UserContextCache(ttl=60, max_entries=2)
+        for email in ["a", "b", "c"]:
+            cache.put(email, email, cache.generation)
+
+        assert [cache.get(email) for email in ["a", "b", "c"]] == [None, "b", "c"]
@@ -1,5 +1,6 @@
 from unittest.mock import patch, MagicMock
-from src.services.database.user_settings import get_user_setting, create_user_setting, update_user_setting
+from src.services.database.row_mapper import row_mapper
+from src.services.database.user_settings import UserSetting, get_user_setting, get_drive_path_selections, create_user_setting, update_user_setting
 
 class TestUserSettingsService:
     def test_get_user_setting__success(self):
@@ -27,6 +28,18 @@ class TestUserSettingsService:
             assert user_setting.hard_drive_path_selection == "/Volumes/Drive1"
             mock_cursor.execute.assert_called_once()
 
+    def test_get_drive_path_selections__success(self):
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.return_value = [("/Volumes/Drive1",), ("/Volumes/Drive2",)]
+
+        with patch('src.services.database.user_settings.get_connection') as mock_get_conn:
+            mock_conn = MagicMock()
+            mock_conn.cursor.return_value = mock_cursor
+            mock_get_conn.return_value.__enter__.return_value = mock_conn
+
+            assert get_drive_path_selections() == ["/Volumes/Drive1", "/Volumes/Drive2"]
+            assert "DISTINCT us.hard_drive_path_selection" in mock_cursor.execute.call_args[0][0]
+
     def test_get_user_setting__not_found(self):
         mock_cursor = MagicMock()
         mock_cursor.fetchone.return_value = None
@@ -146,8 +159,7 @@ class TestUserSettingsService:
             ("updated_at", None, None, None, None, None, None)
         ]
         
-        from src.services.database.user_settings import UserSetting
-        user_setting = UserSetting(mock_row, mock_cursor)
+        user_setting = row_mapper(UserSetting, mock_cursor.description)(mock_row)
         
         assert user_setting.id == 5
         assert user_setting.user_id == 2
@@ -1,5 +1,6 @@
 from unittest.mock import patch, MagicMock
-from src.services.database.users import User, create_user, get_user_by_id, get_user_by_email, update_user
+from src.services.database.row_mapper import row_mapper
+from src.services.database.users import User, create_user, get_user_by_id, get_user_by_email, get_user_emails, update_user
 
 class TestUsersService:
     def test_get_user_by_id__success(self):
@@ -41,6 +42,19 @@ class TestUsersService:
             
             assert user is None
 
+    def test_get_user_emails(self):
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.return_value = [("owner@example.com",), ("guest@example.com",)]
+
+        with patch('src.services.database.users.get_connection') as mock_get_conn:
+            mock_conn = MagicMock()
+            mock_conn.cursor.return_value = mock_cursor
+            mock_get_conn.return_value.__enter__.return_value = mock_conn
+
+            emails = get_user_emails()
+
+            assert emails == ["owner@example.com", "guest@example.com"]
+
     def test_get_user_by_email__success(self):
         mock_row = (1, "test@example.com", "Test User", 0, 0, "2024-01-01 10:00:00")
         mock_cursor = MagicMock()
@@ -188,7 +202,7 @@ class TestUsersService:
             ("created_at", None, None, None, None, None, None)
         ]
         
-        user = User(mock_row, mock_cursor)
+        user = row_mapper(User, mock_cursor.description)(mock_row)
         
         assert user.id == 10
         assert user.email == "test@example.com"
@@ -197,16 +211,17 @@ class TestUsersService:
         assert user.is_guest == 0
         assert user.created_at == "2024-01-01 10:00:00"
 
-    def test_user_class_none_row(self):
-        """Test User class handles None row gracefully"""
+    def test_user_class_partial_row(self):
+        """Test columns the query did not select keep their default"""
         mock_cursor = MagicMock()
         mock_cursor.description = [
-            ("id", None, None, None, None, None, None),
-            ("email", None, None, None, None, None, None)
+            ("email", None, None, None, None, None, None),
+            ("id", None, None, None, None, None, None)
         ]
         
-        user = User(None, mock_cursor)
+        user = row_mapper(User, mock_cursor.description)(("test@example.com", 10))
         
-        # When row is None, no attributes should be set
-        assert not hasattr(user, 'id')
-        assert not hasattr(user, 'email')
\ No newline at end of file
+        assert user.id == 10
+        assert user.email == "test@example.com"
+        assert user.name is None
+        assert not hasattr(user, '__dict__')
\ No newline at end of file
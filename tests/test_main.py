@@ -0,0 +1,33 @@
+import json
+import os
+import subprocess
+import sys
+
+# Seconds `import src.main` may take in a fresh interpreter, best of three
+STARTUP_BUDGET_SECONDS = float(os.getenv("STARTUP_BUDGET_SECONDS", "1.5"))
+DEFERRED_MODULES = ["jose", "passlib", "requests", "psutil", "google.auth", "cryptography"]
+
+IMPORT_APP = """
+import json, sys, time
+started = time.perf_counter()
+import src.main
+print(json.dumps({"seconds": time.perf_counter() - started, "modules": sorted(sys.modules)}))
+"""
+
+def import_app():
+    completed = subprocess.run([sys.executable, "-c", IMPORT_APP], capture_output=True, text=True, check=True)
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+class TestColdStart:
+    def test_cold_start__within_budget(self):
+        seconds = min(import_app()["seconds"] for _ in range(3))
+
+        assert seconds < STARTUP_BUDGET_SECONDS, (
+            f"import src.main took {seconds:.2f}s, over the {STARTUP_BUDGET_SECONDS}s budget; "
+            "see `python -m benchmarks.profile_startup`"
+        )
+
+    def test_cold_start__heavy_dependencies_are_deferred(self):
+        modules = set(import_app()["modules"])
+
+        assert [module for module in DEFERRED_MODULES if module in modules] == []